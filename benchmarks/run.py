@@ -0,0 +1,247 @@
+"""Benchmarks for FolderCrafter's hot paths at 10^3 to 10^6 folders.
+
+Synthetic templates of several shapes are generated, and each operation is
+timed (best of --repeat runs) and measured for peak Python memory in a
+separate tracemalloc run. Results are compared against a stored baseline;
+anything slower or hungrier than the baseline by more than the tolerance is
+reported and the script exits with status 1.
+
+    python benchmarks/run.py                    # compare with baseline.json
+    python benchmarks/run.py --update-baseline  # record this machine's numbers
+    python benchmarks/run.py --quick            # 10^3 and 10^4 only
+    python benchmarks/run.py --fs memory --latency-ms 20 --sizes 1000
+                                                # create/scan as on a slow share
+    python benchmarks/run.py --fs memory --latency-ms 20 --async-workers 64
+                                                # ...and with the asyncio engine
+
+Baselines are machine specific, so record one on the machine that runs the
+comparison (e.g. before and after a change).
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from foldercrafter.aio import AsyncCrafter  # noqa: E402
+from foldercrafter.craft import create_folders, scan_folders  # noqa: E402
+from foldercrafter.fs import LatencyFileSystem, LocalFileSystem, MemoryFileSystem  # noqa: E402
+from foldercrafter.syntax import parse_indented_lines  # noqa: E402
+from foldercrafter.tree import format_paths_to_indented, format_paths_to_tree  # noqa: E402
+
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+QUICK_SIZES = [1_000, 10_000]
+
+# name -> fan-out; wide templates are shallow, deep ones have many levels
+SHAPES = {"wide": 40, "deep": 3}
+
+# Creating and scanning real folders is far slower than the in-memory paths
+MAX_DISK_NODES = 10_000
+
+# Timings below this many seconds are too noisy to compare
+TIME_FLOOR = 0.005
+
+
+def generate_paths(nodes, fanout):
+    """Full paths of a breadth-first tree with ``nodes`` folders, parents included."""
+    paths = []
+    parents = [""]
+    while len(paths) < nodes:
+        next_parents = []
+        for parent in parents:
+            for i in range(fanout):
+                path = f"{parent}/Folder {i:03d}" if parent else f"Folder {i:03d}"
+                paths.append(path)
+                next_parents.append(path)
+                if len(paths) == nodes:
+                    return paths
+        parents = next_parents
+    return paths
+
+
+def measure(func, setup, repeat):
+    """(best seconds, peak bytes) for func(*setup()), setup not being measured."""
+    best = float("inf")
+    for _ in range(repeat):
+        args = setup()
+        gc.collect()
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    
+    args = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def make_backend(kind, latency_ms, jitter_ms, seed=0):
+    """A fresh filesystem backend for one create/scan case."""
+    backend = MemoryFileSystem() if kind == "memory" else LocalFileSystem()
+    if latency_ms or jitter_ms:
+        backend = LatencyFileSystem(backend, latency_ms / 1000, jitter_ms / 1000, seed=seed)
+    return backend
+
+
+def run_async(method, workers, fs, *args, **kwargs):
+    """Run one AsyncCrafter method to completion on a fresh event loop."""
+    async def run():
+        async with AsyncCrafter(fs, max_workers=workers) as crafter:
+            return await getattr(crafter, method)(*args, **kwargs)
+    return asyncio.run(run())
+
+
+def run_benchmarks(sizes, repeat, max_disk_nodes, fs_kind="local", latency_ms=0, jitter_ms=0, async_workers=0):
+    results = {}
+    for shape, fanout in SHAPES.items():
+        for nodes in sizes:
+            paths = generate_paths(nodes, fanout)
+            text = format_paths_to_indented(paths)
+            cases = {
+                "parse": (parse_indented_lines, lambda: (text,)),
+                "render_tree": (format_paths_to_tree, lambda: (paths,)),
+                "render_indented": (format_paths_to_indented, lambda: (paths,)),
+            }
+            
+            cleanup = None
+            if fs_kind == "memory" or nodes <= max_disk_nodes:
+                # Created once without latency; the scan case reads it through the chosen backend
+                if fs_kind == "memory":
+                    work = Path(os.path.abspath("foldercrafter-bench"))
+                    filled = MemoryFileSystem()
+                else:
+                    work = cleanup = Path(tempfile.mkdtemp(prefix="foldercrafter-bench-"))
+                    filled = LocalFileSystem()
+                scan_root = work / "scan"
+                create_folders(paths, scan_root, check=False, fs=filled)
+                
+                def fresh_create():
+                    target = work / "create"
+                    if fs_kind == "local":
+                        shutil.rmtree(target, ignore_errors=True)
+                    return target, make_backend(fs_kind, latency_ms, jitter_ms)
+                
+                def fresh_scan():
+                    backend = filled
+                    if latency_ms or jitter_ms:
+                        backend = LatencyFileSystem(filled, latency_ms / 1000, jitter_ms / 1000, seed=0)
+                    return scan_root, backend
+                
+                cases["create"] = (lambda target, fs: create_folders(paths, target, check=False, fs=fs), fresh_create)
+                cases["scan"] = (lambda root, fs: scan_folders(root, fs=fs), fresh_scan)
+                if async_workers:
+                    cases["create_async"] = (
+                        lambda target, fs: run_async("create", async_workers, fs, paths, target, check=False),
+                        fresh_create,
+                    )
+                    cases["scan_async"] = (lambda root, fs: run_async("scan", async_workers, fs, root), fresh_scan)
+            
+            try:
+                for operation, (func, setup) in cases.items():
+                    key = f"{operation}/{shape}/{nodes}"
+                    if operation not in ("parse", "render_tree", "render_indented") and (fs_kind != "local" or latency_ms or jitter_ms):
+                        key += f"/{fs_kind}" + (f"+{latency_ms:g}ms" if latency_ms or jitter_ms else "")
+                    seconds, peak = measure(func, setup, repeat)
+                    results[key] = {"seconds": round(seconds, 6), "peak_kb": peak // 1024}
+                    print(f"  {key:<40}{seconds * 1000:10.1f} ms{peak / 1024 / 1024:10.1f} MB", flush=True)
+            finally:
+                if cleanup is not None:
+                    shutil.rmtree(cleanup, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """Regression messages for results worse than the baseline beyond the tolerances."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        time_limit = max(base["seconds"] * (1 + time_tolerance), base["seconds"] + TIME_FLOOR)
+        if result["seconds"] > time_limit:
+            regressions.append(
+                f"{key}: {result['seconds'] * 1000:.1f} ms vs baseline {base['seconds'] * 1000:.1f} ms"
+            )
+        memory_limit = base["peak_kb"] * (1 + memory_tolerance) + 64
+        if result["peak_kb"] > memory_limit:
+            regressions.append(f"{key}: {result['peak_kb']:,} KB peak vs baseline {base['peak_kb']:,} KB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark FolderCrafter's hot paths.")
+    parser.add_argument("--sizes", help="comma-separated node counts (default 10^3..10^6)")
+    parser.add_argument("--quick", action="store_true", help="only 10^3 and 10^4 nodes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the best is kept")
+    parser.add_argument("--max-disk-nodes", type=int, default=MAX_DISK_NODES,
+                        help="largest size for the create/scan cases on the local disk")
+    parser.add_argument("--fs", choices=("local", "memory"), default="local",
+                        help="filesystem backend for the create/scan cases")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every filesystem call")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random +/- variation of that delay")
+    parser.add_argument("--async-workers", type=int, default=0,
+                        help="also time the asyncio engine with this many I/O threads")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="allowed extra peak memory")
+    args = parser.parse_args(argv)
+    
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(",")]
+    else:
+        sizes = QUICK_SIZES if args.quick else SIZES
+    
+    print(f"FolderCrafter benchmarks (Python {platform.python_version()}, {platform.platform()})")
+    results = run_benchmarks(
+        sizes, args.repeat, args.max_disk_nodes, args.fs, args.latency_ms, args.jitter_ms, args.async_workers
+    )
+    
+    if args.update_baseline:
+        baseline = {}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8")).get("results", {})
+        baseline.update(results)
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "results": dict(sorted(baseline.items())),
+        }, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+    
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"\nNo regressions against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
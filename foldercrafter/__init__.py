@@ -0,0 +1,46 @@
+"""FolderCrafter core: turn folder templates into folder structures, no GUI needed.
+
+Only the standard library is used, so this imports in milliseconds and works
+from scripts and pipeline tools. The documented entry points are:
+
+    parse(text)              indented template text -> list of folder paths
+    render(paths)            folder paths -> tree text, as shown in previews
+    validate(paths, target)  problems that would stop the folders being created
+    plan(paths, target)      the absolute folders create() would make
+    create(paths, target)    create the folders; returns how many
+    scan(folder)             an existing folder's subfolders as template paths
+    diff(old, new)           added, removed, renamed and moved subtrees
+    merge(base, a, b)        three-way merge of two edited copies of base
+
+Saved templates come from load_templates(). Expand their @include lines with
+TemplateResolver(library).resolve(name) before validating or creating them.
+create() and scan() take an optional filesystem backend: MemoryFileSystem
+for tests, LatencyFileSystem to simulate a slow network share.
+asyncio services can craft and scan many targets at once with
+foldercrafter.aio.AsyncCrafter (imported separately, as it pulls in asyncio).
+The FolderCrafter app is built on these same functions.
+"""
+
+from .api import create, diff, merge, parse, plan, render, scan, validate
+from .compose import TemplateResolver
+from .craft import check_craftable, create_folders, plan_folders, scan_folders
+from .defaults import DEFAULT_TEMPLATES
+from .diff import MergeResult, TemplateDiff, diff_templates, merge_templates
+from .fs import LatencyFileSystem, LocalFileSystem, MemoryFileSystem
+from .patterns import build_folder_tree, count_expanded_paths, iter_expanded_paths
+from .safety import normalize_template_paths
+from .storage import TemplateLibrary, TemplateStore, load_templates
+from .syntax import TemplateError, parse_indented_lines
+from .tree import FolderTree, format_paths_to_indented, format_paths_to_tree
+from .validate import content_hash, validate_paths, validate_template
+
+__all__ = [
+    "parse", "render", "validate", "plan", "create", "scan", "diff", "merge",
+    "TemplateError", "TemplateLibrary", "TemplateStore", "TemplateResolver", "load_templates",
+    "DEFAULT_TEMPLATES", "FolderTree", "build_folder_tree", "parse_indented_lines",
+    "format_paths_to_tree", "format_paths_to_indented", "normalize_template_paths",
+    "iter_expanded_paths", "count_expanded_paths", "validate_paths", "validate_template",
+    "content_hash", "check_craftable", "plan_folders", "create_folders", "scan_folders",
+    "LocalFileSystem", "MemoryFileSystem", "LatencyFileSystem",
+    "TemplateDiff", "MergeResult", "diff_templates", "merge_templates",
+]
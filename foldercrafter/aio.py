@@ -0,0 +1,206 @@
+"""asyncio versions of crafting and scanning, for services that already run an event loop.
+
+An AsyncCrafter owns a thread pool that runs the blocking filesystem calls,
+plus a limit on how many calls may be queued or running at once. The limit
+is shared by every create() and scan() in progress, so one loop can work on
+many targets without a thread per job:
+
+    async with AsyncCrafter(fs=LatencyFileSystem(latency=0.02)) as crafter:
+        counts = await asyncio.gather(*(crafter.create(paths, t) for t in targets))
+
+Within one target the results match the synchronous functions. Folders are
+created level by level, so a folder's parent always exists before it is
+made. scan() returns paths in the same order as scan_folders(). Across
+targets there is no ordering.
+
+Cancelling a task, or reaching its ``timeout``, stops new filesystem calls
+at once. Calls already running in a thread finish, since a blocking call
+cannot be interrupted.
+"""
+
+import asyncio
+import contextlib
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import ASYNC_MAX_IN_FLIGHT, ASYNC_MAX_WORKERS
+from .craft import check_craftable, scan_ignored
+from .fs import LOCAL
+from .patterns import iter_expanded_paths
+
+
+def plan_levels(paths, target):
+    """The absolute folders crafting ``paths`` into ``target`` creates, grouped by depth."""
+    target_abs = os.path.abspath(target)
+    levels = []
+    for p in iter_expanded_paths(paths):
+        parts = p.split('/')
+        while len(levels) < len(parts):
+            levels.append([])
+        levels[len(parts) - 1].append(os.path.join(target_abs, *parts))
+    return levels
+
+
+class AsyncCrafter:
+    """Runs creates and scans concurrently on one event loop (see the module docstring).
+
+    ``fs`` is the filesystem backend (the local disk by default). Pass an
+    ``executor`` to share an existing one; otherwise a ThreadPoolExecutor of
+    ``max_workers`` threads is created, and shut down by close().
+    Use an instance from a single event loop.
+    """
+
+    def __init__(self, fs=None, max_workers=ASYNC_MAX_WORKERS, max_in_flight=ASYNC_MAX_IN_FLIGHT, executor=None):
+        self.fs = fs or LOCAL
+        self.max_in_flight = max_in_flight
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="FolderCrafterIO")
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        """Shut down the thread pool, if this crafter created it."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def create(self, paths, target, digest=None, check=True, timeout=None):
+        """Async create_folders(): returns how many folders were crafted.
+
+        Raises TemplateError (from check_craftable, unless ``check`` is False),
+        the first OSError from the backend, or asyncio.TimeoutError.
+        """
+        return await asyncio.wait_for(self._create(paths, target, digest, check), timeout)
+
+    async def scan(self, root, prefix="", timeout=None):
+        """Async scan_folders(): the folders under ``root``, parents before children."""
+        return await asyncio.wait_for(self._scan(root, prefix), timeout)
+
+    async def _create(self, paths, target, digest, check):
+        loop = asyncio.get_running_loop()
+        if check:
+            await loop.run_in_executor(self.executor, check_craftable, paths, target, digest)
+
+        levels = await loop.run_in_executor(self.executor, plan_levels, paths, target)
+        count = 0
+        for folders in levels:
+            await self._map(self.fs.makedirs, folders)  # Each level finishes before the next starts
+            count += len(folders)
+        return count
+
+    async def _scan(self, root, prefix):
+        children = {}  # relative folder ("" for root) -> its subfolder names, sorted
+        level = [""]
+        while level:
+            listings = await self._map(functools.partial(self._list, root), level)
+
+            candidates = [(rel, name) for rel, names in zip(level, listings) for name in names]
+            is_dir = await self._map(
+                lambda candidate: self.fs.isdir(self._full_path(root, *candidate)), candidates
+            )
+
+            level = []
+            for (rel, name), found in zip(candidates, is_dir):
+                if found:
+                    child = f"{rel}/{name}" if rel else name
+                    children.setdefault(rel, []).append(name)
+                    level.append(child)
+
+        # Depth-first, parents before children, as scan_folders() returns them
+        paths = []
+        stack = list(reversed(children.get("", [])))
+        while stack:
+            rel = stack.pop()
+            paths.append(prefix + rel)
+            stack.extend(f"{rel}/{name}" for name in reversed(children.get(rel, [])))
+        return paths
+
+    def _list(self, root, rel):
+        try:
+            names = self.fs.listdir(self._full_path(root, rel))
+        except PermissionError:
+            return []  # Skip unreadable dirs
+        return sorted(name for name in names if not scan_ignored(name))
+
+    @staticmethod
+    def _full_path(root, rel, name=None):
+        parts = rel.split('/') if rel else []
+        if name is not None:
+            parts.append(name)
+        return os.path.join(root, *parts)
+
+    async def _map(self, func, items):
+        """[func(item) for item in items], run in the executor within the in-flight limit.
+
+        Stops at the first error, cancels the calls still queued, and raises
+        it once the running ones have finished; cancellation does the same.
+        A call's slot is freed when the call returns (or is cancelled before
+        it starts), not when its task gives up on it, so calls abandoned by
+        a timeout still count against the limit while they run.
+        """
+        loop = asyncio.get_running_loop()
+        results = [None] * len(items)
+        pending = {}  # asyncio future -> the executor's future it wraps
+        errors = []
+
+        def run(item):
+            try:
+                return func(item)
+            finally:
+                with contextlib.suppress(RuntimeError):  # The loop may be gone by now
+                    loop.call_soon_threadsafe(self._slots.release)
+
+        def cancel_queued():
+            for future, call in list(pending.items()):
+                if call.cancel():  # Only succeeds for calls that never started
+                    del pending[future]
+                    self._slots.release()
+
+        def finished(future, i):
+            pending.pop(future, None)
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                errors.append(future.exception())
+            else:
+                results[i] = future.result()
+
+        try:
+            for i, item in enumerate(items):
+                await self._slots.acquire()
+                if errors:
+                    self._slots.release()
+                    break
+                call = self.executor.submit(run, item)
+                future = asyncio.wrap_future(call, loop=loop)
+                pending[future] = call
+                future.add_done_callback(functools.partial(finished, i=i))
+            if errors:
+                cancel_queued()
+            if pending:
+                await asyncio.wait(set(pending))
+        except BaseException:
+            cancel_queued()
+            raise
+
+        if errors:
+            raise errors[0]
+        return results
+
+
+async def create_folders_async(paths, target, digest=None, check=True, fs=None, timeout=None):
+    """One-off AsyncCrafter.create(); share an AsyncCrafter when running many."""
+    async with AsyncCrafter(fs) as crafter:
+        return await crafter.create(paths, target, digest, check, timeout)
+
+
+async def scan_folders_async(root, prefix="", fs=None, timeout=None):
+    """One-off AsyncCrafter.scan(); share an AsyncCrafter when running many."""
+    async with AsyncCrafter(fs) as crafter:
+        return await crafter.scan(root, prefix, timeout)
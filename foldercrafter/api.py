@@ -0,0 +1,59 @@
+"""The documented entry points of the core library (re-exported by the package)."""
+
+from .craft import create_folders, plan_folders, scan_folders
+from .diff import diff_templates, merge_templates
+from .safety import normalize_template_paths
+from .syntax import parse_indented_lines
+from .tree import format_paths_to_indented, format_paths_to_tree
+from .validate import validate_template
+
+
+def parse(text):
+    """Indented template text -> normalized folder paths ("Parent/Child").
+    
+    Raises TemplateError for paths that could escape the target folder.
+    """
+    return normalize_template_paths(parse_indented_lines(text))
+
+
+def render(paths, indented=False):
+    """Folder paths -> the tree text shown in previews (or editable indented text)."""
+    return format_paths_to_indented(paths) if indented else format_paths_to_tree(paths)
+
+
+def validate(paths, target=None):
+    """Problems that would stop ``paths`` being created: [(path, problem), ...].
+    
+    With ``target``, full paths are also checked against Windows MAX_PATH.
+    """
+    return validate_template(paths, target)
+
+
+def plan(paths, target):
+    """Absolute folders create() would make, as a list (patterns expanded)."""
+    return list(plan_folders(paths, target))
+
+
+def create(paths, target, fs=None):
+    """Create ``paths`` under ``target``; returns how many were crafted.
+    
+    Raises TemplateError, before touching the disk, if the template is too
+    large or validate() finds problems. ``fs`` picks a filesystem backend
+    (see foldercrafter.fs); the default is the local disk.
+    """
+    return create_folders(paths, target, fs=fs)
+
+
+def scan(folder, fs=None):
+    """An existing folder's subfolders as template paths, ready to save or render."""
+    return scan_folders(folder, fs=fs)
+
+
+def diff(old, new):
+    """How ``new`` differs from ``old``: a TemplateDiff of added, removed, renamed and moved subtrees."""
+    return diff_templates(old, new)
+
+
+def merge(base, ours, theirs):
+    """Three-way merge of two edited copies of ``base``; a MergeResult with .paths and .conflicts."""
+    return merge_templates(base, ours, theirs)
@@ -0,0 +1,141 @@
+"""Command-line actions, usable without the GUI (python -m foldercrafter)."""
+
+import os
+import sys
+
+from .compose import TemplateResolver
+from .craft import create_folders, scan_folders
+from .diff import diff_templates, merge_templates
+from .safety import normalize_template_paths
+from .storage import load_templates, read_template_file
+from .syntax import TemplateError
+from .trace import enable_from_argv
+from .tree import format_paths_to_indented
+from .validate import validate_template
+
+
+USAGE = """Usage:
+  python -m foldercrafter --list
+  python -m foldercrafter --validate "Template Name" [TARGET]
+  python -m foldercrafter --create "Template Name" TARGET
+  python -m foldercrafter --scan FOLDER
+  python -m foldercrafter --diff OLD NEW
+  python -m foldercrafter --merge BASE OURS THEIRS
+
+Templates for --diff and --merge can be saved template names or exported
+template files (.json or .fct). --diff compares the folders each creates;
+--merge prints the merged template as indented text.
+
+Add --trace [FILE] to any of these to write a Chrome trace of the run."""
+
+
+def run_cli(argv):
+    """Handle command-line only actions.
+    
+    Returns a process exit code, or None when the GUI should start instead.
+    
+    Usage: python -m foldercrafter --validate "Template Name" [TARGET]
+    (main.py accepts the same arguments)
+    """
+    if len(argv) < 2 or argv[1] != "--validate":
+        return None
+    
+    if len(argv) < 3:
+        print('Usage: python -m foldercrafter --validate "Template Name" [TARGET]', file=sys.stderr)
+        return 2
+    
+    name = argv[2]
+    target = argv[3].strip('"') if len(argv) > 3 else None
+    templates = load_templates()
+    if name not in templates:
+        print(f"No template named '{name}'.", file=sys.stderr)
+        return 2
+    
+    resolver = TemplateResolver(templates)
+    try:
+        paths = resolver.resolve(name)
+        digest = resolver.content_hash(name)
+    except TemplateError as ex:
+        print(ex, file=sys.stderr)
+        return 2
+    
+    issues = validate_template(paths, target, digest)
+    for path, problem in issues:
+        print(f"{path}: {problem}")
+    print(f"{len(issues)} problem(s) found in '{name}'.")
+    return 1 if issues else 0
+
+
+def template_paths(templates, resolver, ref, resolve=True):
+    """Paths of a saved template or an exported template file, includes expanded if ``resolve``."""
+    if ref in templates:
+        return resolver.resolve(ref) if resolve else list(templates[ref])
+    if os.path.isfile(ref):
+        paths = normalize_template_paths(read_template_file(ref)[1])
+        return resolver.resolve_paths(paths) if resolve else paths
+    raise TemplateError(f"No template or template file named '{ref}'.")
+
+
+def main(argv=None):
+    """Entry point for python -m foldercrafter; returns the exit code."""
+    argv = list(sys.argv if argv is None else argv)
+    enable_from_argv(argv)
+    command = argv[1] if len(argv) > 1 else None
+    
+    if command == "--validate":
+        return run_cli(argv)
+    
+    if command == "--list" and len(argv) == 2:
+        for name in load_templates():
+            print(name)
+        return 0
+    
+    if command == "--create" and len(argv) == 4:
+        name, target = argv[2], argv[3].strip('"')
+        templates = load_templates()
+        if name not in templates:
+            print(f"No template named '{name}'.", file=sys.stderr)
+            return 2
+        resolver = TemplateResolver(templates)
+        try:
+            count = create_folders(resolver.resolve(name), target, resolver.content_hash(name))
+        except (TemplateError, OSError) as ex:
+            print(ex, file=sys.stderr)
+            return 1
+        print(f"Created {count} folders in {target}.")
+        return 0
+    
+    if command == "--diff" and len(argv) == 4:
+        templates = load_templates()
+        resolver = TemplateResolver(templates)
+        try:
+            old, new = (template_paths(templates, resolver, ref.strip('"')) for ref in argv[2:4])
+        except (TemplateError, OSError, ValueError) as ex:
+            print(ex, file=sys.stderr)
+            return 2
+        diff = diff_templates(old, new)
+        for line in diff.lines():
+            print(line)
+        print(diff.summary() if diff else "No differences.")
+        return 1 if diff else 0
+    
+    if command == "--merge" and len(argv) == 5:
+        templates = load_templates()
+        resolver = TemplateResolver(templates)
+        try:
+            base, ours, theirs = (template_paths(templates, resolver, ref.strip('"'), resolve=False) for ref in argv[2:5])
+        except (TemplateError, OSError, ValueError) as ex:
+            print(ex, file=sys.stderr)
+            return 2
+        result = merge_templates(base, ours, theirs)
+        print(format_paths_to_indented(result.paths))
+        for path, problem in result.conflicts:
+            print(f"Conflict: {path}: {problem}", file=sys.stderr)
+        return 1 if result.conflicts else 0
+    
+    if command == "--scan" and len(argv) == 3:
+        print(format_paths_to_indented(scan_folders(argv[2].strip('"'))))
+        return 0
+    
+    print(USAGE, file=sys.stderr)
+    return 2
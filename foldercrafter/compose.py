@@ -0,0 +1,134 @@
+"""Resolution of @include lines between templates."""
+
+from collections import OrderedDict
+
+from .config import TEMPLATE_CACHE_MAX_PATHS
+from .packed import PackedTemplate
+from .syntax import INCLUDE_MARKER, TemplateError, split_include
+from .validate import content_hash
+
+
+def has_includes(paths):
+    """Whether a template body has @include lines (packed templates never do)."""
+    return not isinstance(paths, PackedTemplate) and any(INCLUDE_MARKER in p for p in paths)
+
+
+class TemplateResolver:
+    """Expands @include lines, memoizing each template's resolved paths.
+
+    Every include seen while resolving is recorded, so invalidating a
+    template also drops the cached result of everything that includes it,
+    directly or through other templates. Only expanded lists are cached,
+    least recently used first out once they hold more than
+    ``max_cached_paths`` paths; a template without includes resolves to
+    its own body, which the library already caches.
+    """
+
+    def __init__(self, templates, max_cached_paths=TEMPLATE_CACHE_MAX_PATHS):
+        self.templates = templates
+        self.max_cached_paths = max_cached_paths
+        self._cache = OrderedDict()
+        self._cached_paths = 0
+        self._hashes = {}
+        self._dependents = {}  # template name -> names that include it directly
+
+    def resolve(self, name):
+        """Full path list for a saved template, with includes expanded."""
+        return self._resolve(name, ())
+
+    def resolve_paths(self, paths, owner=None):
+        """Expand includes in an unsaved path list (e.g. the editor contents).
+        
+        ``owner`` is the name the paths will be saved under, so a template
+        including itself is caught as a cycle.
+        """
+        return self._expand(paths, (owner,) if owner else (), None)
+
+    def content_hash(self, name):
+        """content_hash() of a template's resolved paths, memoized like resolve()."""
+        digest = self._hashes.get(name)
+        if digest is None:
+            if name in self.templates and hasattr(self.templates, "content_hash") and not has_includes(self.templates[name]):
+                digest = self.templates.content_hash(name)  # No includes, so the library may know it
+            else:
+                digest = content_hash(self.resolve(name))
+            self._hashes[name] = digest
+        return digest
+
+    def invalidate(self, name):
+        """Forget cached results for a template and everything that includes it."""
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            self._forget(current)
+            self._hashes.pop(current, None)
+            pending.extend(self._dependents.pop(current, ()))
+
+    def _resolve(self, name, stack):
+        cached = self._cache.get(name)
+        if cached is not None and not (stack and self._includes(name, stack[0])):
+            self._cache.move_to_end(name)
+            return cached
+        
+        if name in stack:
+            raise TemplateError("Circular include: " + " → ".join(stack + (name,)))
+        if name not in self.templates:
+            raise TemplateError(f"Included template '{name}' does not exist.")
+        
+        body = self.templates[name]
+        paths = self._expand(body, stack + (name,), name)
+        if paths is not body:
+            self._remember(name, paths)
+        return paths
+
+    def _includes(self, name, root):
+        """Whether ``name``'s cached resolution includes ``root``, directly or not.
+        
+        ``root`` may be an unsaved edit (resolve_paths), so a result cached
+        from its saved version must not hide the cycle the edit creates.
+        """
+        pending, seen = [root], {root}
+        while pending:
+            for includer in self._dependents.get(pending.pop(), ()):
+                if includer == name:
+                    return True
+                if includer not in seen:
+                    seen.add(includer)
+                    pending.append(includer)
+        return False
+
+    def _remember(self, name, paths):
+        self._cache[name] = paths
+        self._cached_paths += len(paths)
+        while self._cached_paths > self.max_cached_paths and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_paths -= len(evicted)
+
+    def _forget(self, name):
+        paths = self._cache.pop(name, None)
+        if paths is not None:
+            self._cached_paths -= len(paths)
+
+    def _expand(self, paths, stack, owner):
+        if not has_includes(paths):
+            return paths
+        
+        resolved = []
+        for p in paths:
+            include = split_include(p) if INCLUDE_MARKER in p else None
+            if include is None:
+                resolved.append(p)
+                continue
+            
+            mount, included = include
+            sub_paths = self._resolve(included, stack)
+            if owner is not None:
+                self._dependents.setdefault(included, set()).add(owner)
+            
+            if mount:
+                resolved.extend(f"{mount}/{sp}" for sp in sub_paths)
+                if not sub_paths:
+                    resolved.append(mount)
+            else:
+                resolved.extend(sub_paths)
+        return resolved
@@ -0,0 +1,51 @@
+"""Locations and limits shared by the core library and the app."""
+
+from pathlib import Path
+
+
+DATA_DIR = Path.home() / ".foldercrafter"
+SAVE_FILE = "foldercrafter_templates.json"  # Legacy single-file library, migrated on first run
+TEMPLATES_DIR = "templates"
+INDEX_FILE = "index.json"
+
+# Upper bound on folder paths kept in memory across lazily loaded templates
+TEMPLATE_CACHE_MAX_PATHS = 1_000_000
+
+# Folder names added to the search index per batch by the background indexing pass
+FOLDER_INDEX_BATCH = 50_000
+
+# Stored templates at least this large (and free of patterns/includes) use the packed format
+PACKED_MIN_PATHS = 20_000
+
+# Whole-library bundles: a JSON header line, then one template per line
+LIBRARY_EXTENSION = ".fclib"
+LIBRARY_FORMAT = "foldercrafter-library"
+
+# Shared-folder sync: where the chosen folder and last-synced hashes live,
+# and how long to wait for (or when to break) another machine's lock
+SYNC_STATE_FILE = "sync.json"
+SYNC_LOCK_TIMEOUT_SECONDS = 15
+SYNC_LOCK_STALE_SECONDS = 120
+
+# Saves arriving within this window are written to disk as one batch
+SAVE_COALESCE_SECONDS = 0.3
+
+# Bulk saves (imports, scans, sync pulls) wait for the writer once this many paths are queued
+SAVE_QUEUE_MAX_PATHS = 1_000_000
+
+# Crafting refuses templates whose {...} patterns expand past this many folders
+MAX_EXPANDED_FOLDERS = 500_000
+
+# Windows MAX_PATH (260) minus the terminating NUL
+MAX_PATH_LENGTH = 259
+
+# Tracing: set FOLDERCRAFTER_TRACE to an output file (or "1" for one under
+# DATA_DIR/traces), or pass --trace FILE; events past the cap are dropped
+TRACE_ENV = "FOLDERCRAFTER_TRACE"
+TRACES_DIR = "traces"
+TRACE_MAX_EVENTS = 1_000_000
+
+# Async crafting/scanning: threads running blocking filesystem calls, and how
+# many calls may be queued or running at once across every target
+ASYNC_MAX_WORKERS = 64
+ASYNC_MAX_IN_FLIGHT = 4096
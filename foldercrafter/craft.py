@@ -0,0 +1,151 @@
+"""Planning and creating folder structures on disk, and scanning existing ones."""
+
+import itertools
+import os
+import time
+
+from .config import MAX_EXPANDED_FOLDERS
+from .fs import LOCAL
+from .patterns import count_expanded_paths, iter_expanded_paths
+from .syntax import TemplateError
+from .trace import is_enabled, span
+from .validate import format_issues, validate_template
+
+
+# Scanning skips tooling and build folders (and anything named like a file we never want)
+SCAN_IGNORED_DIRS = {'node_modules', '.git', '__pycache__', 'dist', 'build', 'venv', '.idea', '.vscode', '.venv', 'bin', 'obj'}
+SCAN_IGNORED_FILES = {'.DS_Store', 'Thumbs.db', 'desktop.ini'}
+SCAN_IGNORED_EXTS = {'.exe', '.dll', '.pyc', '.o', '.so', '.class'}
+
+# Folders are planned and created in batches this size, each its own trace span
+CRAFT_BATCH_SIZE = 1000
+
+
+def scan_ignored(name):
+    """Whether scanning skips an entry with this name (see SCAN_IGNORED_*)."""
+    if name in SCAN_IGNORED_DIRS or name in SCAN_IGNORED_FILES:
+        return True
+    return os.path.splitext(name)[1].lower() in SCAN_IGNORED_EXTS
+
+
+def plan_folders(paths, target):
+    """Yield the absolute folder crafting ``paths`` into ``target`` creates for each path.
+    
+    ``paths`` must be resolved (no @include lines) and normalized, which
+    saved and imported templates always are, so segments are joined as-is.
+    Missing parent folders are created along with each one.
+    """
+    target_abs = os.path.abspath(target)
+    for p in iter_expanded_paths(paths):
+        yield os.path.join(target_abs, *p.split('/'))
+
+
+def check_craftable(paths, target=None, digest=None):
+    """Raise TemplateError unless ``paths`` can be crafted into ``target``.
+    
+    Refuses templates expanding past MAX_EXPANDED_FOLDERS and anything
+    validate_template() reports.
+    """
+    with span("count", cat="craft") as s:
+        total = count_expanded_paths(paths)
+        s.set(folders=total)
+    if total > MAX_EXPANDED_FOLDERS:
+        raise TemplateError(
+            f"This template expands to {total:,} folders, more than the limit of {MAX_EXPANDED_FOLDERS:,}."
+        )
+    
+    with span("validate", cat="craft") as s:
+        issues = validate_template(paths, target, digest)
+        s.set(issues=len(issues))
+    if issues:
+        raise TemplateError(
+            f"Found {len(issues):,} problem(s) that would stop these folders being created:\n\n"
+            f"{format_issues(issues)}"
+        )
+
+
+def create_folders(paths, target, digest=None, check=True, fs=None):
+    """Create a resolved template's folders under ``target``; returns how many paths were crafted.
+    
+    With ``check`` (the default) the template is first run through
+    check_craftable(); pass False if the caller already did. Folders are
+    made through ``fs`` (see foldercrafter.fs), the local disk by default.
+    """
+    fs = fs or LOCAL
+    with span("create_folders", cat="craft", target=str(target)) as s:
+        if check:
+            check_craftable(paths, target, digest)
+        
+        planned = plan_folders(paths, target)
+        count = 0
+        while True:
+            with span("plan", cat="craft"):
+                batch = list(itertools.islice(planned, CRAFT_BATCH_SIZE))
+            if not batch:
+                break
+            with span("mkdir", cat="craft", folders=len(batch)):
+                for folder in batch:
+                    fs.makedirs(folder)
+            count += len(batch)
+        s.set(folders=count)
+    return count
+
+
+def scan_folders(root, prefix="", fs=None):
+    """Relative paths ("a/b") of the folders under ``root``, parents before children.
+    
+    Files are ignored, since FolderCrafter only generates folders, and so
+    are unreadable folders and the SCAN_IGNORED_* names. The folders are
+    read through ``fs`` (see foldercrafter.fs), the local disk by default.
+    
+    The trace span reports the time spent listing, sorting and checking
+    entries, which are interleaved too finely for spans of their own.
+    """
+    fs = fs or LOCAL
+    paths = []
+    if not is_enabled():
+        _scan_into(fs, root, prefix, paths)
+        return paths
+    
+    timings = {"list": 0, "sort": 0, "stat": 0, "directories": 0}  # Times in nanoseconds
+    with span("scan_folders", cat="scan", root=str(root)) as s:
+        _scan_into(fs, root, prefix, paths, timings)
+        s.set(
+            folders=len(paths),
+            directories=timings["directories"],
+            **{f"{phase}_ms": round(timings[phase] / 1e6, 3) for phase in ("list", "sort", "stat")}
+        )
+    return paths
+
+
+def _scan_into(fs, root, prefix, paths, timings=None):
+    # timings is only passed while tracing, so plain scans skip the clock calls
+    clock = time.perf_counter_ns
+    started = clock() if timings is not None else 0
+    try:
+        names = fs.listdir(root)
+    except PermissionError:
+        return  # Skip unreadable dirs
+    if timings is None:
+        items = sorted(names)
+    else:
+        listed = clock()
+        items = sorted(names)
+        timings["list"] += listed - started
+        timings["sort"] += clock() - listed
+        timings["directories"] += 1
+    
+    for item in items:
+        if scan_ignored(item):
+            continue
+        
+        full_path = os.path.join(root, item)
+        if timings is None:
+            is_dir = fs.isdir(full_path)
+        else:
+            started = clock()
+            is_dir = fs.isdir(full_path)
+            timings["stat"] += clock() - started
+        if is_dir:
+            paths.append(prefix + item)
+            _scan_into(fs, full_path, prefix + item + "/", paths, timings)
@@ -0,0 +1,66 @@
+"""Templates every installation starts with."""
+
+DEFAULT_TEMPLATES = {
+    "Film / Video": [
+        "01 Project/01 Premiere",
+        "01 Project/02 After Effects",
+        "02 Assets/01 Footage",
+        "02 Assets/02 Stock",
+        "02 Assets/03 Audio/01 Location Sound",
+        "02 Assets/03 Audio/02 ADR",
+        "02 Assets/03 Audio/03 SFX",
+        "02 Assets/03 Audio/04 Music",
+        "02 Assets/04 Graphics/01 Logos",
+        "02 Assets/04 Graphics/02 Credits",
+        "02 Assets/04 Graphics/03 Photos",
+        "02 Assets/04 Graphics/04 Graphic Elements",
+        "03 Docs",
+        "04 Exports",
+        "05 Stuff",
+    ],
+    "AI Video Production": [
+        "01 Project/01 Premiere",
+        "01 Project/02 After Effects",
+        "01 Project/03 Photoshop",
+        "02 REFS/01 Locations",
+        "02 REFS/02 Characters",
+        "02 REFS/03 Moodboard",
+        "03 Assets/01 Working Frames",
+        "03 Assets/02 Frames",
+        "03 Assets/03 Videos",
+        "03 Assets/04 Audio/01 Recording",
+        "03 Assets/04 Audio/02 SFX",
+        "03 Assets/04 Audio/03 Ambience",
+        "03 Assets/04 Audio/04 Music",
+        "03 Assets/05 Graphics/01 Logos",
+        "03 Assets/05 Graphics/02 Graphic Elements",
+        "04 Exports",
+        "05 Stuff",
+    ],
+    "Web Project": [
+        "src",
+        "src/assets/images",
+        "src/assets/fonts",
+        "src/components",
+        "src/styles",
+        "public",
+    ],
+    "Data Science": [
+        "data/raw",
+        "data/processed",
+        "notebooks",
+        "src/models",
+        "src/visualization",
+    ],
+    "Photo Archive": [
+        "Photos",
+        "Edited",
+        "Exports",
+    ],
+    "Game Dev": [
+        "Assets/Sprites",
+        "Assets/Audio",
+        "Scripts",
+        "Scenes",
+    ],
+}
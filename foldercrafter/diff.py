@@ -0,0 +1,363 @@
+"""Structural diff and three-way merge of templates.
+
+Templates are compared as folder trees, in time linear in the number of
+folders. Every subtree gets a digest of everything below it. Subtrees with
+equal digests are skipped without being walked, and the digests pair up
+removed and added subtrees with identical contents, which shows them as
+renamed or moved rather than as a delete plus an add.
+
+Both functions take plain path lists: stored templates (with @include
+lines and {...} patterns kept as written) or resolved ones.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+
+from .syntax import split_parent
+
+
+class _Tree:
+    """Every folder of a template (implied parents included) with subtree digests."""
+
+    def __init__(self, paths):
+        self.children = {"": []}  # path -> child paths ("" is the root)
+        self.names = {}
+        for p in paths:
+            missing = []
+            while p and p not in self.children:
+                parent, name = split_parent(p)
+                missing.append((p, parent, name))
+                p = parent
+            for path, parent, name in reversed(missing):
+                self.children[parent].append(path)
+                self.children[path] = []
+                self.names[path] = name
+
+        # Pre-order, then digests bottom-up. A subtree's digest covers its
+        # children's names and digests but not its own name, so a renamed
+        # folder keeps its digest. Children are summed, not sorted, to keep
+        # this linear and independent of their order.
+        self.order = []
+        stack = [""]
+        while stack:
+            path = stack.pop()
+            self.order.append(path)
+            stack.extend(self.children[path])
+
+        self.digest = {}
+        self.size = {}  # path -> folders in the subtree, itself included
+        blake2b = hashlib.blake2b
+        for path in reversed(self.order):
+            total, size = 0, 1
+            for child in self.children[path]:
+                entry = blake2b(
+                    self.names[child].encode("utf-8") + b"\0" + self.digest[child].to_bytes(16, "little"),
+                    digest_size=16
+                ).digest()
+                total += int.from_bytes(entry, "little")
+                size += self.size[child]
+            self.digest[path] = total % (1 << 128)
+            self.size[path] = size
+
+    def __contains__(self, path):
+        return path in self.children
+
+    def subtree(self, path):
+        """``path`` and every folder below it, parents first."""
+        stack = [path]
+        while stack:
+            path = stack.pop()
+            yield path
+            stack.extend(self.children[path])
+
+
+class TemplateDiff:
+    """How a second template differs from a first, as whole subtrees.
+
+    ``added`` and ``removed`` list only the topmost folder of each changed
+    subtree; ``renamed`` and ``moved`` are (old path, new path) pairs whose
+    contents are unchanged. ``folders`` counts the folders in each listed
+    subtree.
+    """
+
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.renamed = []  # Same parent, new name
+        self.moved = []    # New parent (and possibly a new name)
+        self.folders = {}
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.renamed or self.moved)
+
+    def summary(self):
+        return (
+            f"{len(self.added)} added, {len(self.removed)} removed, "
+            f"{len(self.renamed)} renamed, {len(self.moved)} moved"
+        )
+
+    def lines(self):
+        """One line per change, in tree order: "+ added", "- removed", "~ renamed", "> moved"."""
+        def count(path):
+            n = self.folders[path]
+            return f"  ({n:,} folders)" if n > 1 else ""
+
+        changes = [(p, f"+ {p}{count(p)}") for p in self.added]
+        changes += [(p, f"- {p}{count(p)}") for p in self.removed]
+        changes += [(old, f"~ {old} -> {split_parent(new)[1]}{count(old)}") for old, new in self.renamed]
+        changes += [(old, f"> {old} -> {new}{count(old)}") for old, new in self.moved]
+        changes.sort(key=lambda change: change[0].replace('/', '\0'))
+        return [line for _, line in changes]
+
+
+def diff_templates(old_paths, new_paths):
+    """A TemplateDiff of what changed from ``old_paths`` to ``new_paths``."""
+    return _diff_trees(_Tree(old_paths), _Tree(new_paths))
+
+
+def _diff_trees(old, new):
+    diff = TemplateDiff()
+    removed, added = [], []
+    stack = [""]
+    while stack:
+        path = stack.pop()
+        if old.digest[path] == new.digest[path]:
+            continue  # Identical below here
+        for child in old.children[path]:
+            if child in new:
+                stack.append(child)
+            else:
+                removed.append(child)
+        added.extend(child for child in new.children[path] if child not in old)
+
+    # Pair removed and added subtrees with the same contents, one-to-one.
+    # Folders inside them count too, so moves into a new folder or out of a
+    # removed one are found. Empty folders have no contents to match on, so
+    # they are never paired: a renamed empty folder is a removal plus an add.
+    # Shallow groups go first, and folders inside an already paired subtree
+    # moved with it, so they are left out of deeper groups.
+    removed_tops, added_tops = set(removed), set(added)
+    by_digest = defaultdict(lambda: ([], []))
+    for side, tree, tops in ((0, old, removed), (1, new, added)):
+        for top in tops:
+            for path in tree.subtree(top):
+                if tree.children[path]:
+                    by_digest[tree.digest[path]][side].append(path)
+    groups = [(olds, news) for olds, news in by_digest.values() if olds and news]
+    groups.sort(key=lambda group: min(p.count('/') for p in group[0] + group[1]))
+
+    def within(path, paired, tops):
+        # Whether a folder above ``path`` (up to its top) is already paired
+        while path not in tops:
+            path = split_parent(path)[0]
+            if path in paired:
+                return True
+        return False
+
+    pairs = []
+    paired_old, paired_new = set(), set()
+    for olds, news in groups:
+        olds = [p for p in olds if not within(p, paired_old, removed_tops)]
+        news = [p for p in news if not within(p, paired_new, added_tops)]
+        for old_path, new_path in _match_subtrees(olds, news):
+            pairs.append((old_path, new_path))
+            paired_old.add(old_path)
+            paired_new.add(new_path)
+
+    for old_path, new_path in pairs:
+        if split_parent(old_path)[0] == split_parent(new_path)[0]:
+            diff.renamed.append((old_path, new_path))
+        else:
+            diff.moved.append((old_path, new_path))
+        diff.folders[old_path] = old.size[old_path]
+    for path in removed:
+        if path not in paired_old:
+            diff.removed.append(path)
+            diff.folders[path] = old.size[path]
+    for path in added:
+        if path not in paired_new:
+            diff.added.append(path)
+            diff.folders[path] = new.size[path]
+
+    # A subtree moved out of a removed folder, or into an added one, is
+    # counted as the move only
+    for paired, tops, tree in ((paired_old, removed_tops, old), (paired_new, added_tops, new)):
+        for path in paired:
+            top = path
+            while top not in tops:
+                top = split_parent(top)[0]
+            if top != path:
+                diff.folders[top] -= tree.size[path]
+    return diff
+
+
+def _natural_key(path):
+    name = split_parent(path)[1].lower()
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)], path
+
+
+def _match_subtrees(olds, news):
+    """One-to-one (old, new) pairs from subtrees that all have the same contents.
+
+    Ties are broken by keeping the parent (a rename), then by the name: the
+    same name, the same numbers in it (Ep01 -> Episode 01), and finally the
+    order of the names.
+    """
+    if len(olds) == 1 and len(news) == 1:
+        return [(olds[0], news[0])]
+
+    def numbers(path):
+        return tuple(int(n) for n in re.findall(r"\d+", split_parent(path)[1]))
+
+    tiers = (
+        lambda p: (split_parent(p)[0], numbers(p)),
+        lambda p: split_parent(p)[0],
+        lambda p: split_parent(p)[1].lower(),
+        numbers,
+        lambda p: None,
+    )
+    pairs = []
+    for key in tiers:
+        if not olds or not news:
+            break
+        buckets = defaultdict(lambda: ([], []))
+        for p in olds:
+            buckets[key(p)][0].append(p)
+        for p in news:
+            buckets[key(p)][1].append(p)
+        matched = set()
+        for bucket_olds, bucket_news in buckets.values():
+            if bucket_olds and bucket_news:
+                bucket_olds.sort(key=_natural_key)
+                bucket_news.sort(key=_natural_key)
+                for pair in zip(bucket_olds, bucket_news):
+                    pairs.append(pair)
+                    matched.update(pair)
+        olds = [p for p in olds if p not in matched]
+        news = [p for p in news if p not in matched]
+    return pairs
+
+
+class MergeResult:
+    """The merged template, and the changes the two sides disagreed on."""
+
+    def __init__(self, paths, conflicts):
+        self.paths = paths
+        self.conflicts = conflicts  # [(path, what happened)]
+
+    def summary(self):
+        lines = [f"Merged into {len(self.paths):,} folders."]
+        if self.conflicts:
+            lines.append(f"{len(self.conflicts)} conflict(s):")
+            lines.extend(f"• {path}: {message}" for path, message in self.conflicts[:10])
+        return "\n".join(lines)
+
+
+class _MoveCycle(Exception):
+    def __init__(self):
+        super().__init__()
+        self.chain = []  # Folders whose placement depends on each other
+
+
+def merge_templates(base_paths, ours_paths, theirs_paths):
+    """Three-way merge of two edited copies of ``base_paths``; returns a MergeResult.
+
+    Changes made on only one side are applied; when both sides renamed
+    or moved the same folder, or moved folders into each other, our
+    version wins. A folder one side removed is kept if the other side
+    changed anything in it, renamed or moved it. All of these are reported
+    as conflicts.
+    """
+    base, ours, theirs = _Tree(base_paths), _Tree(ours_paths), _Tree(theirs_paths)
+    sides = (("us", ours, _diff_trees(base, ours)), ("them", theirs, _diff_trees(base, theirs)))
+    conflicts = []
+
+    # Renames and moves, base path -> new path; ours take precedence
+    moves, origin = {}, {}
+    for who, _, diff in sides:
+        for old_path, new_path in diff.renamed + diff.moved:
+            if old_path in moves:
+                if moves[old_path] != new_path:
+                    conflicts.append((old_path, f"moved to '{moves[old_path]}' by us and '{new_path}' by them; kept ours"))
+                continue
+            moves[old_path] = new_path
+            origin[old_path] = who
+    destinations = defaultdict(list)
+    for old_path, new_path in moves.items():
+        destinations[new_path].append(old_path)
+    for new_path, olds in destinations.items():
+        if len(olds) > 1:
+            conflicts.append((new_path, f"both {' and '.join(olds)} became this folder; their contents were combined"))
+
+    # Base folders each side touched: move sources, parents of additions, and their ancestors
+    touched = {}
+    for who, _, diff in sides:
+        marks = set()
+        for path in [old for old, _ in diff.renamed + diff.moved] + [split_parent(p)[0] for p in diff.added]:
+            while path and path not in marks:
+                marks.add(path)
+                path = split_parent(path)[0]
+        touched[who] = marks
+
+    removed_tops = set()
+    for who, _, diff in sides:
+        other = "them" if who == "us" else "us"
+        for path in diff.removed:
+            if path in touched[other]:
+                conflicts.append((path, f"removed by {who} but changed by {other}; kept it"))
+            else:
+                removed_tops.add(path)
+
+    translated = {}
+    visiting = set()
+
+    def translate(path):
+        # Where a base (or newly added) folder ends up once both sides' moves apply
+        if not path:
+            return ""
+        result = translated.get(path)
+        if result is not None:
+            return result
+        if path in visiting:
+            raise _MoveCycle()
+        visiting.add(path)
+        try:
+            parent, name = split_parent(moves.get(path, path))
+            result = f"{translate(parent)}/{name}" if parent else name
+        except _MoveCycle as ex:
+            ex.chain.append(path)
+            raise
+        finally:
+            visiting.discard(path)
+        translated[path] = result
+        return result
+
+    while True:
+        merged = set()
+        try:
+            removed = set()
+            for path in base.order[1:]:  # Parents come first, so removal spreads down
+                if path not in moves and (path in removed_tops or split_parent(path)[0] in removed):
+                    removed.add(path)
+                    continue
+                merged.add(translate(path))
+            for _, tree, diff in sides:
+                for top in diff.added:
+                    merged.update(translate(p) for p in tree.subtree(top))
+            break
+        except _MoveCycle as ex:
+            # Each side moved a folder into the other's; drop their move and start over
+            candidates = [p for p in ex.chain if p in moves]
+            path = next((p for p in candidates if origin[p] == "them"), candidates[0])
+            conflicts.append((path, f"moved into '{moves.pop(path)}', which conflicts with another move; left in place"))
+            translated.clear()
+
+    # Additions inside a folder kept only because of a conflict still need every parent
+    for path in list(merged):
+        parent = split_parent(path)[0]
+        while parent and parent not in merged:
+            merged.add(parent)
+            parent = split_parent(parent)[0]
+
+    return MergeResult(sorted(merged, key=lambda p: p.replace('/', '\0')), conflicts)
@@ -0,0 +1,180 @@
+"""Filesystem backends for crafting and scanning.
+
+create_folders() and scan_folders() do all their disk access through a
+backend, so the same code can run against the real disk, an in-memory tree
+(fast, deterministic tests) or either of those behind injected latency and
+failures (to benchmark behaviour on a slow network share without one).
+
+A backend needs three methods, each raising OSError subclasses the way the
+os function of the same name does:
+
+    makedirs(path)   create a folder and any missing parents (exist_ok)
+    listdir(path)    names of the entries in a folder
+    isdir(path)      whether path is an existing folder
+
+Paths are ordinary os.path strings in every backend.
+"""
+
+import errno
+import os
+import random
+import threading
+import time
+
+
+class LocalFileSystem:
+    """The real disk, through the os module."""
+
+    def makedirs(self, path):
+        os.makedirs(path, exist_ok=True)
+
+    def listdir(self, path):
+        return os.listdir(path)
+
+    def isdir(self, path):
+        return os.path.isdir(path)
+
+
+LOCAL = LocalFileSystem()
+
+
+class MemoryFileSystem:
+    """A folder tree held in dictionaries; safe to share between threads.
+
+    Paths are made absolute and normalized with os.path, so relative paths
+    resolve against the current directory as they would on disk. Files can
+    be added with add_file() and folders made unreadable with deny(), to
+    exercise the cases scanning has to skip.
+    """
+
+    def __init__(self):
+        self.root = {}  # name -> child dict for folders, None for files
+        self.denied = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parts(path):
+        path = os.path.normpath(os.path.abspath(path))
+        drive, rest = os.path.splitdrive(path)
+        parts = [p for p in rest.replace("\\", "/").split("/") if p]
+        return [drive] + parts if drive else parts
+
+    def _find(self, path):
+        node = self.root
+        for part in self._parts(path):
+            if node is None or part not in node:
+                return False, None
+            node = node[part]
+        return True, node
+
+    def makedirs(self, path):
+        with self._lock:
+            node = self.root
+            for part in self._parts(path):
+                child = node.get(part, {})
+                if child is None:
+                    raise FileExistsError(errno.EEXIST, "A file exists where a folder is needed", path)
+                node = node.setdefault(part, child)
+
+    def listdir(self, path):
+        with self._lock:
+            if self._key(path) in self.denied:
+                raise PermissionError(errno.EACCES, "Permission denied", path)
+            found, node = self._find(path)
+            if not found:
+                raise FileNotFoundError(errno.ENOENT, "No such file or directory", path)
+            if node is None:
+                raise NotADirectoryError(errno.ENOTDIR, "Not a directory", path)
+            return list(node)
+
+    def isdir(self, path):
+        with self._lock:
+            found, node = self._find(path)
+            return found and node is not None
+
+    def add_file(self, path):
+        """Create an empty file (and its parent folders)."""
+        parent, name = os.path.split(os.path.normpath(os.path.abspath(path)))
+        self.makedirs(parent)
+        with self._lock:
+            node = self._find(parent)[1]
+            if isinstance(node.get(name), dict):
+                raise IsADirectoryError(errno.EISDIR, "Is a directory", path)
+            node[name] = None
+
+    def deny(self, path):
+        """Make listdir() on ``path`` raise PermissionError."""
+        with self._lock:
+            self.denied.add(self._key(path))
+
+    def count(self):
+        """How many folders exist, not counting the root."""
+        with self._lock:
+            total, stack = 0, [self.root]
+            while stack:
+                children = [c for c in stack.pop().values() if c is not None]
+                total += len(children)
+                stack.extend(children)
+            return total
+
+    def _key(self, path):
+        return tuple(self._parts(path))
+
+
+class LatencyFileSystem:
+    """Wraps another backend, delaying every call and failing some on purpose.
+
+    Each call sleeps ``latency`` seconds, give or take up to ``jitter``, and
+    raises OSError(EIO) with probability ``failure_rate`` (before reaching
+    the wrapped backend, so a failed makedirs creates nothing). Only the
+    ``operations`` listed are affected. Delays and failures come from a
+    random.Random(seed), so single-threaded runs repeat exactly; with
+    several threads the sequence is still the same but which call gets
+    which draw depends on scheduling.
+
+    ``sleep`` can be replaced (e.g. with a no-op) to count the simulated
+    time, in ``simulated_seconds``, without waiting for it.
+    """
+
+    OPERATIONS = ("makedirs", "listdir", "isdir")
+
+    def __init__(self, backend=None, latency=0.02, jitter=0.0, failure_rate=0.0, seed=None,
+                 operations=OPERATIONS, sleep=time.sleep):
+        self.backend = backend if backend is not None else LOCAL
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.operations = frozenset(operations)
+        self.sleep = sleep
+        self.calls = dict.fromkeys(self.OPERATIONS, 0)
+        self.failures = 0
+        self.simulated_seconds = 0.0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _delay(self, operation, path):
+        if operation not in self.operations:
+            return
+        with self._lock:
+            self.calls[operation] += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self.failure_rate > 0 and self._random.random() < self.failure_rate
+            self.simulated_seconds += delay
+            if fail:
+                self.failures += 1
+        if delay:
+            self.sleep(delay)
+        if fail:
+            raise OSError(errno.EIO, f"Injected {operation} failure", path)
+
+    def makedirs(self, path):
+        self._delay("makedirs", path)
+        self.backend.makedirs(path)
+
+    def listdir(self, path):
+        self._delay("listdir", path)
+        return self.backend.listdir(path)
+
+    def isdir(self, path):
+        self._delay("isdir", path)
+        return self.backend.isdir(path)
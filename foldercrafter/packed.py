@@ -0,0 +1,181 @@
+"""Packed (.fct) templates: a binary, memory-mappable form of a FolderTree.
+
+Large templates are stored this way so opening one maps the file instead of
+parsing hundreds of thousands of JSON strings."""
+
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+from .config import PACKED_MIN_PATHS
+from .syntax import INCLUDE_MARKER, TemplateError
+from .tree import FolderTree
+
+
+# Header (little-endian): magic "FCT1", flags (u16), template name length (u16),
+# node count (u32), name table size (u32), then the UTF-8 template name padded
+# to 4 bytes. The body (zlib-compressed when flags has PACKED_COMPRESSED):
+#   parents      int32[count]     parent node index, -1 for top-level folders
+#   name_offsets uint32[count+1]  start of each name in the name table
+#   names        UTF-8 bytes      all folder names back to back
+# Nodes are stored in FolderTree (pre-order) order.
+PACKED_MAGIC = b"FCT1"
+PACKED_HEADER = struct.Struct("<4sHHII")
+PACKED_COMPRESSED = 0x1
+PACKED_EXTENSION = ".fct"
+
+
+def _align4(n):
+    return (n + 3) & ~3
+
+
+def _int_view(data, typecode):
+    """View little-endian int32/uint32 data without copying where possible."""
+    if sys.byteorder == "little":
+        return data.cast(typecode)
+    values = array(typecode)
+    values.frombytes(data)
+    values.byteswap()
+    return values
+
+
+class _NameTable:
+    """Folder names in a packed name table, decoded only when accessed."""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class PackedTree(FolderTree):
+    """FolderTree read from a .fct file.
+    
+    Parent indices and name offsets are viewed straight out of the
+    memory-mapped file and names are decoded one at a time as rows are
+    shown or paths are built, so opening a template with hundreds of
+    thousands of folders doesn't create hundreds of thousands of strings.
+    """
+
+    def __init__(self, template_name, parents, offsets, blob, buffer=None):
+        self.template_name = template_name
+        self.parents = parents
+        self.names = _NameTable(offsets, blob)
+        self._buffer = buffer  # Keeps the mapping alive
+        self._depths = None
+        self._children = None
+        self._descendants = None
+
+    @property
+    def depths(self):
+        if self._depths is None:
+            depths = array("i", bytes(4 * len(self.parents)))
+            for i, parent in enumerate(self.parents):
+                if parent >= 0:
+                    depths[i] = depths[parent] + 1
+            self._depths = depths
+        return self._depths
+
+    @classmethod
+    def open(cls, path):
+        """Map a .fct file; raises TemplateError if it isn't one."""
+        with open(path, "rb") as f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty files can't be mapped
+                buffer = b""
+        
+        view = memoryview(buffer)
+        if len(view) < PACKED_HEADER.size:
+            raise TemplateError(f"'{path}' is not a FolderCrafter packed template")
+        magic, flags, name_length, count, names_size = PACKED_HEADER.unpack_from(view)
+        if magic != PACKED_MAGIC:
+            raise TemplateError(f"'{path}' is not a FolderCrafter packed template")
+        
+        name_end = PACKED_HEADER.size + name_length
+        template_name = str(view[PACKED_HEADER.size:name_end], "utf-8")
+        body = view[_align4(name_end):]
+        if flags & PACKED_COMPRESSED:
+            body = memoryview(zlib.decompress(body))
+        
+        parents_end = 4 * count
+        offsets_end = parents_end + 4 * (count + 1)
+        if len(body) < offsets_end + names_size:
+            raise TemplateError(f"'{path}' is truncated")
+        
+        return cls(
+            template_name,
+            _int_view(body[:parents_end], "i"),
+            _int_view(body[parents_end:offsets_end], "I"),
+            body[offsets_end:offsets_end + names_size],
+            buffer
+        )
+
+
+class PackedTemplate:
+    """Path-list view of a PackedTree.
+    
+    Iterating yields the tree's leaf paths one at a time, so a stored packed
+    template can be crafted, validated or exported without building a list.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._count = None
+
+    def __iter__(self):
+        return self.tree.leaf_paths()
+
+    def __len__(self):
+        if self._count is None:
+            depths = self.tree.depths
+            last = len(depths) - 1
+            self._count = sum(1 for i in range(len(depths)) if i == last or depths[i + 1] <= depths[i])
+        return self._count
+
+    def __bool__(self):
+        return len(self.tree) > 0
+
+
+def encode_packed_tree(template_name, tree, compress=False):
+    """Serialize a FolderTree into the .fct format."""
+    names = [name.encode("utf-8") for name in tree.names]
+    offsets = array("I", [0])
+    total = 0
+    for name in names:
+        total += len(name)
+        offsets.append(total)
+    parents = array("i", tree.parents)
+    if sys.byteorder != "little":
+        offsets.byteswap()
+        parents.byteswap()
+    
+    body = parents.tobytes() + offsets.tobytes() + b"".join(names)
+    if compress:
+        body = zlib.compress(body)
+    
+    name_bytes = template_name.encode("utf-8")
+    header = PACKED_HEADER.pack(
+        PACKED_MAGIC, PACKED_COMPRESSED if compress else 0, len(name_bytes), len(names), total
+    ) + name_bytes
+    return header.ljust(_align4(len(header)), b"\0") + body
+
+
+def is_packable(paths):
+    """Whether a template can be stored packed (large, no patterns or includes)."""
+    if isinstance(paths, PackedTemplate):
+        return True
+    return len(paths) >= PACKED_MIN_PATHS and not any("{" in p or INCLUDE_MARKER in p for p in paths)
@@ -0,0 +1,274 @@
+"""Lazy expansion of {...} patterns in template paths."""
+
+import bisect
+import datetime
+import itertools
+import re
+
+from .packed import PackedTemplate
+from .tree import FolderTree, format_tree_line
+
+
+# A path segment may contain {...} groups that expand into several folders:
+#   {001..120}       zero-padded numeric range
+#   {0010..0990:10}  numeric range with a step
+#   {Audio,Video}    list of names
+#   {YYYY} {YY} {MM} {DD}  today's date
+# Anything else in braces is kept as literal text.
+PATTERN_RE = re.compile(r"\{([^{}]+)\}")
+RANGE_RE = re.compile(r"^(-?\d+)\.\.(-?\d+)(?::(\d+))?$")
+DATE_TOKENS = {"YYYY": "%Y", "YY": "%y", "MM": "%m", "DD": "%d"}
+
+
+class NumberRange:
+    """Inclusive numeric range formatted like its bounds, e.g. {001..120}."""
+
+    def __init__(self, start, stop, step=None):
+        first, last = int(start), int(stop)
+        step = int(step) if step else 1
+        if last < first:
+            step = -step
+        self.range = range(first, last + (1 if step > 0 else -1), step)
+
+        # Pad to the widest bound when either bound is written with leading zeros
+        padded = any(len(b.lstrip("-")) > 1 and b.lstrip("-").startswith("0") for b in (start, stop))
+        self.width = max(len(start), len(stop)) if padded else 0
+
+    def __len__(self):
+        return len(self.range)
+
+    def __getitem__(self, i):
+        return f"{self.range[i]:0{self.width}d}"
+
+
+def _pattern_values(body):
+    """Values for the inside of one {...} group, or None if it is literal text."""
+    if body in DATE_TOKENS:
+        return [datetime.date.today().strftime(DATE_TOKENS[body])]
+    
+    match = RANGE_RE.match(body)
+    if match:
+        start, stop, step = match.groups()
+        if step is not None and int(step) == 0:
+            return None
+        return NumberRange(start, stop, step)
+    
+    if "," in body:
+        return body.split(",")
+    
+    return None
+
+
+class SegmentExpansion:
+    """Every folder name a single path segment expands to.
+
+    Supports len() and indexing without generating the names, so a segment
+    like "S{01..10}E{001..500}" costs nothing until a name is asked for.
+    """
+
+    def __init__(self, segment):
+        self.literals = []
+        self.groups = []
+        pos = 0
+        for match in PATTERN_RE.finditer(segment):
+            values = _pattern_values(match.group(1))
+            if values is None:
+                continue
+            self.literals.append(segment[pos:match.start()])
+            self.groups.append(values)
+            pos = match.end()
+        self.tail = segment[pos:]
+
+        self.count = 1
+        for values in self.groups:
+            self.count *= len(values)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        
+        # Mixed-radix decode; the last group varies fastest
+        picks = []
+        for values in reversed(self.groups):
+            i, r = divmod(i, len(values))
+            picks.append(values[r])
+        picks.reverse()
+        
+        pieces = []
+        for literal, value in zip(self.literals, picks):
+            pieces.append(literal)
+            pieces.append(value)
+        pieces.append(self.tail)
+        return "".join(pieces)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+
+def iter_expanded_paths(paths):
+    """Yield template paths with their {...} patterns expanded, one at a time.
+
+    The cross product is walked lazily, so a template that expands to
+    hundreds of thousands of folders never exists as a list in memory.
+    """
+    if isinstance(paths, PackedTemplate):
+        yield from paths
+        return
+    
+    for p in paths:
+        if "{" not in p:
+            yield p
+            continue
+        
+        segments = [SegmentExpansion(s) for s in p.split('/')]
+        for names in itertools.product(*segments):
+            yield "/".join(names)
+
+
+def count_expanded_paths(paths):
+    """Number of paths iter_expanded_paths() will yield, without expanding them."""
+    if isinstance(paths, PackedTemplate):
+        return len(paths)
+    
+    total = 0
+    for p in paths:
+        if "{" not in p:
+            total += 1
+            continue
+        
+        n = 1
+        for s in p.split('/'):
+            n *= len(SegmentExpansion(s))
+        total += n
+    return total
+
+
+def _expand_colliding_segments(paths):
+    """Rewrite paths so no two sibling folders expand to the same name.
+
+    Where the expansions of siblings overlap (e.g. "A{1..3}" next to "A2"),
+    the pattern segments involved are replaced by their expanded names, so
+    the duplicates become one folder with both subtrees, as crafting makes
+    them. Only those segments are expanded; repeats until nothing overlaps,
+    since merging can bring overlapping children together.
+    """
+    while True:
+        tree = FolderTree(paths)
+        expansions = [SegmentExpansion(name) for name in tree.names]
+        
+        colliding = []
+        for parent in range(-1, len(tree.names)):
+            children = tree.children_of(parent)
+            if not any(expansions[c].groups for c in children):
+                continue
+            seen, duplicates = set(), set()
+            for c in children:
+                for name in expansions[c]:
+                    (duplicates if name in seen else seen).add(name)
+            if duplicates:
+                colliding.extend(c for c in children if expansions[c].groups and any(n in duplicates for n in expansions[c]))
+        if not colliding:
+            return paths
+        
+        # Raw path of each colliding node; skip those below another one, the next round handles them
+        raw = {}
+        for c in sorted(colliding):
+            parts = []
+            i = c
+            while i >= 0:
+                parts.append(tree.names[i])
+                i = tree.parents[i]
+            parts.reverse()
+            if not any(tuple(parts[:n]) in raw for n in range(1, len(parts))):
+                raw[tuple(parts)] = expansions[c]
+        
+        rewritten = []
+        for p in paths:
+            parts = p.split('/')
+            for n in range(1, len(parts) + 1):
+                expansion = raw.get(tuple(parts[:n]))
+                if expansion is not None:
+                    head, tail = parts[:n - 1], parts[n:]
+                    rewritten.extend("/".join(head + [name] + tail) for name in expansion)
+                    break
+            else:
+                rewritten.append(p)
+        paths = rewritten
+
+
+class ExpandedTree(FolderTree):
+    """FolderTree whose pattern nodes are expanded virtually for previewing.
+
+    Each raw node stands for len(expansion) folders, each with its own copy of
+    the subtree below it. Rows are located by walking subtree sizes, so a
+    preview of a million-folder expansion never generates the folders.
+    Sibling expansions that produce the same name are expanded up front and
+    merged (see _expand_colliding_segments), so the rows show the folders
+    crafting creates.
+    """
+
+    def __init__(self, paths):
+        super().__init__(_expand_colliding_segments(paths))
+        self.expansions = [SegmentExpansion(name) for name in self.names]
+
+        # spans[i]: rows covered by every instance of node i plus their subtrees
+        self.spans = [0] * len(self.names)
+        for i in range(len(self.names) - 1, -1, -1):
+            inner = 1 + sum(self.spans[c] for c in self.children_of(i))
+            self.spans[i] = len(self.expansions[i]) * inner
+        self.total = sum(self.spans[r] for r in self.roots)
+        self._offsets = {}
+
+    def _child_offsets(self, i):
+        offsets = self._offsets.get(i)
+        if offsets is None:
+            offsets = list(itertools.accumulate(self.spans[c] for c in self.children_of(i)))
+            self._offsets[i] = offsets
+        return offsets
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.total:
+            raise IndexError(row)
+        
+        node, depth = -1, 0
+        while True:
+            offsets = self._child_offsets(node)
+            k = bisect.bisect_right(offsets, row)
+            child = self.children_of(node)[k]
+            if k:
+                row -= offsets[k - 1]
+            
+            expansion = self.expansions[child]
+            instance, row = divmod(row, self.spans[child] // len(expansion))
+            if row == 0:
+                return format_tree_line(depth, expansion[instance])
+            
+            row -= 1
+            node, depth = child, depth + 1
+
+    def __iter__(self):
+        for row in range(self.total):
+            yield self[row]
+
+    def label(self, i):
+        count = len(self.expansions[i])
+        return super().label(i) + (f"  ×{count}" if self.expansions[i].groups else "")
+
+    def descendant_count(self, i):
+        return self.spans[i] - len(self.expansions[i])
+
+
+def build_folder_tree(paths):
+    """FolderTree for previewing paths, expanding {...} patterns when present."""
+    if isinstance(paths, PackedTemplate):
+        return paths.tree  # Packed templates never contain patterns
+    if any("{" in p for p in paths):
+        return ExpandedTree(paths)
+    return FolderTree(paths)
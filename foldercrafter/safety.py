@@ -0,0 +1,81 @@
+"""Normalizes template paths so none can escape the folder they are crafted into."""
+
+import re
+import sys
+
+from .patterns import SegmentExpansion
+from .syntax import INCLUDE_MARKER, TemplateError, split_include
+from .trace import span
+
+
+DRIVE_RE = re.compile(r"^[A-Za-z]:")
+
+
+def _is_dot_name(name):
+    """True for names Windows would resolve to '..' (dots, maybe trailing spaces)."""
+    return ".." in name and not name.strip(". ")
+
+
+def _may_expand_to_dot_name(expansion):
+    """True if some {...} expansion of a segment could come out as '..'."""
+    fixed = "".join(expansion.literals) + expansion.tail
+    if fixed.strip(". "):
+        return False
+    return all(
+        isinstance(values, list) and any(not v.strip(". ") for v in values)
+        for values in expansion.groups
+    )
+
+
+def normalize_template_path(path):
+    """Returns a template path in canonical, known-safe relative form.
+    
+    Backslashes become '/' and empty or '.' segments are dropped. Anything
+    that could land outside the target folder ('..', absolute paths, drive
+    letters, UNC shares) raises TemplateError. Templates are normalized once
+    when saved or imported so crafting can join segments without checks.
+    """
+    include = split_include(path) if INCLUDE_MARKER in path else None
+    mount = include[0] if include else path
+    mount = mount.replace("\\", "/")
+    
+    if mount.startswith("/"):
+        raise TemplateError(f"'{path}' is an absolute path")
+    
+    segments = []
+    for segment in mount.split('/'):
+        if segment in ("", "."):
+            continue
+        if _is_dot_name(segment):
+            raise TemplateError(f"'{path}' uses '..' to leave the target folder")
+        if DRIVE_RE.match(segment):
+            raise TemplateError(f"'{path}' contains a drive letter")
+        if "{" in segment and _may_expand_to_dot_name(SegmentExpansion(segment)):
+            raise TemplateError(f"'{path}' has a pattern that can expand to '..'")
+        segments.append(segment)
+    
+    if include:
+        segments.append(INCLUDE_MARKER + include[1])
+    return "/".join(segments)
+
+
+def normalize_template_paths(paths, strict=True):
+    """Normalizes a whole template with normalize_template_path().
+    
+    With ``strict`` False, unsafe paths are skipped (and reported on stderr)
+    instead of raising, which is how previously saved data is loaded.
+    """
+    normalized = []
+    with span("normalize", cat="template") as s:
+        for p in paths:
+            try:
+                p = normalize_template_path(p)
+            except TemplateError as ex:
+                if strict:
+                    raise
+                print(f"Skipping unsafe path: {ex}", file=sys.stderr)
+                continue
+            if p:
+                normalized.append(p)
+        s.set(paths=len(normalized))
+    return normalized
@@ -0,0 +1,192 @@
+"""Name, fuzzy and folder-name search over a template library."""
+
+import bisect
+import re
+import threading
+from collections import Counter
+
+from .packed import PackedTemplate
+
+
+# Share of a query's trigrams a name must contain to count as a fuzzy match
+FUZZY_MATCH_RATIO = 0.5
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _words(text):
+    return {w for w in re.split(r"[^\w]+", text) if w}
+
+
+def folder_terms(paths):
+    """Lowercased folder names used anywhere in a template, for searching."""
+    if isinstance(paths, PackedTemplate):
+        terms = {name.lower() for name in paths.tree.names}  # Each folder once, no paths built
+        terms.discard("")
+        return terms
+    
+    terms = set()
+    for p in paths:
+        terms.update(p.lower().split('/'))
+    terms.discard("")
+    return terms
+
+
+def _add_terms(terms, index, pairs):
+    """Index (term, name) pairs, keeping ``terms`` sorted with a single sort."""
+    new = []
+    for term, name in pairs:
+        names = index.get(term)
+        if names is None:
+            names = index[term] = set()
+            new.append(term)
+        names.add(name)
+    if new:
+        # Timsort merges the already sorted run with the new terms in one pass
+        terms.extend(new)
+        terms.sort()
+
+
+def _remove_terms(terms, index, pairs):
+    gone = []
+    for term, name in pairs:
+        names = index.get(term)
+        if names is None:
+            continue
+        names.discard(name)
+        if not names:
+            del index[term]
+            gone.append(term)
+    if len(gone) == 1:
+        del terms[bisect.bisect_left(terms, gone[0])]
+    elif gone:
+        terms[:] = [term for term in terms if term in index]
+
+
+def _terms_with_prefix(terms, prefix):
+    for i in range(bisect.bisect_left(terms, prefix), len(terms)):
+        term = terms[i]
+        if not term.startswith(prefix):
+            break
+        yield term
+
+
+class TemplateSearchIndex:
+    """Finds templates by name (prefix, substring, fuzzy) or by folder name.
+    
+    Names are indexed by their words, for prefix lookups with bisect, and by
+    trigrams, so substring and typo-tolerant matches only look at candidate
+    names. Folder names are indexed separately and may be added later (e.g.
+    from a background thread) since they need each template's body.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._names = {}          # name -> lowercased name
+        self._words = []          # sorted words appearing in names
+        self._word_index = {}     # word -> names
+        self._grams = {}          # trigram -> names
+        self._folders = []        # sorted folder names
+        self._folder_index = {}   # folder name -> templates
+        self._template_folders = {}  # template -> its folder names
+
+    def add(self, name, folders=None):
+        """Index a template's name, and its folder_terms() when given."""
+        self.add_many([name])
+        if folders is not None:
+            self.add_folders(name, folders)
+
+    def add_many(self, names):
+        """Index many template names, sorting the word list only once."""
+        words = []
+        with self._lock:
+            for name in names:
+                if name in self._names:
+                    continue
+                lowered = self._names[name] = name.lower()
+                words.extend((word, name) for word in _words(lowered) | {lowered})
+                for gram in _trigrams(lowered):
+                    self._grams.setdefault(gram, set()).add(name)
+            _add_terms(self._words, self._word_index, words)
+
+    def add_folders(self, name, folders, replace=True):
+        """Index folder_terms() for a template whose name is already indexed.
+        
+        With ``replace=False`` nothing happens if the template's folders are
+        already indexed, so a slow background pass can't undo a newer save.
+        """
+        self.add_folders_many([(name, folders)], replace)
+
+    def add_folders_many(self, items, replace=True):
+        """add_folders() for many (name, folders) pairs, sorting the folder list once."""
+        removed, added = [], []
+        with self._lock:
+            for name, folders in items:
+                if name not in self._names:
+                    continue  # Deleted meanwhile
+                old = self._template_folders.get(name)
+                if old is not None and not replace:
+                    continue
+                removed.extend((folder, name) for folder in (old or set()) - folders)
+                added.extend((folder, name) for folder in folders - (old or set()))
+                self._template_folders[name] = folders
+            _remove_terms(self._folders, self._folder_index, removed)
+            _add_terms(self._folders, self._folder_index, added)
+
+    def has_folders(self, name):
+        return name in self._template_folders
+
+    def remove(self, name):
+        with self._lock:
+            lowered = self._names.pop(name, None)
+            if lowered is None:
+                return
+            _remove_terms(self._words, self._word_index, ((word, name) for word in _words(lowered) | {lowered}))
+            for gram in _trigrams(lowered):
+                names = self._grams[gram]
+                names.discard(name)
+                if not names:
+                    del self._grams[gram]
+            _remove_terms(self._folders, self._folder_index, ((folder, name) for folder in self._template_folders.pop(name, ())))
+
+    def search(self, query, limit=None):
+        """Template names matching ``query``, best matches first.
+        
+        Ranking: name starts with the query, a word in the name does, the
+        name contains it, the name roughly matches it, a folder name starts
+        with it. An empty query matches nothing; callers list everything.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        
+        ranks = {}
+        
+        def offer(name, rank):
+            if rank < ranks.get(name, rank + 1):
+                ranks[name] = rank
+        
+        with self._lock:
+            for word in _terms_with_prefix(self._words, query):
+                for name in self._word_index[word]:
+                    offer(name, 0 if self._names[name].startswith(query) else 1)
+            
+            grams = _trigrams(query)
+            if grams:
+                hits = Counter()
+                for gram in grams:
+                    hits.update(self._grams.get(gram, ()))
+                for name, count in hits.items():
+                    if count == len(grams) and query in self._names[name]:
+                        offer(name, 2)
+                    elif count >= len(grams) * FUZZY_MATCH_RATIO:
+                        offer(name, 3)
+            
+            for folder in _terms_with_prefix(self._folders, query):
+                for name in self._folder_index[folder]:
+                    offer(name, 4)
+            
+            results = sorted(ranks, key=lambda name: (ranks[name], self._names[name]))
+        return results[:limit] if limit else results
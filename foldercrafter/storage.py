@@ -0,0 +1,606 @@
+"""Template storage: the on-disk store, the library mapping over it, and
+file formats for exchanging templates (single files and library bundles)."""
+
+import contextlib
+import hashlib
+import json
+import os
+import queue
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+
+from .config import (
+    DATA_DIR, FOLDER_INDEX_BATCH, INDEX_FILE, LIBRARY_FORMAT, SAVE_COALESCE_SECONDS, SAVE_FILE,
+    SAVE_QUEUE_MAX_PATHS,
+    TEMPLATE_CACHE_MAX_PATHS, TEMPLATES_DIR,
+)
+from .defaults import DEFAULT_TEMPLATES
+from .packed import PACKED_EXTENSION, PackedTemplate, PackedTree, encode_packed_tree, is_packable
+from .safety import normalize_template_paths
+from .search import TemplateSearchIndex, folder_terms
+from .syntax import TemplateError
+from .trace import span
+from .tree import FolderTree
+from .validate import content_hash, template_hash
+
+
+def write_json_atomic(path, data):
+    """Atomically write ``data`` as JSON (see write_bytes_atomic)."""
+    write_bytes_atomic(path, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def write_bytes_atomic(path, data):
+    """Atomically replace a file's contents (see atomic_write)."""
+    with atomic_write(path) as f:
+        f.write(data)
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode="wb", **open_kwargs):
+    """Open a file for writing so readers (and crashes) only see the old or new one.
+    
+    The data goes to a temp file in the same folder, is fsynced, then
+    renamed over the target, which is atomic on both Windows and POSIX.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class TemplateStore:
+    """User templates stored as one JSON file each, plus a small index.
+    
+    Saving or deleting a template rewrites only that template's file and the
+    index (names and file names), so the cost no longer grows with the size
+    of the whole library. Template files use the same format as exports.
+    
+    put() and delete() update the in-memory index and return immediately; a
+    background thread writes the files atomically. Changes made within
+    SAVE_COALESCE_SECONDS of each other are written together, with a single
+    index write. Each batch's outcome is posted to ``results`` as an
+    (ok, message) tuple for the UI to pick up. A batch that fails stays
+    queued, with its error in ``last_error``, until a later save or
+    flush() writes it.
+    """
+
+    def __init__(self, root=DATA_DIR):
+        self.root = Path(root)
+        self.dir = self.root / TEMPLATES_DIR
+        self.index_path = self.dir / INDEX_FILE
+        self.index = None
+        self.results = queue.Queue()
+        self.last_error = None  # Why the queued changes last failed to write
+        
+        self._lock = threading.Condition()
+        self._pending = {}    # name -> paths to write, or None to delete
+        self._queued_paths = 0  # paths in _pending, for put_stream's back-pressure
+        self._in_flight = {}  # the batch currently being written
+        self._garbage = []    # files replaced by differently named ones
+        self._dirty = False
+        self._writer = None
+        self._swept = False  # Leftover files from earlier sessions removed yet
+    
+    def _queue(self, name, change):
+        # Caller holds the lock
+        old = self._pending.get(name)
+        if old is not None:
+            self._queued_paths -= len(old[0])
+        self._pending[name] = change
+        if change is not None:
+            self._queued_paths += len(change[0])
+
+    def load_index(self):
+        """Read the index, migrating the legacy single-file library if needed."""
+        if self.index is not None:
+            return self.index
+        
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)["templates"]
+        else:
+            self.index = {}
+            self.migrate_legacy()
+        return self.index
+
+    def names(self):
+        return list(self.load_index())
+
+    def __contains__(self, name):
+        return name in self.load_index()
+
+    def info(self, name):
+        """Index entry for a template: its file, path count and hashes."""
+        return self.load_index()[name]
+
+    def load(self, name):
+        """Read one template's paths, including changes not yet on disk."""
+        with self._lock:
+            for batch in (self._pending, self._in_flight):
+                if name in batch:
+                    if batch[name] is None:
+                        raise KeyError(name)
+                    return batch[name][0]
+        
+        entry = self.load_index()[name]
+        with span("load_template", cat="storage", template=name, paths=entry.get("count")):
+            if entry["file"].endswith(PACKED_EXTENSION):
+                return PackedTemplate(PackedTree.open(self.dir / entry["file"]))
+            with open(self.dir / entry["file"], "r", encoding="utf-8") as f:
+                return json.load(f)["structure"]
+
+    def put(self, name, paths):
+        """Queue a write of (or overwrite of) a single template."""
+        index = self.load_index()
+        with span("hash_template", cat="storage", template=name):
+            entry = self._entry(name, paths)
+        with self._lock:
+            old = index.get(name)
+            if old and old.get("hash") == entry["hash"]:
+                return  # Unchanged; its current file (perhaps memory-mapped) stays as it is
+            if old and old["file"] != entry["file"]:
+                self._garbage.append(old["file"])
+            index[name] = entry
+            self._queue(name, (paths, entry["file"]))
+            self._schedule()
+
+    def delete(self, name):
+        """Queue removal of a single template, if it is stored."""
+        index = self.load_index()
+        with self._lock:
+            old = index.pop(name, None)
+            if old is None:
+                return
+            self._garbage.append(old["file"])
+            self._queue(name, None)
+            self._schedule()
+
+    def put_stream(self, items):
+        """put() many (name, paths) pairs; returns the stored names.
+        
+        Each template is hashed and queued for the writer thread as soon as
+        it is produced. Once SAVE_QUEUE_MAX_PATHS paths are waiting, this
+        waits for the writer to take them, so a large import never holds
+        every body in memory at once. Templates queued before an error in
+        ``items`` are still saved.
+        """
+        stored = []
+        for name, paths in items:
+            self.put(name, paths)
+            stored.append(name)
+            with self._lock:
+                self._lock.wait_for(lambda: self._queued_paths < SAVE_QUEUE_MAX_PATHS or self.last_error is not None)
+        return stored
+
+    def flush(self, timeout=None):
+        """Block until every queued change has been written, retrying failed ones once.
+        
+        Returns False if changes are still unwritten: the timeout ran out, or
+        writing failed again (see ``last_error``).
+        """
+        with self._lock:
+            if self._pending and not self._dirty:
+                self._schedule()  # Left over from a failed batch
+            done = self._lock.wait_for(lambda: not self._dirty and not self._in_flight, timeout)
+            return done and not self._pending
+
+    def migrate_legacy(self):
+        """One-time import of the old foldercrafter_templates.json file.
+        
+        The old file is renamed (not deleted) once its templates are stored.
+        """
+        legacy_path = self.root / SAVE_FILE
+        if not legacy_path.exists():
+            return
+        
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as ex:
+            print(f"Could not migrate {legacy_path}: {ex}", file=sys.stderr)
+            return
+        
+        for name, paths in saved.items():
+            paths = normalize_template_paths(paths, strict=False)
+            self.index[name] = self._entry(name, paths)
+            self._write_template(name, paths, self.index[name]["file"])
+        self._write_index(self.index)
+        legacy_path.replace(legacy_path.with_name(SAVE_FILE + ".migrated"))
+
+    def _schedule(self):
+        # Caller holds the lock
+        self._dirty = True
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._run_writer, name="TemplateStoreWriter", daemon=True)
+            self._writer.start()
+        self._lock.notify_all()
+
+    def _run_writer(self):
+        while True:
+            with self._lock:
+                self._lock.wait_for(lambda: self._dirty)
+            
+            time.sleep(SAVE_COALESCE_SECONDS)  # Let rapid successive saves pile up
+            
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                garbage, self._garbage = self._garbage, []
+                self._in_flight = batch
+                index = dict(self.index)
+                self._dirty = False
+                self._queued_paths = 0
+                self._lock.notify_all()  # put_stream() may be waiting for room
+            
+            try:
+                with span("save_templates", cat="storage", changes=len(batch)):
+                    for name, change in batch.items():
+                        if change is not None:
+                            self._write_template(name, *change)
+                    self._write_index(index)
+                
+                # Only drop old files once the index no longer points at them
+                live = {entry["file"] for entry in index.values()}
+                mapped = []
+                for file_name in garbage:
+                    if file_name not in live:
+                        try:
+                            (self.dir / file_name).unlink()
+                        except FileNotFoundError:
+                            pass
+                        except OSError:
+                            mapped.append(file_name)  # Still memory-mapped on Windows; retried next batch
+                if not self._swept:
+                    self._sweep(live)
+                with self._lock:
+                    self._garbage.extend(mapped)
+                    self.last_error = None
+                self.results.put((True, f"Saved {len(batch)} template change(s)"))
+            except OSError as ex:
+                with self._lock:
+                    # Keep the failed changes so the next save (or flush) retries them
+                    for name, change in batch.items():
+                        if name not in self._pending:
+                            self._queue(name, change)
+                    self._garbage = garbage + self._garbage
+                    self.last_error = str(ex)
+                self.results.put((False, str(ex)))
+            finally:
+                with self._lock:
+                    self._in_flight = {}
+                    self._lock.notify_all()
+
+    def _sweep(self, live):
+        """Remove template files no index entry points at (e.g. left mapped at exit)."""
+        with self._lock:
+            live = live | {entry["file"] for entry in self.index.values()} | set(self._garbage)
+        for path in self.dir.iterdir():
+            if path.suffix in (".json", PACKED_EXTENSION) and path.name != INDEX_FILE and path.name not in live:
+                with contextlib.suppress(OSError):
+                    path.unlink()
+        self._swept = True
+
+    def _entry(self, name, paths):
+        digest = template_hash(paths)
+        # Template names can contain anything, so files are named by digest.
+        # Packed files are memory-mapped while in use and can't be replaced
+        # then on Windows, so every packed write gets a file name of its own.
+        file_name = hashlib.sha1(name.encode("utf-8")).hexdigest()[:16]
+        if is_packable(paths):
+            file_name += f"-{digest[:8]}-{secrets.token_hex(4)}{PACKED_EXTENSION}"
+        else:
+            file_name += ".json"
+        return {"file": file_name, "count": len(paths), "hash": digest, "content_hash": content_hash(paths)}
+
+    def _write_template(self, name, paths, file_name):
+        path = self.dir / file_name
+        with span("write_template", cat="storage", template=name, file=file_name):
+            if file_name.endswith(PACKED_EXTENSION):
+                tree = paths.tree if isinstance(paths, PackedTemplate) else FolderTree(paths)
+                write_bytes_atomic(path, encode_packed_tree(name, tree))
+            else:
+                write_json_atomic(path, {"template_name": name, "structure": list(paths)})
+
+    def _write_index(self, index):
+        with span("write_index", cat="storage", templates=len(index)):
+            write_json_atomic(self.index_path, {"version": 1, "templates": index})
+
+
+class TemplateLibrary(MutableMapping):
+    """Name -> paths mapping over the default templates and a TemplateStore.
+    
+    Only the store's index is read up front, so startup doesn't depend on
+    how big the library is. A template's paths are read the first time they
+    are needed and kept in an LRU cache bounded by the total number of cached
+    paths. Assigning or deleting a name writes through to the store.
+    """
+
+    def __init__(self, store, defaults=DEFAULT_TEMPLATES, max_cached_paths=TEMPLATE_CACHE_MAX_PATHS):
+        self.store = store
+        self.defaults = defaults
+        self.max_cached_paths = max_cached_paths
+        self._cache = OrderedDict()
+        self._cached_paths = 0
+        self._hashes = {}  # content hashes not (yet) recorded in the store's index
+        
+        # Defaults first; saved templates override defaults with the same name
+        self._names = dict.fromkeys(defaults)
+        self._names.update(dict.fromkeys(store.names()))
+        
+        # Names are indexed now. Folder names need the bodies, so each body's
+        # are added when it is loaded, and the rest by a background pass that
+        # the first search starts (see find)
+        self.search = TemplateSearchIndex()
+        self.search.add_many(self._names)
+        self._indexer = None
+        self._indexer_lock = threading.Lock()
+
+    def __getitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+        
+        paths = self._cache.get(name)
+        if paths is not None:
+            self._cache.move_to_end(name)
+            return paths
+        
+        if name not in self.store:
+            return self.defaults[name]
+        
+        try:
+            paths = self.store.load(name)
+        except (OSError, ValueError, KeyError) as ex:
+            raise TemplateError(f"Could not read template '{name}': {ex}") from ex
+        self._remember(name, paths)
+        if not self.search.has_folders(name):
+            self.search.add_folders(name, folder_terms(paths), replace=False)
+        return paths
+
+    def __setitem__(self, name, paths):
+        self.store.put(name, paths)
+        self._names[name] = None
+        self._forget(name)
+        self._remember(name, paths)
+        self._hashes.pop(name, None)
+        self.search.add(name, folder_terms(paths))
+
+    def __delitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+        del self._names[name]
+        self._forget(name)
+        self._hashes.pop(name, None)
+        self.search.remove(name)
+        self.store.delete(name)
+
+    def import_stream(self, items):
+        """Store many (name, paths) pairs in one batch; returns the names added."""
+        seen = []
+        
+        def tracked():
+            for name, paths in items:
+                seen.append((name, folder_terms(paths)))  # Not the body itself
+                yield name, paths
+        
+        try:
+            return self.store.put_stream(tracked())
+        finally:
+            # Templates stored before an error are kept, so list them too
+            stored = [(name, folders) for name, folders in seen if name in self.store]
+            for name, _ in stored:
+                self._names[name] = None
+                self._forget(name)
+                self._hashes.pop(name, None)
+            self.search.add_many(name for name, _ in stored)
+            self.search.add_folders_many(stored)
+
+    def find(self, query, limit=None):
+        """search.search(), first starting the folder-name indexing pass if needed.
+        
+        Until that pass finishes, folder names only match in templates that
+        have already been loaded.
+        """
+        with self._indexer_lock:
+            if self._indexer is None:
+                self._indexer = threading.Thread(target=self.index_folders, name="TemplateSearchIndexer", daemon=True)
+                self._indexer.start()
+        return self.search.search(query, limit)
+
+    def index_folders(self):
+        """Add every template's folder names to the search index.
+        
+        Reads each body straight from the store (bypassing the cache), so it
+        can run on a background thread while the UI keeps working. Terms are
+        added in batches of about FOLDER_INDEX_BATCH, each sorted in once.
+        """
+        batch, terms = [], 0
+        for name in list(self._names):
+            if self.search.has_folders(name):
+                continue
+            try:
+                paths = self.store.load(name) if name in self.store else self.defaults[name]
+                folders = folder_terms(paths)
+            except (OSError, ValueError, KeyError, TemplateError):
+                continue  # Unreadable templates are reported when opened
+            batch.append((name, folders))
+            terms += len(folders)
+            if terms >= FOLDER_INDEX_BATCH:
+                self.search.add_folders_many(batch, replace=False)
+                batch, terms = [], 0
+        self.search.add_folders_many(batch, replace=False)
+
+    def content_hash(self, name):
+        """content_hash() of a template, read from the index when possible.
+        
+        Templates saved before hashes were indexed are hashed once and the
+        result kept in memory, so comparing two templates is O(1) after that.
+        """
+        if name not in self._names:
+            raise KeyError(name)
+        
+        if name in self.store:
+            digest = self.store.info(name).get("content_hash")
+            if digest:
+                return digest
+        
+        digest = self._hashes.get(name)
+        if digest is None:
+            digest = self._hashes[name] = content_hash(self[name])
+        return digest
+
+    def names_by_hash(self):
+        """Map each content hash to the first template name that has it."""
+        found = {}
+        for name in self._names:
+            found.setdefault(self.content_hash(name), name)
+        return found
+
+    def duplicate_groups(self):
+        """Lists of two or more template names with identical folders."""
+        groups = {}
+        for name in self._names:
+            groups.setdefault(self.content_hash(name), []).append(name)
+        return [names for names in groups.values() if len(names) > 1]
+
+    def __contains__(self, name):
+        # Mapping's default would load the body just to test membership
+        return name in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def _remember(self, name, paths):
+        self._cache[name] = paths
+        self._cached_paths += len(paths)
+        while self._cached_paths > self.max_cached_paths and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_paths -= len(evicted)
+
+    def _forget(self, name):
+        paths = self._cache.pop(name, None)
+        if paths is not None:
+            self._cached_paths -= len(paths)
+
+
+def load_templates(store=None):
+    """Open the template library: defaults plus saved user templates.
+    
+    Only names are read here; template bodies load on first use.
+    """
+    store = store or TemplateStore()
+    with span("load_templates", cat="storage") as s:
+        try:
+            store.load_index()
+        except (OSError, ValueError, KeyError) as ex:
+            print(f"Could not load saved templates: {ex}", file=sys.stderr)
+            store.index = {}
+        library = TemplateLibrary(store)
+        s.set(templates=len(library))
+    return library
+
+
+def read_template_file(path):
+    """Read an exported template (.json or .fct); returns (name, paths).
+    
+    Raises TemplateError for files that aren't FolderCrafter templates.
+    """
+    if str(path).lower().endswith(PACKED_EXTENSION):
+        tree = PackedTree.open(path)
+        return tree.template_name, list(tree.leaf_paths())
+    
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or "template_name" not in data or "structure" not in data:
+        raise TemplateError(
+            "This file is not a valid FolderCrafter template.\n\n"
+            "Expected format:\n"
+            '{"template_name": "...", "structure": [...]}'
+        )
+    if not isinstance(data["structure"], list):
+        raise TemplateError("The 'structure' field must be a list of folder paths.")
+    return data["template_name"], data["structure"]
+
+
+class ImportNameAllocator:
+    """Picks free names for imported templates: "X (Imported)", "X (Imported 2)"...
+    
+    Remembers the next suffix per base name, so importing many copies of
+    the same template doesn't re-probe every suffix already handed out.
+    """
+
+    def __init__(self, existing):
+        self.existing = existing
+        self.used = set()
+        self._next_suffix = {}
+
+    def _taken(self, name):
+        return name in self.used or name in self.existing
+
+    def allocate(self, name):
+        if not self._taken(name):
+            self.used.add(name)
+            return name
+        
+        counter = self._next_suffix.get(name, 1)
+        while True:
+            candidate = f"{name} (Imported)" if counter == 1 else f"{name} (Imported {counter})"
+            counter += 1
+            if not self._taken(candidate):
+                break
+        self._next_suffix[name] = counter
+        self.used.add(candidate)
+        return candidate
+
+
+def read_library(path):
+    """Yield (name, structure) for each template in a library bundle.
+    
+    Bundles are read one line at a time, so only a single template is ever
+    parsed into memory. Raises TemplateError if the file isn't a bundle.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline() or "null")
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != LIBRARY_FORMAT:
+            raise TemplateError(f"'{path}' is not a FolderCrafter library bundle")
+        
+        for line_number, line in enumerate(f, 2):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                yield data["template_name"], data["structure"]
+            except (ValueError, KeyError, TypeError) as ex:
+                raise TemplateError(f"Line {line_number} of the bundle is not a valid template ({ex})") from ex
+
+
+def write_library(path, templates):
+    """Stream (name, paths) pairs into a library bundle; returns how many were written."""
+    count = 0
+    with atomic_write(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(json.dumps({"format": LIBRARY_FORMAT, "version": 1}) + "\n")
+        for name, paths in templates:
+            f.write(json.dumps({"template_name": name, "structure": list(paths)}, ensure_ascii=False) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,205 @@
+"""Two-way sync of a template library through a shared folder."""
+
+import contextlib
+import datetime
+import json
+import os
+import platform
+import time
+from pathlib import Path
+
+from .config import DATA_DIR, SYNC_LOCK_STALE_SECONDS, SYNC_LOCK_TIMEOUT_SECONDS, SYNC_STATE_FILE
+from .safety import normalize_template_paths
+from .storage import write_json_atomic
+from .syntax import TemplateError
+from .validate import content_hash
+
+
+# A shared folder holds each template body once, named by its content hash
+# (objects/<hash>.json), plus manifest.json mapping template names to the
+# hash of their current version. Syncing only reads or writes the objects
+# whose hashes differ, and compares both sides against the hashes agreed at
+# the last sync so edits made on two machines are reported as conflicts.
+class SharedLibrary:
+    """A template library shared through a plain folder (local or network)."""
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self.objects_dir = self.folder / "objects"
+        self.manifest_path = self.folder / "manifest.json"
+        self.lock_path = self.folder / "manifest.lock"
+
+    def read_manifest(self):
+        """name -> {"hash", "updated_by", "time"}; a None hash marks a deletion."""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)["templates"]
+        except FileNotFoundError:
+            return {}
+        except (ValueError, KeyError, TypeError) as ex:
+            raise TemplateError(f"The shared manifest is damaged: {ex}") from ex
+
+    def write_manifest(self, manifest):
+        write_json_atomic(self.manifest_path, {"version": 1, "templates": manifest})
+
+    def read_object(self, digest):
+        """A shared template body, checked against the hash it is filed under."""
+        with open(self.objects_dir / f"{digest}.json", "r", encoding="utf-8") as f:
+            structure = json.load(f)["structure"]
+        if content_hash(structure) != digest:
+            raise TemplateError("its shared copy is damaged")
+        return structure
+
+    def write_object(self, digest, paths):
+        path = self.objects_dir / f"{digest}.json"
+        if not path.exists():  # Objects never change once written
+            write_json_atomic(path, {"structure": list(paths)})
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Hold the folder's lock file so only one machine updates the manifest at a time."""
+        deadline = time.monotonic() + SYNC_LOCK_TIMEOUT_SECONDS
+        self.folder.mkdir(parents=True, exist_ok=True)
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    age = time.time() - os.path.getmtime(self.lock_path)
+                except OSError:
+                    continue  # Released while we looked
+                if age > SYNC_LOCK_STALE_SECONDS:
+                    # Left behind by a machine that crashed mid-sync
+                    with contextlib.suppress(OSError):
+                        os.unlink(self.lock_path)
+                    continue
+                if time.monotonic() > deadline:
+                    raise TemplateError("The shared folder is busy with another sync. Please try again.")
+                time.sleep(0.2)
+        
+        try:
+            os.write(fd, f"{platform.node()} {os.getpid()}".encode("utf-8"))
+            os.close(fd)
+            yield
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(self.lock_path)
+
+
+class SyncResult:
+    """What a sync changed, and what it couldn't decide on its own."""
+
+    def __init__(self):
+        self.pulled = []
+        self.pushed = []
+        self.conflicts = {}  # name -> manifest entry of the shared version
+        self.skipped = []    # (name, reason)
+
+    def summary(self):
+        lines = [f"Pulled {len(self.pulled)}, pushed {len(self.pushed)} template change(s)."]
+        if self.conflicts:
+            lines.append(f"{len(self.conflicts)} changed both here and in the shared folder.")
+        for name, reason in self.skipped[:10]:
+            lines.append(f"• Skipped '{name}': {reason}")
+        return "\n".join(lines)
+
+
+def load_sync_state(root=DATA_DIR):
+    """{"folder": shared folder or None, "base": name -> hash at the last sync}."""
+    try:
+        with open(Path(root) / SYNC_STATE_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return {"folder": state.get("folder"), "base": dict(state.get("base", {}))}
+    except (OSError, ValueError, AttributeError):
+        return {"folder": None, "base": {}}
+
+
+def save_sync_state(state, root=DATA_DIR):
+    write_json_atomic(Path(root) / SYNC_STATE_FILE, state)
+
+
+def sync_library(library, shared, base, resolutions=None):
+    """Two-way sync of the saved templates in ``library`` with ``shared``.
+    
+    ``base`` (name -> hash both sides agreed on last time) is updated in
+    place, and only for changes that reached both sides: if writing the
+    shared manifest fails, it is left as it was. A template changed on only one side is copied to the other; one
+    changed on both is left alone and reported in ``conflicts`` unless
+    ``resolutions`` maps its name to ("mine" or "theirs", shared hash) for
+    that exact shared version. Built-in templates are only synced once edited.
+    """
+    resolutions = resolutions or {}
+    result = SyncResult()
+    pulls = {}  # name -> shared hash, None to delete locally
+    agreed_now = dict(base)  # Becomes the base once the manifest is written
+    
+    with shared.lock():
+        manifest = shared.read_manifest()
+        local = {name: library.content_hash(name) for name in library if name in library.store}
+        manifest_changed = False
+        
+        for name in sorted(set(local) | set(manifest) | set(base)):
+            mine = local.get(name)
+            entry = manifest.get(name)
+            theirs = entry["hash"] if entry else None
+            agreed = base.get(name)
+            
+            if mine == theirs:
+                action = None
+            elif mine == agreed:
+                action = "theirs"
+            elif theirs == agreed:
+                action = "mine"
+            else:
+                choice = resolutions.get(name)
+                if not choice or choice[1] != theirs:
+                    result.conflicts[name] = entry
+                    continue
+                action = choice[0]
+            
+            if action == "mine":
+                if mine is not None:
+                    shared.write_object(mine, library[name])
+                manifest[name] = {
+                    "hash": mine,
+                    "updated_by": platform.node(),
+                    "time": datetime.datetime.now().isoformat(timespec="seconds"),
+                }
+                manifest_changed = True
+                result.pushed.append(name)
+                agreed = mine
+            elif action == "theirs":
+                pulls[name] = theirs
+                continue  # Base is updated once the pull succeeds
+            else:
+                agreed = mine
+            
+            if agreed is None:
+                agreed_now.pop(name, None)
+            else:
+                agreed_now[name] = agreed
+        
+        if manifest_changed:
+            shared.write_manifest(manifest)
+        base.clear()
+        base.update(agreed_now)
+    
+    # Objects are immutable, so pulling needs no lock
+    incoming = []
+    for name, digest in pulls.items():
+        if digest is None:
+            if name in library:
+                del library[name]
+            base.pop(name, None)
+            result.pulled.append(name)
+            continue
+        try:
+            incoming.append((name, normalize_template_paths(shared.read_object(digest))))
+        except (OSError, ValueError, KeyError, TemplateError) as ex:
+            result.skipped.append((name, str(ex)))
+    
+    for name in library.import_stream(incoming):
+        base[name] = pulls[name]
+        result.pulled.append(name)
+    return result
@@ -0,0 +1,50 @@
+"""Template text syntax: indented lines, full paths and @include lines."""
+
+# A line "@include Other Template" pulls in another template's folders,
+# mounted under whatever folder the line is indented beneath.
+INCLUDE_MARKER = "@include "
+
+
+class TemplateError(Exception):
+    """Raised when a template cannot be resolved into folder paths."""
+
+
+def split_include(path):
+    """Returns (mount, template_name) for an include path, or None."""
+    head, marker, name = path.partition(INCLUDE_MARKER)
+    if not marker or (head and not head.endswith('/')):
+        return None
+    return head.rstrip('/'), name.strip()
+
+
+def split_parent(path):
+    """Splits a path into (parent, name), keeping include lines whole."""
+    if INCLUDE_MARKER in path:
+        include = split_include(path)
+        if include:
+            return include[0], INCLUDE_MARKER + include[1]
+    parent, _, name = path.rpartition('/')
+    return parent, name
+
+
+def parse_indented_lines(text):
+    """Converts indented text to full paths."""
+    paths = []
+    stack = []
+    
+    lines = text.splitlines()
+    for line in lines:
+        if not line.strip():
+            continue
+        
+        indent = len(line) - len(line.lstrip())
+        name = line.strip()
+        
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        
+        stack.append((indent, name))
+        full_path = "/".join([x[1] for x in stack])
+        paths.append(full_path)
+    
+    return paths
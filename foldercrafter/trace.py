@@ -0,0 +1,224 @@
+"""Optional phase-level tracing, written as Chrome trace-event JSON.
+
+Crafting, scanning, loading, saving and preview code wraps each phase in
+span(). While tracing is off (the default) span() hands back a shared no-op
+object, so the instrumentation costs one function call. Turn it on with the
+FOLDERCRAFTER_TRACE environment variable or a --trace FILE option; events
+are kept in memory and written when the process exits (or on write()).
+
+The output opens in chrome://tracing or https://ui.perfetto.dev, where each
+thread gets its own track:
+
+    with span("mkdir", cat="craft", folders=len(batch)) as s:
+        ...
+        s.set(created=n)
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+from .config import DATA_DIR, TRACE_ENV, TRACE_MAX_EVENTS, TRACES_DIR
+
+
+class Span:
+    """A timed phase, recorded as a complete ("X") event when it exits."""
+    
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+    
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = None
+    
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer.record(self.name, self.cat, self.start, end, self.args)
+        return False
+    
+    def set(self, **args):
+        """Attach (or update) arguments shown with the event."""
+        self.args.update(args)
+
+
+class _NullSpan:
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+    
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects trace events from every thread and writes them to ``path``."""
+    
+    def __init__(self, path):
+        self.path = str(path)
+        self.events = []
+        self.dropped = 0
+        self.pid = os.getpid()
+        self.origin = time.perf_counter_ns()
+        self.threads = {}  # native id -> thread name
+        self._lock = threading.Lock()
+    
+    def record(self, name, cat, start_ns, end_ns, args=None):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start_ns - self.origin) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+        }
+        self._append(event, args)
+    
+    def instant(self, name, cat, args=None):
+        event = {"name": name, "cat": cat, "ph": "i", "s": "t", "ts": (time.perf_counter_ns() - self.origin) / 1000}
+        self._append(event, args)
+    
+    def _append(self, event, args):
+        tid = threading.get_native_id()
+        event["pid"] = self.pid
+        event["tid"] = tid
+        if args:
+            event["args"] = args
+        with self._lock:
+            if tid not in self.threads:
+                self.threads[tid] = threading.current_thread().name
+            if len(self.events) >= TRACE_MAX_EVENTS:
+                self.dropped += 1
+                return
+            self.events.append(event)
+    
+    def write(self):
+        """Write every event so far to the trace file; returns its path."""
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self.threads)
+            dropped = self.dropped
+        
+        metadata = [{"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": "FolderCrafter"}}]
+        for tid, name in threads.items():
+            metadata.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}})
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = f"{self.path}.{self.pid}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "traceEvents": metadata + events,
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": dropped},
+            }, f)
+        os.replace(temp_path, self.path)
+        return self.path
+
+
+_tracer = None
+_atexit_registered = False
+
+
+def default_trace_path():
+    """A fresh file under DATA_DIR/traces, named by time and process."""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return DATA_DIR / TRACES_DIR / f"trace-{stamp}-{os.getpid()}.json"
+
+
+def enable(path=None):
+    """Start tracing to ``path`` (default_trace_path() if None); returns the Tracer.
+    
+    If tracing is already on, only the output path changes.
+    """
+    global _tracer, _atexit_registered
+    path = path or default_trace_path()
+    if _tracer is None:
+        _tracer = Tracer(path)
+    else:
+        _tracer.path = str(path)
+    if not _atexit_registered:
+        atexit.register(_write_at_exit)
+        _atexit_registered = True
+    return _tracer
+
+
+def disable():
+    """Stop tracing and write what was collected; returns the file path, or None."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer.write() if tracer else None
+
+
+def is_enabled():
+    return _tracer is not None
+
+
+def span(name, /, cat="foldercrafter", **args):
+    """Context manager timing one phase; a shared no-op when tracing is off."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return Span(tracer, name, cat, args)
+
+
+def instant(name, /, cat="foldercrafter", **args):
+    """Mark a single moment (a click, a cache miss) on the current thread's track."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.instant(name, cat, args)
+
+
+def write():
+    """Write the trace collected so far without stopping; returns the path, or None."""
+    tracer = _tracer
+    return tracer.write() if tracer else None
+
+
+def enable_from_env():
+    """Turn tracing on if FOLDERCRAFTER_TRACE is set: a file path, or "1" for the default."""
+    value = os.environ.get(TRACE_ENV, "").strip()
+    if value and value.lower() not in ("0", "false", "no", "off"):
+        enable(None if value.lower() in ("1", "true", "yes", "on") else value)
+
+
+def enable_from_argv(argv):
+    """Handle a ``--trace [FILE]`` option, removing it from ``argv`` in place.
+    
+    Returns the Tracer, or None when the option is absent.
+    """
+    if "--trace" not in argv:
+        return None
+    i = argv.index("--trace")
+    path = argv[i + 1] if i + 1 < len(argv) and not argv[i + 1].startswith("--") else None
+    del argv[i:i + (2 if path else 1)]
+    return enable(path)
+
+
+def _write_at_exit():
+    if _tracer is None:
+        return
+    try:
+        path = _tracer.write()
+    except OSError as ex:
+        print(f"Could not write trace: {ex}", file=sys.stderr)
+    else:
+        print(f"Trace written to {path}", file=sys.stderr)
+
+
+enable_from_env()
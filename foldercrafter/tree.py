@@ -0,0 +1,117 @@
+"""Flattened folder trees for previews, and tree/indented text rendering."""
+
+from .syntax import split_parent
+
+
+def format_tree_line(depth, name):
+    """Formats a single folder row for the tree preview."""
+    if depth == 0:
+        return f"📁  {name}"
+    return "    " * depth + f"└── {name}"
+
+
+class FolderTree:
+    """Sorted, flattened folder tree built from a template's full paths.
+
+    Every folder (including implied parents) appears once, parents before
+    children. Names, depths and parent indices are kept in parallel lists so
+    rows can be formatted on demand instead of building one huge string.
+    """
+
+    def __init__(self, paths):
+        all_paths = set()
+        for p in paths:
+            # Walk up until we hit a prefix we've already seen
+            while p and p not in all_paths:
+                all_paths.add(p)
+                p = split_parent(p)[0]
+
+        self.names = []
+        self.depths = []
+        self.parents = []
+        index = {}
+        # Sorting on '\0' instead of '/' keeps every subtree contiguous (pre-order),
+        # so "src/x" lands under "src" rather than after a sibling like "src-old"
+        for i, p in enumerate(sorted(all_paths, key=lambda p: p.replace('/', '\0'))):
+            parent, name = split_parent(p)
+            parent_index = index.get(parent, -1)
+            index[p] = i
+            self.names.append(name)
+            self.parents.append(parent_index)
+            self.depths.append(self.depths[parent_index] + 1 if parent_index >= 0 else 0)
+
+        self._children = None
+        self._descendants = None
+
+    @property
+    def roots(self):
+        """Indices of the top-level folders."""
+        return self.children_of(-1)
+
+    def children_of(self, i):
+        """Indices of the direct children of node ``i`` (-1 for the roots)."""
+        if self._children is None:
+            # One bucket per node plus a trailing one for the roots (index -1)
+            self._children = [[] for _ in range(len(self.names) + 1)]
+            for child, parent in enumerate(self.parents):
+                self._children[parent].append(child)
+        return self._children[i]
+
+    def descendant_count(self, i):
+        """Total number of folders below node ``i``, computed once for all nodes."""
+        if self._descendants is None:
+            counts = [0] * len(self.names)
+            # Children always come after their parent, so one reverse pass suffices
+            for child in range(len(self.names) - 1, -1, -1):
+                parent = self.parents[child]
+                if parent >= 0:
+                    counts[parent] += counts[child] + 1
+            self._descendants = counts
+        return self._descendants[i]
+
+    def leaf_paths(self):
+        """Full path of every folder without subfolders, in tree order.
+        
+        Together these recreate the whole tree, so they are what gets
+        written back out as a template's path list.
+        """
+        stack = []
+        depths, names = self.depths, self.names
+        count = len(depths)
+        for i in range(count):
+            depth = depths[i]
+            del stack[depth:]
+            stack.append(names[i])
+            if i + 1 == count or depths[i + 1] <= depth:
+                yield "/".join(stack)
+
+    def label(self, i):
+        """Text for node ``i`` in the collapsible tree view."""
+        return f"📁  {self.names[i]}"
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        return format_tree_line(self.depths[i], self.names[i])
+
+    def __iter__(self):
+        for depth, name in zip(self.depths, self.names):
+            yield format_tree_line(depth, name)
+
+
+def format_paths_to_tree(paths):
+    """Converts full paths to tree-like text display."""
+    if not paths:
+        return "  No folders to preview"
+    
+    return "\n".join(FolderTree(paths))
+
+
+def format_paths_to_indented(paths):
+    """Converts full paths to indented text for editing."""
+    if not paths:
+        return ""
+    
+    tree = getattr(paths, "tree", None) or FolderTree(paths)  # PackedTemplate carries its own
+    return "\n".join("    " * depth + name for depth, name in zip(tree.depths, tree.names))
@@ -0,0 +1,129 @@
+"""Checks that every folder a template would create can exist on Windows."""
+
+import hashlib
+import os
+import threading
+
+from .config import MAX_PATH_LENGTH
+from .patterns import iter_expanded_paths
+from .syntax import split_parent
+
+
+WINDOWS_RESERVED_NAMES = (
+    {"CON", "PRN", "AUX", "NUL"}
+    | {f"COM{i}" for i in range(1, 10)}
+    | {f"LPT{i}" for i in range(1, 10)}
+)
+ILLEGAL_NAME_CHARS = set('<>:"\\|?*') | {chr(i) for i in range(32)}
+VALIDATION_CACHE_SIZE = 32
+
+_validation_cache = {}
+_validation_cache_lock = threading.Lock()  # Crafts may validate from several threads at once
+
+
+def template_hash(paths):
+    """Stable digest of a path list, used to key caches."""
+    digest = hashlib.sha1()
+    for p in paths:
+        digest.update(p.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def content_hash(paths):
+    """Order-independent digest of the folders a template defines.
+    
+    Every folder is counted once whether it's listed on its own line or
+    only implied by a deeper path, so two templates have the same hash
+    exactly when they would create the same folders.
+    """
+    nodes = set()
+    for p in paths:
+        while p and p not in nodes:
+            nodes.add(p)
+            p = split_parent(p)[0]
+    
+    digest = hashlib.sha256()
+    for p in sorted(nodes):
+        digest.update(p.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def check_folder_name(name):
+    """Returns why a single folder name can't be created on Windows, or None."""
+    if not name:
+        return None  # Empty segments ("a//b") are collapsed when creating
+    
+    if name[-1] in ". ":
+        return "Name ends with a dot or space"
+    
+    bad = sorted({c for c in name if c in ILLEGAL_NAME_CHARS})
+    if bad:
+        shown = " ".join(c if c.isprintable() else repr(c) for c in bad)
+        return f"Name contains characters that aren't allowed: {shown}"
+    
+    if name.split('.')[0].rstrip().upper() in WINDOWS_RESERVED_NAMES:
+        return "Name is reserved by Windows"
+    
+    return None
+
+
+def validate_paths(paths, target=None):
+    """Checks every folder a template would create, in a single pass.
+    
+    Flags names Windows can't create, siblings that differ only by letter
+    case, and (when ``target`` is given) full paths longer than
+    MAX_PATH_LENGTH. Returns a list of (path, problem) tuples.
+    """
+    issues = []
+    seen = set()
+    folded = {}  # lowercased path -> first spelling seen
+    base_length = len(os.path.abspath(target)) + 1 if target else 0
+    
+    for p in iter_expanded_paths(paths):
+        # Each folder is checked once, the first time any path reaches it
+        while p and p not in seen:
+            seen.add(p)
+            parent, _, name = p.rpartition('/')
+            
+            first = folded.setdefault(p.lower(), p)
+            if first != p:
+                issues.append((p, f"Clashes with '{first}' (names differ only by case)"))
+            
+            problem = check_folder_name(name)
+            if problem:
+                issues.append((p, problem))
+            
+            if base_length and base_length + len(p) > MAX_PATH_LENGTH:
+                issues.append((p, f"Full path is {base_length + len(p)} characters (limit {MAX_PATH_LENGTH})"))
+            
+            p = parent
+    
+    return issues
+
+
+def validate_template(paths, target=None, digest=None):
+    """validate_paths() with results cached per (content hash, target root).
+    
+    Pass ``digest`` when the paths' content_hash() is already known.
+    """
+    key = (digest or content_hash(paths), os.path.normcase(os.path.abspath(target)) if target else None)
+    with _validation_cache_lock:
+        issues = _validation_cache.get(key)
+    if issues is None:
+        issues = validate_paths(paths, target)  # Outside the lock; an occasional duplicate run is harmless
+        with _validation_cache_lock:
+            _validation_cache.pop(key, None)
+            while len(_validation_cache) >= VALIDATION_CACHE_SIZE:
+                _validation_cache.pop(next(iter(_validation_cache)))
+            _validation_cache[key] = issues
+    return issues
+
+
+def format_issues(issues, limit=15):
+    """Bullet list of validation issues, truncated for dialogs."""
+    lines = [f"• {path}: {problem}" for path, problem in issues[:limit]]
+    if len(issues) > limit:
+        lines.append(f"... and {len(issues) - limit:,} more")
+    return "\n".join(lines)
@@ -4,22 +4,254 @@ Built with CustomTkinter
 Theme: Modern SaaS (Indigo/Gray)
 """
 
-import customtkinter as ctk
+import time
+STARTUP_STARTED = time.perf_counter()  # Taken before the heavy imports, for the startup report
+
 import os
 import json
 import sys
+import contextlib
+import datetime
+import secrets
+import socket
+import queue
+import threading
+import functools
+from collections import OrderedDict, deque
 from pathlib import Path
-from tkinter import filedialog, messagebox
+
+
+# ============================================================================
+# SINGLE INSTANCE
+# ============================================================================
+# Explorer starts one process per selected folder. Whichever takes the
+# per-user lock file first becomes the app: it listens on a free localhost
+# port and publishes the port and a token in the instance file. The others
+# hand over their arguments through it and exit before the GUI toolkit is
+# even imported.
+INSTANCE_FILE = Path.home() / ".foldercrafter" / "instance.json"
+INSTANCE_LOCK_FILE = Path.home() / ".foldercrafter" / "instance.lock"
+INSTANCE_CONNECT_TIMEOUT = 5
+INSTANCE_BATCH_SECONDS = 0.3  # Launches this close together are handled as one request
+INSTANCE_POLL_MS = 100
+
+
+def lock_file(f):
+    """Try to lock an open file exclusively; the OS releases it when the process exits."""
+    try:
+        f.seek(0)
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def read_instance_file():
+    """The running instance's {"port", "token", "pid"}, or None if there is no readable file."""
+    try:
+        with open(INSTANCE_FILE, "r", encoding="utf-8") as f:
+            info = json.load(f)
+        return {"port": int(info["port"]), "token": str(info["token"]), "pid": info.get("pid")}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def claim_instance():
+    """Returns (lock file, listening socket, token) if this is the first instance, else None."""
+    try:
+        INSTANCE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        lock = open(INSTANCE_LOCK_FILE, "a+b")
+    except OSError:
+        return None
+    if not lock_file(lock):
+        lock.close()
+        return None
+    
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.bind(("127.0.0.1", 0))  # Any free port; nothing else can be squatting on it
+        sock.listen(32)
+        token = secrets.token_hex(16)
+        # Published only once listening, so a port read from the file always answers
+        tmp_path = INSTANCE_FILE.with_name(INSTANCE_FILE.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"port": sock.getsockname()[1], "token": token, "pid": os.getpid()}, f)
+        os.replace(tmp_path, INSTANCE_FILE)
+    except OSError:
+        sock.close()
+        lock.close()
+        return None
+    return lock, sock, token
+
+
+def forward_to_instance(args):
+    """Hand ``args`` to the running instance. True once it has acknowledged them.
+    
+    Only called while another process holds the lock. Its instance file
+    appears moments after it takes the lock; until then, or while the file
+    is one left behind by an instance that has exited (connection refused),
+    wait for a new file rather than retrying the same port.
+    """
+    deadline = time.monotonic() + INSTANCE_CONNECT_TIMEOUT
+    tried = None
+    while True:
+        info = read_instance_file()
+        if info is not None and info != tried:
+            tried = info
+            try:
+                conn = socket.create_connection(("127.0.0.1", info["port"]), timeout=INSTANCE_CONNECT_TIMEOUT)
+                break
+            except ConnectionRefusedError:
+                pass
+            except OSError:
+                return False
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    
+    try:
+        with conn:
+            conn.sendall(json.dumps({"token": tried["token"], "args": args}).encode("utf-8") + b"\n")
+            return conn.makefile("rb").readline().strip() == b"ok"
+    except OSError:
+        return False
+
+
+def claim_or_forward(argv):
+    """Become the single instance, or pass ``argv`` to the running one and exit.
+    
+    Returns the InstanceServer, with this launch's own arguments as the
+    start of its first batch, or None to run standalone (command line
+    actions, or when no instance could be claimed or reached).
+    """
+    if argv[1:2] == ["--validate"] or "--startup-report" in argv or "--trace" in argv:
+        return None
+    
+    claimed = claim_instance()
+    if claimed is None:
+        # The running app has a different working directory
+        args = [a if a.startswith("--") else os.path.abspath(a.strip('"')) for a in argv[1:]]
+        if forward_to_instance(args):
+            sys.exit(0)
+        return None
+    
+    # Serve right away, so launches that arrive while the window is still
+    # loading are acknowledged and land in the same batch as this one
+    server = InstanceServer(*claimed)
+    if argv[1:]:
+        server.submit(argv[1:])
+    return server
+
+
+class InstanceServer:
+    """Receives arguments from later launches, batching those that arrive together."""
+
+    def __init__(self, lock, sock, token):
+        self.lock = lock
+        self.sock = sock
+        self.token = token
+        self._lock = threading.Lock()
+        self._batch = []
+        self._last_arrival = 0
+        threading.Thread(target=self._serve, name="InstanceServer", daemon=True).start()
+
+    def submit(self, args):
+        """Add one launch's arguments to the batch being collected.
+        
+        A launch without arguments (Start menu, a shortcut) is kept too, as
+        an empty list: it only asks for the window to be raised.
+        """
+        with self._lock:
+            self._batch.append(list(args))
+            self._last_arrival = time.monotonic()
+
+    def take_batch(self):
+        """Argument lists received, once none has arrived for INSTANCE_BATCH_SECONDS."""
+        with self._lock:
+            if not self._batch or time.monotonic() - self._last_arrival < INSTANCE_BATCH_SECONDS:
+                return []
+            batch, self._batch = self._batch, []
+            return batch
+
+    def close(self):
+        self.sock.close()
+        info = read_instance_file()
+        if info and info["token"] == self.token:
+            with contextlib.suppress(OSError):
+                INSTANCE_FILE.unlink()
+        self.lock.close()  # Releases the lock; the next launch becomes the instance
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return  # Closed
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            conn.settimeout(INSTANCE_CONNECT_TIMEOUT)
+            try:
+                request = json.loads(conn.makefile("rb").readline())
+                if not secrets.compare_digest(str(request["token"]), self.token):
+                    return
+                args = [str(a) for a in request["args"]]
+            except (OSError, ValueError, KeyError, TypeError):
+                return
+            
+            self.submit(args)
+            with contextlib.suppress(OSError):
+                conn.sendall(b"ok\n")
+
+
+INSTANCE = claim_or_forward(sys.argv) if __name__ == "__main__" else None
+
+import customtkinter as ctk
+from tkinter import messagebox
 import tkinter as tk
-import webbrowser
-import ctypes
+from tkinter import ttk
+# filedialog, webbrowser and ctypes are imported where they are used, to keep startup fast
+
+# Everything that isn't GUI lives in the foldercrafter package
+from foldercrafter.compose import TemplateResolver
+from foldercrafter.config import DATA_DIR, LIBRARY_EXTENSION, MAX_EXPANDED_FOLDERS
+from foldercrafter.craft import create_folders, scan_folders
+from foldercrafter.diff import diff_templates, merge_templates
+from foldercrafter.packed import PACKED_EXTENSION, encode_packed_tree
+from foldercrafter.patterns import ExpandedTree, build_folder_tree, count_expanded_paths
+from foldercrafter.safety import normalize_template_paths
+from foldercrafter.storage import (
+    ImportNameAllocator, load_templates, read_library, read_template_file, write_json_atomic, write_library,
+)
+from foldercrafter.cli import run_cli
+from foldercrafter.sync import SharedLibrary, load_sync_state, save_sync_state, sync_library
+from foldercrafter.syntax import TemplateError, parse_indented_lines
+from foldercrafter.trace import enable_from_argv, instant, span
+from foldercrafter.tree import FolderTree, format_paths_to_indented
+from foldercrafter.validate import content_hash, format_issues, validate_template
 
-# Fix Taskbar Icon Grouping (Windows)
-myappid = 'craftedanomaly.foldercrafter.app.1.0' # arbitrary string
-try:
-    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
-except Exception:
-    pass
+
+def set_windows_app_id():
+    """Fix Taskbar Icon Grouping (Windows)."""
+    if sys.platform != "win32":
+        return
+    import ctypes
+    myappid = 'craftedanomaly.foldercrafter.app.1.0' # arbitrary string
+    try:
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
+    except Exception:
+        pass
+
+
+def open_url(url):
+    import webbrowser
+    webbrowser.open(url)
 
 
 class CTkToolTip:
@@ -76,183 +308,617 @@ COLOR_TEXT = "#ffffff"         # Primary text
 COLOR_TEXT_MUTED = "#a1a1aa"   # Muted/subtitle text
 COLOR_TEXT_DIM = "#71717a"     # Very dim text
 
-SAVE_FILE = "foldercrafter_templates.json"
+# Background template writes are checked for errors this often
+STORE_POLL_MS = 250
+
+# Templates longer than this are streamed into the editor across event-loop ticks
+EDITOR_LOAD_CHUNK_LINES = 2000
+
+# Built preview trees kept per content hash, so flipping between templates is instant
+PREVIEW_CACHE_SIZE = 8
+
+# The generator's template dropdown lists at most this many search matches at once
+SEARCH_RESULT_LIMIT = 200
+
+# Startup phases are reported against this budget when FOLDERCRAFTER_STARTUP_REPORT
+# is set or --startup-report is passed
+STARTUP_BUDGET_MS = 800
+
+# Separates several destination folders in the target field (| can't appear in Windows paths)
+TARGET_SEPARATOR = " | "
+
+# Responsiveness: a heartbeat timer this often measures how long the event loop
+# was blocked; later than the threshold counts as a stall. Each handler keeps
+# its last RESPONSIVENESS_WINDOW timings, and the last STALL_LOG_SIZE stalls
+HEARTBEAT_MS = 50
+STALL_THRESHOLD_MS = 100
+RESPONSIVENESS_WINDOW = 500
+STALL_LOG_SIZE = 50
+DIAGNOSTICS_REFRESH_MS = 1000
 
 # ============================================================================
-# DEFAULT TEMPLATES
+# PREVIEW WIDGETS
 # ============================================================================
-DEFAULT_TEMPLATES = {
-    "Film / Video": [
-        "01 Project/01 Premiere",
-        "01 Project/02 After Effects",
-        "02 Assets/01 Footage",
-        "02 Assets/02 Stock",
-        "02 Assets/03 Audio/01 Location Sound",
-        "02 Assets/03 Audio/02 ADR",
-        "02 Assets/03 Audio/03 SFX",
-        "02 Assets/03 Audio/04 Music",
-        "02 Assets/04 Graphics/01 Logos",
-        "02 Assets/04 Graphics/02 Credits",
-        "02 Assets/04 Graphics/03 Photos",
-        "02 Assets/04 Graphics/04 Graphic Elements",
-        "03 Docs",
-        "04 Exports",
-        "05 Stuff",
-    ],
-    "AI Video Production": [
-        "01 Project/01 Premiere",
-        "01 Project/02 After Effects",
-        "01 Project/03 Photoshop",
-        "02 REFS/01 Locations",
-        "02 REFS/02 Characters",
-        "02 REFS/03 Moodboard",
-        "03 Assets/01 Working Frames",
-        "03 Assets/02 Frames",
-        "03 Assets/03 Videos",
-        "03 Assets/04 Audio/01 Recording",
-        "03 Assets/04 Audio/02 SFX",
-        "03 Assets/04 Audio/03 Ambience",
-        "03 Assets/04 Audio/04 Music",
-        "03 Assets/05 Graphics/01 Logos",
-        "03 Assets/05 Graphics/02 Graphic Elements",
-        "04 Exports",
-        "05 Stuff",
-    ],
-    "Web Project": [
-        "src",
-        "src/assets/images",
-        "src/assets/fonts",
-        "src/components",
-        "src/styles",
-        "public",
-    ],
-    "Data Science": [
-        "data/raw",
-        "data/processed",
-        "notebooks",
-        "src/models",
-        "src/visualization",
-    ],
-    "Photo Archive": [
-        "Photos",
-        "Edited",
-        "Exports",
-    ],
-    "Game Dev": [
-        "Assets/Sprites",
-        "Assets/Audio",
-        "Scripts",
-        "Scenes",
-    ],
-}
-
-
-def load_templates():
-    """Load templates, merging defaults with any saved user templates."""
-    save_path = Path.home() / ".foldercrafter" / SAVE_FILE
-    
-    # Start with default templates
-    templates = DEFAULT_TEMPLATES.copy()
-    
-    # Merge with saved templates (user templates override defaults with same name)
-    if save_path.exists():
-        try:
-            with open(save_path, "r", encoding="utf-8") as f:
-                saved = json.load(f)
-                templates.update(saved)
-        except Exception:
-            pass
-    
-    return templates
+class VirtualTextPreview(ctk.CTkFrame):
+    """Read-only preview that only renders the rows currently in view.
 
+    Rows come from any sequence of strings (e.g. a FolderTree) and are
+    formatted as the user scrolls, so a template with 200k folders costs
+    the same to display as one with ten.
+    """
 
-def save_templates(templates):
-    save_path = Path.home() / ".foldercrafter" / SAVE_FILE
-    save_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(save_path, "w", encoding="utf-8") as f:
-        json.dump(templates, f, indent=2)
+    def __init__(self, master, **textbox_kwargs):
+        super().__init__(master, fg_color="transparent", corner_radius=0)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
 
+        self.rows = []
+        self.first_row = 0
+        font = textbox_kwargs.get("font")
+        self.line_height = font.metrics("linespace") if hasattr(font, "metrics") else 18  # Unscaled
 
-def parse_indented_lines(text):
-    """Converts indented text to full paths."""
-    paths = []
-    stack = []
-    
-    lines = text.splitlines()
-    for line in lines:
-        if not line.strip():
-            continue
-        
-        indent = len(line) - len(line.lstrip())
-        name = line.strip()
-        
-        while stack and stack[-1][0] >= indent:
-            stack.pop()
+        self.textbox = ctk.CTkTextbox(
+            self,
+            state="disabled",
+            wrap="none",
+            activate_scrollbars=False,
+            **textbox_kwargs
+        )
+        self.textbox.grid(row=0, column=0, sticky="nsew")
+
+        self.scrollbar = ctk.CTkScrollbar(
+            self,
+            command=self.yview,
+            button_color=COLOR_SURFACE_LIGHT,
+            button_hover_color=COLOR_BORDER
+        )
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        # Long rows scroll sideways; the range covers the rows currently rendered
+        self.x_scrollbar = ctk.CTkScrollbar(
+            self,
+            orientation="horizontal",
+            command=self.textbox.xview,
+            button_color=COLOR_SURFACE_LIGHT,
+            button_hover_color=COLOR_BORDER
+        )
+        self.x_scrollbar.grid(row=1, column=0, sticky="ew")
+        self.textbox.configure(xscrollcommand=self.x_scrollbar.set)
+
+        self.textbox.bind("<Configure>", lambda event: self.render())
+        self.textbox.bind("<MouseWheel>", self._on_mousewheel)
+        self.textbox.bind("<Shift-MouseWheel>", self._on_shift_mousewheel)
+        self.textbox.bind("<Button-4>", self._on_mousewheel)
+        self.textbox.bind("<Button-5>", self._on_mousewheel)
+
+    def set_rows(self, rows):
+        """Show a new sequence of rows, scrolled back to the top."""
+        self.rows = rows
+        self.first_row = 0
+        self.render()
+
+    def visible_rows(self):
+        """Number of rows that fit in the textbox right now."""
+        # winfo_height() is in screen pixels, but font metrics ignore CTk's widget scaling
+        line_height = max(1, round(self.line_height * self._get_widget_scaling()))
+        return max(1, self.textbox.winfo_height() // line_height)
+
+    def render(self):
+        """Materialize only the rows inside the viewport."""
+        total = len(self.rows)
+        visible = self.visible_rows()
+        self.first_row = max(0, min(self.first_row, total - visible))
+        last = min(total, self.first_row + visible + 1)  # +1 for the partial bottom line
+
+        text = "\n".join(self.rows[i] for i in range(self.first_row, last))
+        x_offset = self.textbox.xview()[0]
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("1.0", text)
+        self.textbox.configure(state="disabled")
+        self.textbox.xview("moveto", x_offset)  # Keep the horizontal position while scrolling down
+
+        if total:
+            self.scrollbar.set(self.first_row / total, min(total, self.first_row + visible) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, what)."""
+        if args[0] == "moveto":
+            self.first_row = int(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.visible_rows()
+            self.first_row += step
+        self.render()
+
+    def _on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -3, "units")
+        else:
+            self.yview("scroll", 3, "units")
+        return "break"
+
+    def _on_shift_mousewheel(self, event):
+        self.textbox.xview("scroll", -5 if event.delta > 0 else 5, "units")
+        return "break"
+
+
+class VirtualTemplateList(ctk.CTkFrame):
+    """Template list that recycles a fixed pool of row widgets.
+
+    Only enough rows to fill the viewport are ever created. Scrolling or
+    refreshing re-labels those rows in place, and a row is reconfigured only
+    when the template it shows or its selection state actually changed.
+    """
+
+    ROW_HEIGHT = 46
+
+    def __init__(self, master, on_select, on_delete, **frame_kwargs):
+        super().__init__(master, fg_color="transparent", corner_radius=0, **frame_kwargs)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.on_select = on_select
+        self.on_delete = on_delete
+        self.names = []
+        self.selected = None
+        self.first_row = 0
+        self.pool = []  # [frame, item button, delete button, (name, is_selected) shown]
+        self.font = ctk.CTkFont(size=13)
+        self.selected_font = ctk.CTkFont(size=13, weight="bold")
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.body.grid_columnconfigure(0, weight=1)
+
+        self.empty_label = ctk.CTkLabel(
+            self.body,
+            text="No matching templates",
+            font=ctk.CTkFont(size=12),
+            text_color=COLOR_TEXT_DIM
+        )
+
+        self.scrollbar = ctk.CTkScrollbar(
+            self,
+            command=self.yview,
+            button_color=COLOR_SURFACE_LIGHT,
+            button_hover_color=COLOR_BORDER
+        )
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.body.bind("<Configure>", lambda event: self.render())
+        self._bind_wheel(self.body)
+
+    def set_items(self, names, selected=None, keep_position=True):
+        """Show a new list of template names, highlighting ``selected``."""
+        self.names = names
+        self.selected = selected
+        if not keep_position:
+            self.first_row = 0
+        self.render()
+
+    def visible_rows(self):
+        """Number of rows that fit in the list right now."""
+        return max(1, self.body.winfo_height() // self.ROW_HEIGHT)
+
+    def render(self):
+        """Point the row pool at the templates inside the viewport."""
+        total = len(self.names)
+        visible = self.visible_rows()
+        self.first_row = max(0, min(self.first_row, total - visible))
+        
+        # +1 for the partial bottom row; the pool only ever grows
+        while len(self.pool) < visible + 1:
+            self._add_row()
+        
+        for slot, row in enumerate(self.pool):
+            index = self.first_row + slot
+            if index < total and slot <= visible:
+                name = self.names[index]
+                self._show(row, slot, name, name == self.selected)
+            elif row[3] is not None:
+                row[0].grid_remove()
+                row[3] = None
+        
+        if total:
+            self.empty_label.place_forget()
+            self.scrollbar.set(self.first_row / total, min(total, self.first_row + visible) / total)
+        else:
+            self.empty_label.place(relx=0.5, y=16, anchor="n")
+            self.scrollbar.set(0, 1)
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, what)."""
+        if args[0] == "moveto":
+            self.first_row = int(float(args[1]) * len(self.names))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.visible_rows()
+            self.first_row += step
+        self.render()
+
+    def _add_row(self):
+        slot = len(self.pool)
+        frame = ctk.CTkFrame(self.body, fg_color="transparent", corner_radius=10, height=self.ROW_HEIGHT - 6)
+        frame.grid_columnconfigure(0, weight=1)
+        
+        # Template button
+        item_btn = ctk.CTkButton(
+            frame,
+            text="",
+            anchor="w",
+            height=40,
+            fg_color="transparent",
+            hover_color=COLOR_SURFACE_LIGHT,
+            text_color=COLOR_TEXT_MUTED,
+            font=self.font,
+            corner_radius=8,
+            command=lambda: self._clicked(slot, self.on_select)
+        )
+        item_btn.grid(row=0, column=0, sticky="ew", padx=4, pady=4)
+        
+        # Delete button
+        delete_btn = ctk.CTkButton(
+            frame,
+            text="✕",
+            width=32,
+            height=32,
+            fg_color="transparent",
+            hover_color=COLOR_DANGER,
+            text_color=COLOR_TEXT_DIM,
+            font=ctk.CTkFont(size=14),
+            corner_radius=6,
+            command=lambda: self._clicked(slot, self.on_delete)
+        )
+        delete_btn.grid(row=0, column=1, padx=(0, 8), pady=4)
         
-        stack.append((indent, name))
-        full_path = "/".join([x[1] for x in stack])
-        paths.append(full_path)
-    
-    return paths
+        for widget in (frame, item_btn, delete_btn):
+            self._bind_wheel(widget)
+        self.pool.append([frame, item_btn, delete_btn, None])
 
+    def _show(self, row, slot, name, is_selected):
+        frame, item_btn, _, shown = row
+        if shown == (name, is_selected):
+            return
+        if shown is None:
+            frame.grid(row=slot, column=0, sticky="ew", pady=3)
+        if shown is None or shown[1] != is_selected:
+            frame.configure(fg_color=COLOR_SURFACE if is_selected else "transparent")
+            item_btn.configure(
+                text_color=COLOR_TEXT if is_selected else COLOR_TEXT_MUTED,
+                font=self.selected_font if is_selected else self.font
+            )
+        if shown is None or shown[0] != name:
+            item_btn.configure(text=f"📁  {name}")
+        row[3] = (name, is_selected)
 
-def format_paths_to_tree(paths):
-    """Converts full paths to tree-like text display."""
-    if not paths:
-        return "  No folders to preview"
-    
-    all_paths = set()
-    for p in paths:
-        parts = p.split('/')
-        for i in range(1, len(parts) + 1):
-            all_paths.add("/".join(parts[:i]))
-    
-    sorted_paths = sorted(list(all_paths))
-    
-    lines = []
-    for p in sorted_paths:
-        parts = p.split('/')
-        depth = len(parts) - 1
-        name = parts[-1]
-        
-        if depth == 0:
-            prefix = "📁  "
+    def _clicked(self, slot, callback):
+        shown = self.pool[slot][3]
+        if shown is not None:
+            callback(shown[0])
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", self._on_mousewheel)
+        widget.bind("<Button-5>", self._on_mousewheel)
+
+    def _on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -1, "units")
         else:
-            prefix = "    " * depth + "└── "
-        lines.append(f"{prefix}{name}")
-    
-    return "\n".join(lines)
+            self.yview("scroll", 1, "units")
+        return "break"
 
 
-def format_paths_to_indented(paths):
-    """Converts full paths to indented text for editing."""
-    if not paths:
-        return ""
-    
-    all_paths = set()
-    for p in paths:
-        parts = p.split('/')
-        for i in range(1, len(parts) + 1):
-            all_paths.add("/".join(parts[:i]))
-    
-    sorted_paths = sorted(list(all_paths))
+class TreeViewPreview(ctk.CTkFrame):
+    """Collapsible preview of a FolderTree.
+
+    Only the top level is inserted up front; a node's children are added the
+    first time it is expanded. Collapsed nodes show how many folders they hold.
+    """
+
+    def __init__(self, master, **frame_kwargs):
+        super().__init__(master, **frame_kwargs)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.tree = None
+
+        style = ttk.Style(self)
+        style.configure(
+            "FolderCrafter.Treeview",
+            background=COLOR_BG,
+            fieldbackground=COLOR_BG,
+            foreground=COLOR_TEXT_MUTED,
+            borderwidth=0,
+            rowheight=24,
+            font=("Consolas", 12)
+        )
+        style.map(
+            "FolderCrafter.Treeview",
+            background=[("selected", COLOR_PRIMARY)],
+            foreground=[("selected", COLOR_TEXT)]
+        )
+        style.layout("FolderCrafter.Treeview", [("Treeview.treearea", {"sticky": "nsew"})])
+
+        self.treeview = ttk.Treeview(self, show="tree", selectmode="browse", style="FolderCrafter.Treeview")
+        self.treeview.grid(row=0, column=0, sticky="nsew", padx=(8, 0), pady=8)
+
+        scrollbar = ctk.CTkScrollbar(
+            self,
+            command=self.treeview.yview,
+            button_color=COLOR_SURFACE_LIGHT,
+            button_hover_color=COLOR_BORDER
+        )
+        scrollbar.grid(row=0, column=1, sticky="ns", pady=8)
+        self.treeview.configure(yscrollcommand=scrollbar.set)
+
+        self.treeview.bind("<<TreeviewOpen>>", self._on_open)
+
+    def set_tree(self, tree, empty_message="  No folders to preview"):
+        """Show a new FolderTree (or a message row when it is empty)."""
+        self.tree = tree
+        with span("render_tree_view", cat="ui"):
+            self.treeview.delete(*self.treeview.get_children())
+            if not tree:
+                self.treeview.insert("", "end", text=empty_message)
+                return
+            self._insert_children("", tree.roots)
+
+    def _insert_children(self, parent_iid, nodes):
+        for i in nodes:
+            count = self.tree.descendant_count(i)
+            text = self.tree.label(i)
+            if count:
+                text += f"   ({count})"
+            self.treeview.insert(parent_iid, "end", iid=str(i), text=text)
+            if count:
+                # Placeholder so the expand arrow shows; replaced on first open
+                self.treeview.insert(str(i), "end", iid=f"{i}:stub")
+
+    def _on_open(self, event=None):
+        iid = self.treeview.focus()
+        stub = f"{iid}:stub"
+        if iid and self.treeview.exists(stub):
+            self.treeview.delete(stub)
+            self._insert_children(iid, self.tree.children_of(int(iid)))
+
+
+class PreviewPanel(ctk.CTkFrame):
+    """Template preview that can switch between the flat list and the tree view.
+
+    The tree view is only (re)built when it is actually showing, so typing in
+    the editor with the list view active never pays for it.
+    """
+
+    def __init__(self, master, **textbox_kwargs):
+        super().__init__(master, fg_color="transparent", corner_radius=0)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.mode = "List"
+        self.tree = None
+        self.empty_message = ""
+        self.tree_view_stale = True
+
+        self.list_view = VirtualTextPreview(self, **textbox_kwargs)
+        self.list_view.grid(row=0, column=0, sticky="nsew")
+
+        frame_keys = ("fg_color", "border_color", "border_width", "corner_radius")
+        self.tree_view = TreeViewPreview(
+            self, **{k: v for k, v in textbox_kwargs.items() if k in frame_keys}
+        )
+
+    def show_tree(self, tree, empty_message="  No folders to preview"):
+        """Display a FolderTree in whichever mode is active."""
+        self.tree = tree
+        self.empty_message = empty_message
+        with span("render_preview", cat="ui", rows=len(tree) if tree else 0):
+            self.list_view.set_rows(tree or [empty_message])
+        self.tree_view_stale = True
+        if self.mode == "Tree":
+            self._refresh_tree_view()
+
+    def show_message(self, message):
+        """Display a single placeholder line."""
+        self.show_tree(None, message)
+
+    def set_mode(self, mode):
+        """Switch between the "List" and "Tree" presentations."""
+        self.mode = mode
+        if mode == "Tree":
+            self.list_view.grid_forget()
+            self.tree_view.grid(row=0, column=0, sticky="nsew")
+            self._refresh_tree_view()
+        else:
+            self.tree_view.grid_forget()
+            self.list_view.grid(row=0, column=0, sticky="nsew")
+
+    def _refresh_tree_view(self):
+        if self.tree_view_stale:
+            self.tree_view.set_tree(self.tree, self.empty_message)
+            self.tree_view_stale = False
+
+
+# ============================================================================
+# STARTUP REPORT
+# ============================================================================
+class StartupReport:
+    """Records how long each startup phase took, measured from STARTUP_STARTED."""
+
+    def __init__(self, started=STARTUP_STARTED):
+        self.started = started
+        self.marks = []
+
+    def mark(self, phase):
+        self.marks.append((phase, time.perf_counter()))
+
+    def format(self):
+        lines = ["FolderCrafter startup:"]
+        previous = self.started
+        for phase, at in self.marks:
+            lines.append(f"  {phase:<14}{(at - previous) * 1000:8.1f} ms  (total {(at - self.started) * 1000:.1f} ms)")
+            previous = at
+        total = (previous - self.started) * 1000
+        verdict = "within" if total <= STARTUP_BUDGET_MS else "OVER"
+        lines.append(f"  {verdict} the {STARTUP_BUDGET_MS} ms budget")
+        return "\n".join(lines)
+
+    def report(self):
+        """Print the report, and append it to startup.log (pythonw has no console)."""
+        text = self.format()
+        if sys.stderr is not None:
+            print(text, file=sys.stderr)
+        try:
+            DATA_DIR.mkdir(parents=True, exist_ok=True)
+            with open(DATA_DIR / "startup.log", "a", encoding="utf-8") as f:
+                f.write(f"{datetime.datetime.now().isoformat(timespec='seconds')} {text}\n")
+        except OSError:
+            pass
+
+
+# ============================================================================
+# RESPONSIVENESS MONITOR
+# ============================================================================
+def percentiles(samples):
+    """p50/p90/p99/max of a list of timings (nearest rank); {} if empty."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    result = {f"p{q}": ordered[max(0, (len(ordered) * q + 99) // 100 - 1)] for q in (50, 90, 99)}
+    result["max"] = ordered[-1]
+    return result
+
+
+class ResponsivenessMonitor:
+    """Rolling timings of UI handlers and of event-loop stalls.
     
-    lines = []
-    for p in sorted_paths:
-        parts = p.split('/')
-        depth = len(parts) - 1
-        name = parts[-1]
-        indent = "    " * depth
-        lines.append(f"{indent}{name}")
+    Handlers wrapped in @ui_handler report each call's duration. Once start()
+    is called, a heartbeat runs every HEARTBEAT_MS; however late it fires is
+    how long the loop was blocked, and lateness past STALL_THRESHOLD_MS is
+    logged as a stall along with the handlers that ran since the last beat.
+    """
+
+    def __init__(self, window=RESPONSIVENESS_WINDOW):
+        self.window = window
+        self.widget = None
+        self.reset()
+
+    def reset(self):
+        self.started = time.time()
+        self.handlers = {}  # name -> deque of recent durations (ms)
+        self.calls = {}     # name -> calls since reset
+        self.lateness = deque(maxlen=self.window)
+        self.stalls = deque(maxlen=STALL_LOG_SIZE)
+        self.stall_count = 0
+        self.recent = set()  # handlers run since the last heartbeat
+
+    def record(self, name, ms):
+        samples = self.handlers.get(name)
+        if samples is None:
+            samples = self.handlers[name] = deque(maxlen=self.window)
+        samples.append(ms)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.recent.add(name)
+
+    def start(self, widget):
+        """Begin the heartbeat on ``widget``'s event loop."""
+        self.widget = widget
+        self._expected = time.perf_counter() + HEARTBEAT_MS / 1000
+        widget.after(HEARTBEAT_MS, self._beat)
+
+    def _beat(self):
+        now = time.perf_counter()
+        late = max(0.0, (now - self._expected) * 1000)
+        self.lateness.append(late)
+        if late >= STALL_THRESHOLD_MS:
+            self.stall_count += 1
+            self.stalls.append({
+                "at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "ms": round(late, 1),
+                "handlers": sorted(self.recent),
+            })
+            instant("event_loop_stall", cat="ui", ms=round(late, 1))
+        self.recent.clear()
+        self._expected = now + HEARTBEAT_MS / 1000
+        self.widget.after(HEARTBEAT_MS, self._beat)
+
+    def snapshot(self):
+        """Everything recorded so far, as JSON-friendly data."""
+        def rounded(stats):
+            return {k: round(v, 2) for k, v in stats.items()}
+        
+        handlers = {
+            name: {"calls": self.calls[name], **rounded(percentiles(samples))}
+            for name, samples in self.handlers.items()
+        }
+        return {
+            "recorded_since": datetime.datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "heartbeat_ms": HEARTBEAT_MS,
+            "stall_threshold_ms": STALL_THRESHOLD_MS,
+            "handlers": dict(sorted(handlers.items(), key=lambda item: -item[1].get("p99", 0))),
+            "event_loop": {"stalls": self.stall_count, "lateness_ms": rounded(percentiles(self.lateness))},
+            "recent_stalls": list(self.stalls),
+        }
+
+    def format(self):
+        """The snapshot as a plain-text table, slowest handlers first."""
+        data = self.snapshot()
+        lines = [f"{'Handler':<26}{'Calls':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}   (ms)"]
+        for name, stats in data["handlers"].items():
+            lines.append(
+                f"{name:<26}{stats['calls']:>7}{stats['p50']:>9.1f}{stats['p90']:>9.1f}"
+                f"{stats['p99']:>9.1f}{stats['max']:>9.1f}"
+            )
+        if not data["handlers"]:
+            lines.append("  (no handlers have run yet)")
+        
+        loop = data["event_loop"]
+        lines.append("")
+        lines.append(f"Event loop: {loop['stalls']} stall(s) over {STALL_THRESHOLD_MS} ms")
+        if loop["lateness_ms"]:
+            late = loop["lateness_ms"]
+            lines.append(f"  heartbeat lateness p50 {late['p50']:.1f}  p99 {late['p99']:.1f}  max {late['max']:.1f} ms")
+        for stall in reversed(data["recent_stalls"][-10:]):
+            ran = ", ".join(stall["handlers"]) or "untracked work"
+            lines.append(f"  {stall['at']}  {stall['ms']:>8.1f} ms  after {ran}")
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+        """Write the snapshot to ``path`` (default: a new file in DATA_DIR/diagnostics)."""
+        if path is None:
+            stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = DATA_DIR / "diagnostics" / f"responsiveness-{stamp}.json"
+        write_json_atomic(path, self.snapshot())
+        return path
+
+
+RESPONSIVENESS = ResponsivenessMonitor()
+
+
+def ui_handler(func):
+    """Record how long each call of a Tk callback takes (and trace it, when tracing)."""
+    name = func.__name__
     
-    return "\n".join(lines)
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(name, cat="ui"):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                RESPONSIVENESS.record(name, (time.perf_counter() - started) * 1000)
+    return wrapper
 
 
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
 class FolderCrafterApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, startup_report=None, instance=None):
         super().__init__()
         
         # Configure window
@@ -291,8 +957,13 @@ class FolderCrafterApp(ctk.CTk):
         
         # State
         self.templates = load_templates()
+        self.template_resolver = TemplateResolver(self.templates)
         self.selected_template = list(self.templates.keys())[0] if self.templates else None
         self.editing_template = None
+        self.editor_loading = False
+        self.editor_load_job = None
+        self.preview_trees = OrderedDict()  # content hash -> FolderTree
+        self.sync_state = load_sync_state()
         
         # Configure grid
         self.grid_columnconfigure(1, weight=1)
@@ -301,19 +972,38 @@ class FolderCrafterApp(ctk.CTk):
         self.create_sidebar()
         self.create_main_content()
         
-        # Check command line arguments (Context Menu Support)
-        if len(sys.argv) > 1:
-            initial_path = sys.argv[1]
-            # Strip quotes if present (Windows sometimes adds them)
-            initial_path = initial_path.strip('"')
-            
-            if os.path.isdir(initial_path) and hasattr(self, 'target_entry'):
-                self.target_entry.delete(0, 'end')
-                self.target_entry.insert(0, initial_path)
-
-        
         # Show generator by default
         self.show_generator()
+        
+        # Template writes happen on a background thread; report their outcome
+        # and make sure nothing is lost when the window closes
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(STORE_POLL_MS, self.poll_store_results)
+        
+        # Later launches (e.g. more context-menu clicks) arrive through here
+        self.instance_server = instance
+        if self.instance_server:
+            self.after(INSTANCE_POLL_MS, self.poll_instance_requests)
+        
+        # Handler timings and event-loop stalls, shown by Ctrl+Shift+D
+        RESPONSIVENESS.start(self)
+        self.diagnostics_window = None
+        self.bind("<Control-Shift-D>", lambda event: self.show_diagnostics())
+        
+        self.startup_report = startup_report
+        if startup_report:
+            startup_report.mark("window built")
+            # Idle callbacks run after Tk has drawn the pending widgets; the
+            # timer after that fires once the event loop is free for input
+            self.after_idle(self._mark_first_paint)
+    
+    def _mark_first_paint(self):
+        self.startup_report.mark("first paint")
+        self.after(0, self._mark_interactive)
+    
+    def _mark_interactive(self):
+        self.startup_report.mark("interactive")
+        self.startup_report.report()
     
     def create_sidebar(self):
         """Create a minimal, elegant sidebar."""
@@ -398,6 +1088,43 @@ class FolderCrafterApp(ctk.CTk):
         )
         self.btn_howto.grid(row=4, column=0, padx=16, pady=4, sticky="ew")
         
+        # Shared folder sync, pinned to the bottom of the navigation
+        sync_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
+        sync_frame.grid(row=5, column=0, padx=16, pady=(20, 0), sticky="sew")
+        
+        sync_btn = ctk.CTkButton(
+            sync_frame,
+            text="🔄 Sync",
+            font=ctk.CTkFont(size=13),
+            height=36,
+            fg_color="transparent",
+            hover_color=COLOR_SURFACE_LIGHT,
+            border_width=1,
+            border_color=COLOR_BORDER,
+            text_color=COLOR_TEXT_MUTED,
+            corner_radius=10,
+            command=self.sync_templates
+        )
+        sync_btn.pack(side="left", expand=True, fill="x", padx=(0, 8))
+        CTkToolTip(sync_btn, "Sync templates with a shared team folder")
+        
+        sync_folder_btn = ctk.CTkButton(
+            sync_frame,
+            text="📁",
+            font=ctk.CTkFont(size=13),
+            height=36,
+            width=36,
+            fg_color="transparent",
+            hover_color=COLOR_SURFACE_LIGHT,
+            border_width=1,
+            border_color=COLOR_BORDER,
+            text_color=COLOR_TEXT_MUTED,
+            corner_radius=10,
+            command=self.choose_sync_folder
+        )
+        sync_folder_btn.pack(side="right")
+        CTkToolTip(sync_folder_btn, "Choose the shared folder")
+        
         # ========== FOOTER SECTION ==========
         # Buy Me a Coffee button
         bmc_btn = ctk.CTkButton(
@@ -409,7 +1136,7 @@ class FolderCrafterApp(ctk.CTk):
             hover_color="#E5C700",
             text_color="#000000",
             corner_radius=10,
-            command=lambda: webbrowser.open("https://www.buymeacoffee.com/craftedanomaly")
+            command=lambda: open_url("https://www.buymeacoffee.com/craftedanomaly")
         )
         bmc_btn.grid(row=6, column=0, padx=16, pady=(20, 8), sticky="ew")
         
@@ -422,7 +1149,7 @@ class FolderCrafterApp(ctk.CTk):
             fg_color="transparent",
             hover_color=COLOR_SURFACE_LIGHT,
             text_color=COLOR_TEXT_DIM,
-            command=lambda: webbrowser.open("https://www.craftedanomaly.com")
+            command=lambda: open_url("https://www.craftedanomaly.com")
         )
         brand_btn.grid(row=7, column=0, padx=24, pady=(0, 20))
     
@@ -433,9 +1160,11 @@ class FolderCrafterApp(ctk.CTk):
         self.main_container.grid_columnconfigure(0, weight=1)
         self.main_container.grid_rowconfigure(0, weight=1)
         
+        # Only the generator is shown at startup; the other views are built
+        # the first time they are opened
         self.create_generator_view()
-        self.create_templates_view()
-        self.create_howto_view()
+        self.templates_frame = None
+        self.howto_frame = None
     
     def create_generator_view(self):
         """Create a beautiful centered card for the Generator."""
@@ -494,15 +1223,34 @@ class FolderCrafterApp(ctk.CTk):
         )
         step1_label.grid(row=1, column=0, padx=48, pady=(0, 8), sticky="w")
         
-        template_names = list(self.templates.keys())
+        template_names = list(self.templates.keys())[:SEARCH_RESULT_LIMIT]
         self.template_var = ctk.StringVar(value=self.selected_template or "")
         
+        picker_frame = ctk.CTkFrame(card, fg_color="transparent")
+        picker_frame.grid(row=2, column=0, padx=48, pady=(0, 24), sticky="ew")
+        picker_frame.grid_columnconfigure(1, weight=1)
+        
+        self.template_filter_entry = ctk.CTkEntry(
+            picker_frame,
+            width=180,
+            height=48,
+            font=ctk.CTkFont(size=14),
+            fg_color=COLOR_SURFACE_LIGHT,
+            border_color=COLOR_BORDER,
+            border_width=1,
+            corner_radius=10,
+            placeholder_text="🔎 Filter..."
+        )
+        self.template_filter_entry.grid(row=0, column=0, padx=(0, 12), sticky="w")
+        self.template_filter_entry.bind("<KeyRelease>", self.filter_generator_menu)
+        CTkToolTip(self.template_filter_entry, "Type part of a template or folder name")
+        
         self.template_menu = ctk.CTkOptionMenu(
-            card,
+            picker_frame,
             values=template_names,
             variable=self.template_var,
             command=self.on_template_change,
-            width=500,
+            width=308,
             height=48,
             font=ctk.CTkFont(size=14),
             fg_color=COLOR_SURFACE_LIGHT,
@@ -512,7 +1260,7 @@ class FolderCrafterApp(ctk.CTk):
             dropdown_hover_color=COLOR_SURFACE_LIGHT,
             corner_radius=10
         )
-        self.template_menu.grid(row=2, column=0, padx=48, pady=(0, 24), sticky="ew")
+        self.template_menu.grid(row=0, column=1, sticky="ew")
         
         # Step 2: Preview
         step2_label = ctk.CTkLabel(
@@ -523,6 +1271,18 @@ class FolderCrafterApp(ctk.CTk):
         )
         step2_label.grid(row=3, column=0, padx=48, pady=(8, 8), sticky="w")
         
+        preview_mode_switch = ctk.CTkSegmentedButton(
+            card,
+            values=["List", "Tree"],
+            font=ctk.CTkFont(size=12),
+            selected_color=COLOR_PRIMARY,
+            selected_hover_color=COLOR_PRIMARY_HOVER,
+            command=lambda mode: self.preview_panel.set_mode(mode)
+        )
+        preview_mode_switch.set("List")
+        preview_mode_switch.grid(row=3, column=0, padx=48, pady=(8, 8), sticky="e")
+        CTkToolTip(preview_mode_switch, "Switch to a collapsible tree for large templates")
+        
         preview_container = ctk.CTkFrame(
             card,
             fg_color=COLOR_BG,
@@ -532,17 +1292,15 @@ class FolderCrafterApp(ctk.CTk):
         )
         preview_container.grid(row=4, column=0, padx=48, pady=(0, 24), sticky="ew")
         
-        self.preview_textbox = ctk.CTkTextbox(
+        self.preview_panel = PreviewPanel(
             preview_container,
             width=500,
             height=160,
             font=ctk.CTkFont(family="Consolas", size=13),
             fg_color="transparent",
-            text_color=COLOR_TEXT_MUTED,
-            state="disabled",
-            wrap="none"
+            text_color=COLOR_TEXT_MUTED
         )
-        self.preview_textbox.pack(padx=16, pady=16, fill="both", expand=True)
+        self.preview_panel.pack(padx=16, pady=16, fill="both", expand=True)
         
         self.update_preview()
         
@@ -617,7 +1375,7 @@ class FolderCrafterApp(ctk.CTk):
             corner_radius=0
         )
         list_panel.grid(row=0, column=0, sticky="nsew")
-        list_panel.grid_rowconfigure(2, weight=1)
+        list_panel.grid_rowconfigure(3, weight=1)
         list_panel.grid_propagate(False)
         
         # Panel Header
@@ -662,18 +1420,82 @@ class FolderCrafterApp(ctk.CTk):
         scan_btn.pack(side="right", expand=True, fill="x")
         CTkToolTip(scan_btn, "Create template from a real folder")
         
-        # Template List (Scrollable)
-        self.template_list_frame = ctk.CTkScrollableFrame(
-            list_panel, 
+        # Library Import/Export (whole bundles)
+        library_container = ctk.CTkFrame(list_panel, fg_color="transparent")
+        library_container.grid(row=4, column=0, padx=20, pady=(0, 20), sticky="ew")
+        
+        import_library_btn = ctk.CTkButton(
+            library_container,
+            text="📦 Import Library",
+            font=ctk.CTkFont(size=12),
+            height=36,
+            width=120,
             fg_color="transparent",
-            scrollbar_button_color=COLOR_SURFACE_LIGHT,
-            scrollbar_button_hover_color=COLOR_BORDER
+            hover_color=COLOR_SURFACE_LIGHT,
+            border_width=1,
+            border_color=COLOR_BORDER,
+            text_color=COLOR_TEXT_MUTED,
+            corner_radius=10,
+            command=self.import_library
+        )
+        import_library_btn.pack(side="left", expand=True, fill="x", padx=(0, 8))
+        CTkToolTip(import_library_btn, "Import every template from a library bundle")
+        
+        export_library_btn = ctk.CTkButton(
+            library_container,
+            text="📤 Export All",
+            font=ctk.CTkFont(size=12),
+            height=36,
+            width=100,
+            fg_color="transparent",
+            hover_color=COLOR_SURFACE_LIGHT,
+            border_width=1,
+            border_color=COLOR_BORDER,
+            text_color=COLOR_TEXT_MUTED,
+            corner_radius=10,
+            command=self.export_library
+        )
+        export_library_btn.pack(side="left", expand=True, fill="x", padx=(0, 8))
+        CTkToolTip(export_library_btn, "Export all templates into one bundle")
+        
+        duplicates_btn = ctk.CTkButton(
+            library_container,
+            text="🔍",
+            font=ctk.CTkFont(size=12),
+            height=36,
+            width=36,
+            fg_color="transparent",
+            hover_color=COLOR_SURFACE_LIGHT,
+            border_width=1,
+            border_color=COLOR_BORDER,
+            text_color=COLOR_TEXT_MUTED,
+            corner_radius=10,
+            command=self.show_duplicates
         )
-        self.template_list_frame.grid(row=2, column=0, sticky="nsew", padx=12, pady=(0, 20))
-        self.template_list_frame.grid_columnconfigure(0, weight=1)
+        duplicates_btn.pack(side="right")
+        CTkToolTip(duplicates_btn, "Find templates with identical folders")
         
-        # Update grid weight for template list row
-        list_panel.grid_rowconfigure(2, weight=1)
+        # Type-to-filter search over names and folder names
+        self.template_list_filter = ctk.CTkEntry(
+            list_panel,
+            height=36,
+            font=ctk.CTkFont(size=13),
+            fg_color=COLOR_SURFACE,
+            border_color=COLOR_BORDER,
+            border_width=1,
+            corner_radius=10,
+            placeholder_text="🔎 Search templates or folders..."
+        )
+        self.template_list_filter.grid(row=2, column=0, padx=20, pady=(0, 12), sticky="ew")
+        self.template_list_filter.bind("<KeyRelease>", lambda e: self.refresh_template_list(keep_position=False))
+        
+        # Template List (virtualized, so large libraries stay responsive)
+        self.template_list = VirtualTemplateList(
+            list_panel,
+            on_select=self.edit_template,
+            on_delete=self.delete_template
+        )
+        self.template_list.grid(row=3, column=0, sticky="nsew", padx=12, pady=(0, 12))
         
         self.refresh_template_list()
         
@@ -756,13 +1578,21 @@ class FolderCrafterApp(ctk.CTk):
         self.editor_structure_textbox.bind("<KeyRelease>", self.update_editor_preview)
         
         # Hint below structure
-        hint_label = ctk.CTkLabel(
+        self.editor_hint_label = ctk.CTkLabel(
             structure_frame,
             text="💡 Tip: Use 4 spaces to create subfolders",
             font=ctk.CTkFont(size=11),
             text_color=COLOR_TEXT_DIM
         )
-        hint_label.grid(row=2, column=0, sticky="w", pady=(8, 0))
+        self.editor_hint_label.grid(row=2, column=0, sticky="w", pady=(8, 0))
+        
+        # Progress bar shown in place of the hint while a large template streams in
+        self.editor_load_progress = ctk.CTkProgressBar(
+            structure_frame,
+            height=8,
+            progress_color=COLOR_PRIMARY,
+            fg_color=COLOR_SURFACE_LIGHT
+        )
         
         # Right: Live Preview
         preview_frame = ctk.CTkFrame(editor_panel, fg_color="transparent")
@@ -778,27 +1608,36 @@ class FolderCrafterApp(ctk.CTk):
         )
         preview_label.grid(row=0, column=0, sticky="w", pady=(0, 6))
         
-        self.editor_preview_textbox = ctk.CTkTextbox(
+        editor_preview_mode_switch = ctk.CTkSegmentedButton(
+            preview_frame,
+            values=["List", "Tree"],
+            font=ctk.CTkFont(size=11),
+            selected_color=COLOR_PRIMARY,
+            selected_hover_color=COLOR_PRIMARY_HOVER,
+            command=lambda mode: self.editor_preview_panel.set_mode(mode)
+        )
+        editor_preview_mode_switch.set("List")
+        editor_preview_mode_switch.grid(row=0, column=0, sticky="e", pady=(0, 6))
+        
+        self.editor_preview_panel = PreviewPanel(
             preview_frame,
             font=ctk.CTkFont(family="Consolas", size=13),
             fg_color=COLOR_BG,
             border_color=COLOR_BORDER,
             border_width=1,
             corner_radius=10,
-            text_color=COLOR_TEXT_MUTED,
-            state="disabled",
-            wrap="none"
+            text_color=COLOR_TEXT_MUTED
         )
-        self.editor_preview_textbox.grid(row=1, column=0, sticky="nsew")
+        self.editor_preview_panel.grid(row=1, column=0, sticky="nsew")
         
         # Status label for preview
-        status_label = ctk.CTkLabel(
+        self.editor_status_label = ctk.CTkLabel(
             preview_frame,
             text="Updates as you type",
             font=ctk.CTkFont(size=11),
             text_color=COLOR_TEXT_DIM
         )
-        status_label.grid(row=2, column=0, sticky="w", pady=(8, 0))
+        self.editor_status_label.grid(row=2, column=0, sticky="w", pady=(8, 0))
         
         # Action Buttons Row
         btn_frame = ctk.CTkFrame(editor_panel, fg_color="transparent")
@@ -848,7 +1687,7 @@ class FolderCrafterApp(ctk.CTk):
             text_color=COLOR_TEXT_MUTED,
             command=self.import_template
         )
-        CTkToolTip(import_btn, message="Import Template from JSON")
+        CTkToolTip(import_btn, message="Import Template (JSON or packed)")
         import_btn.grid(row=0, column=2, padx=(0, 8))
         
         export_btn = ctk.CTkButton(
@@ -865,8 +1704,25 @@ class FolderCrafterApp(ctk.CTk):
             text_color=COLOR_TEXT_MUTED,
             command=self.export_template
         )
-        CTkToolTip(export_btn, message="Export Template to JSON")
-        export_btn.grid(row=0, column=3)
+        CTkToolTip(export_btn, message="Export Template (JSON or packed)")
+        export_btn.grid(row=0, column=3, padx=(0, 8))
+        
+        compare_btn = ctk.CTkButton(
+            btn_frame,
+            text="⇄",
+            width=48,
+            height=48,
+            font=ctk.CTkFont(size=16),
+            fg_color="transparent",
+            hover_color="#0d9488",
+            border_width=1,
+            border_color=COLOR_BORDER,
+            corner_radius=10,
+            text_color=COLOR_TEXT_MUTED,
+            command=self.show_compare
+        )
+        CTkToolTip(compare_btn, message="Compare with / Merge from another template")
+        compare_btn.grid(row=0, column=4)
     
     def create_howto_view(self):
         """Create the How To guide view."""
@@ -937,6 +1793,8 @@ class FolderCrafterApp(ctk.CTk):
                 "        styles",
                 "    public",
                 "• Use 4 spaces to create subfolders",
+                "• Add '@include Other Template' to reuse another template,",
+                "  indented under a folder to mount it there",
                 "• The Live Preview shows your structure in real-time",
                 "• Click 'Save Template' when you're done"
             ]
@@ -950,13 +1808,28 @@ class FolderCrafterApp(ctk.CTk):
                 "✨ Templates are saved automatically to your home folder",
                 "✨ You can edit existing templates by clicking on them",
                 "✨ Delete templates you no longer need with the ✕ button",
+                "✨ Switch a preview to Tree to collapse big structures",
                 "✨ Folder structures work on Windows, Mac, and Linux",
                 "✨ Existing folders won't be overwritten - only new ones are created"
             ]
         )
         
-        # Section 4: Examples
+        # Section 4: Patterns
         self._add_howto_section(card, 5,
+            "🔢 Patterns",
+            "Generate numbered or dated folders from a single line.",
+            [
+                "Ep{001..120}         →  Ep001 ... Ep120",
+                "Shot{0010..0990:10}  →  Shot0010, Shot0020 ... Shot0990",
+                "{Audio,Video,Docs}   →  Audio, Video, Docs",
+                "{YYYY}/{MM}          →  today's year and month",
+                "",
+                "Patterns can be nested: every Ep folder gets every Shot."
+            ]
+        )
+        
+        # Section 5: Examples
+        self._add_howto_section(card, 6,
             "📁 Example Structures",
             "Here are some ideas to get you started.",
             [
@@ -1025,11 +1898,16 @@ class FolderCrafterApp(ctk.CTk):
     # EVENT HANDLERS
     # =========================================================================
     
+    def _show_view(self, frame):
+        for view in (self.generator_frame, self.templates_frame, self.howto_frame):
+            if view is not None and view is not frame:
+                view.grid_forget()
+        frame.grid(row=0, column=0, sticky="nsew")
+    
+    @ui_handler
     def show_generator(self):
         """Show the generator view."""
-        self.templates_frame.grid_forget()
-        self.howto_frame.grid_forget()
-        self.generator_frame.grid(row=0, column=0, sticky="nsew")
+        self._show_view(self.generator_frame)
         
         # Update nav button styles
         self.btn_generator.configure(fg_color=COLOR_PRIMARY, text_color=COLOR_TEXT)
@@ -1038,11 +1916,12 @@ class FolderCrafterApp(ctk.CTk):
         
         self.refresh_generator_menu()
     
+    @ui_handler
     def show_templates(self):
         """Show the templates editor view."""
-        self.generator_frame.grid_forget()
-        self.howto_frame.grid_forget()
-        self.templates_frame.grid(row=0, column=0, sticky="nsew")
+        if self.templates_frame is None:
+            self.create_templates_view()
+        self._show_view(self.templates_frame)
         
         # Update nav button styles
         self.btn_generator.configure(fg_color="transparent", text_color=COLOR_TEXT_MUTED)
@@ -1051,46 +1930,209 @@ class FolderCrafterApp(ctk.CTk):
     
     def show_howto(self):
         """Show the how-to guide view."""
-        self.generator_frame.grid_forget()
-        self.templates_frame.grid_forget()
-        self.howto_frame.grid(row=0, column=0, sticky="nsew")
+        if self.howto_frame is None:
+            self.create_howto_view()
+        self._show_view(self.howto_frame)
         
         # Update nav button styles
         self.btn_generator.configure(fg_color="transparent", text_color=COLOR_TEXT_MUTED)
         self.btn_templates.configure(fg_color="transparent", text_color=COLOR_TEXT_MUTED)
         self.btn_howto.configure(fg_color=COLOR_PRIMARY, text_color=COLOR_TEXT)
     
+    @ui_handler
     def on_template_change(self, value):
         """Handle template dropdown change."""
         self.selected_template = value
         self.update_preview()
     
+    def on_close(self):
+        """Wait for pending template writes, then close the window."""
+        store = self.templates.store
+        if not store.flush(timeout=10):
+            if store.last_error:
+                title = "Unsaved Changes"
+                message = f"Some template changes could not be written to disk:\n\n{store.last_error}\n\nQuit anyway? These changes will be lost."
+            else:
+                title = "Still Saving"
+                message = "Templates are still being written to disk.\n\nQuit anyway? Recent changes may be lost."
+            if not messagebox.askyesno(title, message):
+                return
+        if self.instance_server:
+            self.instance_server.close()
+        self.destroy()
+    
+    def poll_instance_requests(self):
+        """Handle arguments forwarded by later launches, one batch at a time.
+        
+        Every batch raises the window, including ones made up only of
+        launches without arguments.
+        """
+        batch = self.instance_server.take_batch()
+        if batch:
+            self.bring_to_front()
+            self.handle_launch_args(batch)
+        self.after(INSTANCE_POLL_MS, self.poll_instance_requests)
+    
+    def bring_to_front(self):
+        self.deiconify()
+        self.lift()
+        self.attributes("-topmost", True)
+        self.after_idle(self.attributes, "-topmost", False)
+        self.focus_force()
+    
+    def handle_launch_args(self, batch):
+        """Apply one or more launches' arguments (context menu support).
+        
+        Plain folders become craft destinations (several are crafted into
+        together); "--scan FOLDER" reverse engineers a folder into a template.
+        """
+        targets = []
+        scans = []
+        for args in batch:
+            args = iter(args)
+            for arg in args:
+                if arg == "--scan":
+                    path = next(args, "").strip('"')
+                    if os.path.isdir(path):
+                        scans.append(path)
+                elif not arg.startswith("--") and os.path.isdir(arg.strip('"')):
+                    # Strip quotes if present (Windows sometimes adds them)
+                    targets.append(arg.strip('"'))
+        
+        if targets:
+            self.target_entry.delete(0, "end")
+            self.target_entry.insert(0, TARGET_SEPARATOR.join(dict.fromkeys(targets)))
+            self.show_generator()
+        
+        if len(scans) == 1:
+            self.scan_directory_logic(scans[0])
+        elif scans:
+            self.scan_directories(scans)
+    
+    def poll_store_results(self):
+        """Report background template writes that finished since the last check."""
+        while True:
+            try:
+                ok, message = self.templates.store.results.get_nowait()
+            except queue.Empty:
+                break
+            if not ok:
+                messagebox.showerror(
+                    "Save Failed",
+                    f"Your templates could not be written to disk:\n{message}\n\n"
+                    "They will be retried with your next save."
+                )
+        self.after(STORE_POLL_MS, self.poll_store_results)
+    
+    @ui_handler
     def update_preview(self):
         """Update the preview textbox in generator view."""
         template_name = self.selected_template
         if template_name and template_name in self.templates:
-            tree_text = format_paths_to_tree(self.templates[template_name])
+            with span("preview", cat="ui", template=template_name):
+                try:
+                    with span("resolve", cat="template"):
+                        paths = self.template_resolver.resolve(template_name)
+                        digest = self.template_resolver.content_hash(template_name)
+                except TemplateError as ex:
+                    self.preview_panel.show_message(f"  ⚠️ {ex}")
+                    return
+                self.preview_panel.show_tree(self.preview_tree(paths, digest))
         else:
-            tree_text = "  Select a template to preview..."
+            self.preview_panel.show_message("  Select a template to preview...")
+    
+    def choose_sync_folder(self):
+        """Pick the shared folder used by Sync. Returns it, or None if cancelled."""
+        from tkinter import filedialog
+        folder = filedialog.askdirectory(title="Select Shared Templates Folder")
+        if not folder:
+            return None
+        if folder != self.sync_state["folder"]:
+            # Hashes agreed with another folder say nothing about this one
+            self.sync_state = {"folder": folder, "base": {}}
+            save_sync_state(self.sync_state)
+        return folder
+    
+    def sync_templates(self):
+        """Pull and push changed templates through the shared folder."""
+        folder = self.sync_state["folder"]
+        if not folder or not os.path.isdir(folder):
+            folder = self.choose_sync_folder()
+            if not folder:
+                return
+        
+        if not self.templates.store.flush(timeout=10):
+            messagebox.showwarning("Still Saving", "Templates are still being written to disk. Please try again.")
+            return
+        
+        shared = SharedLibrary(folder)
+        base = self.sync_state["base"]
+        try:
+            result = sync_library(self.templates, shared, base)
+            
+            resolutions = {}
+            for name, entry in result.conflicts.items():
+                if entry is None or entry["hash"] is None:
+                    question = f"'{name}' was deleted from the shared folder but changed here."
+                else:
+                    question = f"'{name}' was changed here and by {entry.get('updated_by', 'another computer')}."
+                answer = messagebox.askyesnocancel(
+                    "Sync Conflict",
+                    f"{question}\n\nYes: keep your version\nNo: use the shared version\nCancel: decide next time"
+                )
+                if answer is not None:
+                    resolutions[name] = ("mine" if answer else "theirs", entry["hash"] if entry else None)
+            
+            if resolutions:
+                second = sync_library(self.templates, shared, base, resolutions)
+                result.pulled += second.pulled
+                result.pushed += second.pushed
+                result.skipped += second.skipped
+                result.conflicts = second.conflicts
+        except (TemplateError, OSError) as ex:
+            # The saved state stays as it was; the next sync compares against it again
+            messagebox.showerror("Sync Failed", f"Could not sync with {folder}:\n{ex}")
+            return
+        save_sync_state(self.sync_state)
+        
+        for name in result.pulled:
+            self.template_resolver.invalidate(name)
+        if self.editing_template is not None and self.editing_template not in self.templates:
+            self.new_template()
+        self.refresh_template_list()
+        self.refresh_generator_menu()
         
-        self.preview_textbox.configure(state="normal")
-        self.preview_textbox.delete("1.0", "end")
-        self.preview_textbox.insert("1.0", tree_text)
-        self.preview_textbox.configure(state="disabled")
+        messagebox.showinfo("Synced 🔄", result.summary())
+    
+    def preview_tree(self, paths, digest):
+        """Build (or reuse) the preview tree for paths with a known content hash."""
+        tree = self.preview_trees.get(digest)
+        if tree is None:
+            with span("build_tree", cat="template", paths=len(paths)):
+                tree = build_folder_tree(paths)
+            self.preview_trees[digest] = tree
+            if len(self.preview_trees) > PREVIEW_CACHE_SIZE:
+                self.preview_trees.popitem(last=False)
+        else:
+            instant("preview_cache_hit", cat="template")
+            self.preview_trees.move_to_end(digest)
+        return tree
     
     def browse_folder(self):
         """Open folder browser dialog."""
+        from tkinter import filedialog
         folder = filedialog.askdirectory(title="Select Target Folder")
         if folder:
             self.target_entry.delete(0, "end")
             self.target_entry.insert(0, folder)
     
     def create_folders(self):
-        """Create the folder structure."""
+        """Create the folder structure (in each destination, if several were chosen)."""
         target = self.target_entry.get()
+        targets = [t.strip().strip('"') for t in target.split(TARGET_SEPARATOR.strip()) if t.strip()]
         template_name = self.selected_template
         
-        if not target:
+        if not targets:
             messagebox.showwarning("Missing Folder", "Please select a destination folder first.")
             return
         
@@ -1098,106 +2140,165 @@ class FolderCrafterApp(ctk.CTk):
             messagebox.showwarning("No Template", "Please select a template from the dropdown.")
             return
         
+        try:
+            paths = self.template_resolver.resolve(template_name)
+            digest = self.template_resolver.content_hash(template_name)
+        except TemplateError as ex:
+            messagebox.showerror("Template Error", str(ex))
+            return
+        
+        total = count_expanded_paths(paths)
+        if total > MAX_EXPANDED_FOLDERS:
+            messagebox.showerror(
+                "Template Too Large",
+                f"This template expands to {total:,} folders, more than the limit of {MAX_EXPANDED_FOLDERS:,}.\n\n"
+                "Narrow its {...} ranges and try again."
+            )
+            return
+        
+        for target in targets:
+            issues = validate_template(paths, target, digest)
+            if issues:
+                where = f" in {target}" if len(targets) > 1 else ""
+                messagebox.showerror(
+                    "Template Problems",
+                    f"Found {len(issues):,} problem(s) that would stop these folders being created{where}:\n\n"
+                    f"{format_issues(issues)}"
+                )
+                return
+        
         try:
             count = 0
-            target_abs = os.path.abspath(target)
+            for target in targets:
+                count += create_folders(paths, target, check=False)  # Checked above, with friendlier messages
             
-            for p in self.templates[template_name]:
-                # Security: Prevent path traversal
-                full_path = os.path.abspath(os.path.join(target_abs, p))
-                
-                # Check if the resolved path starts with the target path
-                if not full_path.startswith(target_abs):
-                    print(f"Skipping unsafe path: {p}", file=sys.stderr)
-                    continue
-                
-                os.makedirs(full_path, exist_ok=True)
-                count += 1
-            
-            messagebox.showinfo("Success! 🎉", f"Created {count} folders successfully!\n\nLocation: {target}")
+            if len(targets) == 1:
+                messagebox.showinfo("Success! 🎉", f"Created {count} folders successfully!\n\nLocation: {targets[0]}")
+            else:
+                messagebox.showinfo(
+                    "Success! 🎉",
+                    f"Created {count} folders successfully across {len(targets)} locations:\n\n" + "\n".join(targets[:10])
+                )
         except Exception as ex:
             messagebox.showerror("Error", f"Failed to create folders:\n{ex}")
     
-    def refresh_template_list(self):
+    @ui_handler
+    def refresh_template_list(self, keep_position=True):
         """Refresh the template list in the sidebar."""
-        for widget in self.template_list_frame.winfo_children():
-            widget.destroy()
+        if self.templates_frame is None:
+            return  # Built with a fresh list when first shown
         
-        for i, name in enumerate(self.templates.keys()):
-            is_selected = (name == self.editing_template)
-            
-            item_frame = ctk.CTkFrame(
-                self.template_list_frame,
-                fg_color=COLOR_SURFACE if is_selected else "transparent",
-                corner_radius=10
-            )
-            item_frame.grid(row=i, column=0, sticky="ew", pady=3)
-            item_frame.grid_columnconfigure(0, weight=1)
-            
-            # Template button
-            item_btn = ctk.CTkButton(
-                item_frame,
-                text=f"📁  {name}",
-                anchor="w",
-                height=40,
-                fg_color="transparent",
-                hover_color=COLOR_SURFACE_LIGHT,
-                text_color=COLOR_TEXT if is_selected else COLOR_TEXT_MUTED,
-                font=ctk.CTkFont(size=13, weight="bold" if is_selected else "normal"),
-                corner_radius=8,
-                command=lambda n=name: self.edit_template(n)
-            )
-            item_btn.grid(row=0, column=0, sticky="ew", padx=4, pady=4)
-            
-            # Delete button
-            delete_btn = ctk.CTkButton(
-                item_frame,
-                text="✕",
-                width=32,
-                height=32,
-                fg_color="transparent",
-                hover_color=COLOR_DANGER,
-                text_color=COLOR_TEXT_DIM,
-                font=ctk.CTkFont(size=14),
-                corner_radius=6,
-                command=lambda n=name: self.delete_template(n)
-            )
-            delete_btn.grid(row=0, column=1, padx=(0, 8), pady=4)
+        names = self.matching_templates(self.template_list_filter.get())
+        self.template_list.set_items(names, self.editing_template, keep_position)
+    
+    def matching_templates(self, query):
+        """Template names for a picker's filter text; every name when it is blank."""
+        if not query.strip():
+            return list(self.templates.keys())
+        return self.templates.find(query)
     
     def refresh_generator_menu(self):
         """Refresh the template dropdown in generator view."""
-        template_names = list(self.templates.keys())
+        template_names = self.matching_templates(self.template_filter_entry.get())[:SEARCH_RESULT_LIMIT]
         self.template_menu.configure(values=template_names)
         
-        if self.selected_template not in template_names and template_names:
-            self.selected_template = template_names[0]
-            self.template_var.set(self.selected_template)
+        if self.selected_template not in self.templates:
+            self.selected_template = template_names[0] if template_names else next(iter(self.templates), None)
+            self.template_var.set(self.selected_template or "")
         
         self.update_preview()
     
+    def filter_generator_menu(self, event=None):
+        """Narrow the template dropdown as the user types, selecting the best match."""
+        template_names = self.matching_templates(self.template_filter_entry.get())[:SEARCH_RESULT_LIMIT]
+        self.template_menu.configure(values=template_names)
+        
+        if template_names and self.selected_template not in template_names:
+            self.template_var.set(template_names[0])
+            self.on_template_change(template_names[0])
+    
     def new_template(self):
         """Clear editor for new template."""
         self.editing_template = None
         self.editor_name_entry.delete(0, "end")
-        self.editor_structure_textbox.delete("1.0", "end")
-        self.update_editor_preview()
+        self.load_editor_structure("")
         self.refresh_template_list()
     
+    @ui_handler
     def edit_template(self, name):
         """Load a template into the editor."""
         self.editing_template = name
         self.editor_name_entry.delete(0, "end")
         self.editor_name_entry.insert(0, name)
         
-        formatted = format_paths_to_indented(self.templates[name])
-        self.editor_structure_textbox.delete("1.0", "end")
-        self.editor_structure_textbox.insert("1.0", formatted)
+        try:
+            paths = self.templates[name]
+        except TemplateError as ex:
+            messagebox.showerror("Template Error", str(ex))
+            return
         
-        self.update_editor_preview()
+        self.load_editor_structure(format_paths_to_indented(paths))
         self.refresh_template_list()
     
+    def load_editor_structure(self, text):
+        """Replace the structure editor's content, streaming large templates in chunks.
+        
+        Small templates are inserted in one go. Larger ones are inserted
+        EDITOR_LOAD_CHUNK_LINES at a time from `after` callbacks so the window
+        keeps repainting; the live preview is only rebuilt once loading ends.
+        """
+        self.cancel_editor_load()
+        self.editor_structure_textbox.delete("1.0", "end")
+        
+        lines = text.splitlines()
+        if len(lines) <= EDITOR_LOAD_CHUNK_LINES:
+            self.editor_structure_textbox.insert("1.0", text)
+            self.update_editor_preview()
+            return
+        
+        self.editor_loading = True
+        self.editor_structure_textbox.configure(state="disabled")
+        self.editor_preview_panel.show_message(f"  Loading {len(lines):,} lines...")
+        self.editor_hint_label.grid_remove()
+        self.editor_load_progress.set(0)
+        self.editor_load_progress.grid(row=2, column=0, sticky="ew", pady=(14, 6))
+        self._load_editor_chunk(lines, 0)
+    
+    def _load_editor_chunk(self, lines, start):
+        end = min(len(lines), start + EDITOR_LOAD_CHUNK_LINES)
+        chunk = "\n".join(lines[start:end])
+        if end < len(lines):
+            chunk += "\n"
+        
+        self.editor_structure_textbox.configure(state="normal")
+        self.editor_structure_textbox.insert("end", chunk)
+        self.editor_structure_textbox.configure(state="disabled")
+        self.editor_load_progress.set(end / len(lines))
+        
+        if end < len(lines):
+            self.editor_load_job = self.after(1, self._load_editor_chunk, lines, end)
+        else:
+            self.editor_load_job = None
+            self.cancel_editor_load()
+            self.update_editor_preview()
+    
+    def cancel_editor_load(self):
+        """Stop any in-progress chunked load and restore the editor."""
+        if self.editor_load_job is not None:
+            self.after_cancel(self.editor_load_job)
+            self.editor_load_job = None
+        if self.editor_loading:
+            self.editor_loading = False
+            self.editor_structure_textbox.configure(state="normal")
+            self.editor_load_progress.grid_remove()
+            self.editor_hint_label.grid()
+    
     def save_template(self):
         """Save the current template."""
+        if self.editor_loading:
+            messagebox.showwarning("Still Loading", "Please wait until the template has finished loading.")
+            return
+        
         name = self.editor_name_entry.get().strip()
         content = self.editor_structure_textbox.get("1.0", "end").strip()
         
@@ -1209,9 +2310,23 @@ class FolderCrafterApp(ctk.CTk):
             messagebox.showwarning("Empty Structure", "Please define at least one folder.")
             return
         
-        paths = parse_indented_lines(content)
+        try:
+            paths = normalize_template_paths(parse_indented_lines(content))
+            resolved = self.template_resolver.resolve_paths(paths, owner=name)
+        except TemplateError as ex:
+            messagebox.showerror("Template Error", f"Could not save '{name}':\n{ex}")
+            return
+        
+        if count_expanded_paths(resolved) <= MAX_EXPANDED_FOLDERS:
+            issues = validate_template(resolved)
+            if issues and not messagebox.askyesno(
+                "Template Problems",
+                f"Found {len(issues):,} problem(s) in this template:\n\n{format_issues(issues)}\n\nSave anyway?"
+            ):
+                return
+        
         self.templates[name] = paths
-        save_templates(self.templates)
+        self.template_resolver.invalidate(name)
         
         self.editing_template = name
         self.refresh_template_list()
@@ -1224,7 +2339,7 @@ class FolderCrafterApp(ctk.CTk):
         if messagebox.askyesno("Delete Template?", f"Are you sure you want to delete '{name}'?\n\nThis cannot be undone."):
             if name in self.templates:
                 del self.templates[name]
-                save_templates(self.templates)
+                self.template_resolver.invalidate(name)
                 
                 if self.editing_template == name:
                     self.new_template()
@@ -1232,22 +2347,43 @@ class FolderCrafterApp(ctk.CTk):
                 self.refresh_template_list()
                 self.refresh_generator_menu()
     
+    @ui_handler
     def update_editor_preview(self, event=None):
         """Update the live preview in editor."""
+        if self.editor_loading:
+            return  # Rebuilt once the chunked load completes
+        
         content = self.editor_structure_textbox.get("1.0", "end").strip()
+        status = "Updates as you type"
         if content:
-            paths = parse_indented_lines(content)
-            tree_text = format_paths_to_tree(paths)
+            name = self.editor_name_entry.get().strip()
+            with span("editor_preview", cat="ui", chars=len(content)):
+                try:
+                    with span("parse", cat="template"):
+                        lines = parse_indented_lines(content)
+                    paths = normalize_template_paths(lines)
+                    with span("resolve", cat="template"):
+                        paths = self.template_resolver.resolve_paths(paths, owner=name)
+                except TemplateError as ex:
+                    self.editor_preview_panel.show_message(f"  ⚠️ {ex}")
+                    self.editor_status_label.configure(text=status)
+                    return
+                with span("build_tree", cat="template", paths=len(paths)):
+                    tree = build_folder_tree(paths)
+                self.editor_preview_panel.show_tree(tree)
+            if isinstance(tree, ExpandedTree):
+                status = f"Expands to {len(tree):,} folders"
         else:
-            tree_text = "  Start typing to see preview..."
+            self.editor_preview_panel.show_message("  Start typing to see preview...")
         
-        self.editor_preview_textbox.configure(state="normal")
-        self.editor_preview_textbox.delete("1.0", "end")
-        self.editor_preview_textbox.insert("1.0", tree_text)
-        self.editor_preview_textbox.configure(state="disabled")
+        self.editor_status_label.configure(text=status)
     
     def export_template(self):
         """Export the current template to a JSON file."""
+        if self.editor_loading:
+            messagebox.showwarning("Still Loading", "Please wait until the template has finished loading.")
+            return
+        
         name = self.editor_name_entry.get().strip()
         content = self.editor_structure_textbox.get("1.0", "end").strip()
         
@@ -1263,74 +2399,83 @@ class FolderCrafterApp(ctk.CTk):
         paths = parse_indented_lines(content)
         
         # Ask for save location
+        from tkinter import filedialog
         file_path = filedialog.asksaveasfilename(
             title="Export Template",
             defaultextension=".json",
-            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")],
+            filetypes=[
+                ("JSON Files", "*.json"),
+                ("Packed Templates (large)", f"*{PACKED_EXTENSION}"),
+                ("All Files", "*.*")
+            ],
             initialfile=f"{name.replace('/', '-')}.json"
         )
         
         if not file_path:
             return  # User cancelled
         
-        # Create export data
-        export_data = {
-            "template_name": name,
-            "structure": paths
-        }
-        
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            if file_path.lower().endswith(PACKED_EXTENSION):
+                with open(file_path, "wb") as f:
+                    f.write(encode_packed_tree(name, FolderTree(paths), compress=True))
+            else:
+                # Create export data
+                export_data = {
+                    "template_name": name,
+                    "structure": paths
+                }
+                with open(file_path, "w", encoding="utf-8") as f:
+                    json.dump(export_data, f, indent=2, ensure_ascii=False)
             
             messagebox.showinfo("Exported! 📤", f"Template '{name}' exported successfully!\n\nFile: {file_path}")
         except Exception as ex:
             messagebox.showerror("Export Failed", f"Could not export template:\n{ex}")
     
     def import_template(self):
-        """Import a template from a JSON file."""
+        """Import a template from a JSON or packed (.fct) file."""
+        from tkinter import filedialog
         file_path = filedialog.askopenfilename(
             title="Import Template",
-            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
+            filetypes=[
+                ("FolderCrafter Templates", f"*.json *{PACKED_EXTENSION}"),
+                ("JSON Files", "*.json"),
+                ("Packed Templates", f"*{PACKED_EXTENSION}"),
+                ("All Files", "*.*")
+            ]
         )
         
         if not file_path:
             return  # User cancelled
         
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            # Validate structure
-            if "template_name" not in data or "structure" not in data:
-                messagebox.showerror(
-                    "Invalid File", 
-                    "This file is not a valid FolderCrafter template.\n\n"
-                    "Expected format:\n"
-                    '{"template_name": "...", "structure": [...]}'
-                )
+            try:
+                name, structure = read_template_file(file_path)
+            except TemplateError as ex:
+                messagebox.showerror("Invalid File", str(ex))
                 return
             
-            name = data["template_name"]
-            structure = data["structure"]
+            try:
+                structure = normalize_template_paths(structure)
+            except TemplateError as ex:
+                messagebox.showerror("Unsafe Template", f"This template can't be imported:\n{ex}")
+                return
             
-            # Validate structure is a list
-            if not isinstance(structure, list):
-                messagebox.showerror("Invalid Structure", "The 'structure' field must be a list of folder paths.")
+            # Skip exact copies of a template we already have
+            existing = self.templates.names_by_hash().get(content_hash(structure))
+            if existing is not None:
+                messagebox.showinfo(
+                    "Already Imported",
+                    f"'{name}' has exactly the same folders as your template '{existing}', so it was not imported again."
+                )
+                self.edit_template(existing)
                 return
             
             # Handle name conflict
-            original_name = name
-            counter = 1
-            while name in self.templates:
-                name = f"{original_name} (Imported)"
-                if counter > 1:
-                    name = f"{original_name} (Imported {counter})"
-                counter += 1
+            name = ImportNameAllocator(self.templates).allocate(name)
             
             # Save the template
             self.templates[name] = structure
-            save_templates(self.templates)
+            self.template_resolver.invalidate(name)
             
             # Refresh UI
             self.refresh_template_list()
@@ -1347,18 +2492,389 @@ class FolderCrafterApp(ctk.CTk):
             messagebox.showerror("Import Failed", f"Could not import template:\n{ex}")
 
 
+    def export_library(self):
+        """Export every template into a single library bundle."""
+        from tkinter import filedialog
+        file_path = filedialog.asksaveasfilename(
+            title="Export Template Library",
+            defaultextension=LIBRARY_EXTENSION,
+            filetypes=[("FolderCrafter Library", f"*{LIBRARY_EXTENSION}"), ("All Files", "*.*")],
+            initialfile=f"FolderCrafter Library{LIBRARY_EXTENSION}"
+        )
+        
+        if not file_path:
+            return  # User cancelled
+        
+        try:
+            count = write_library(file_path, ((name, self.templates[name]) for name in self.templates))
+            messagebox.showinfo("Exported! 📤", f"Exported {count} templates.\n\nFile: {file_path}")
+        except Exception as ex:
+            messagebox.showerror("Export Failed", f"Could not export the library:\n{ex}")
+    
+    def import_library(self):
+        """Import every template from a library bundle in one batch."""
+        from tkinter import filedialog
+        file_path = filedialog.askopenfilename(
+            title="Import Template Library",
+            filetypes=[("FolderCrafter Library", f"*{LIBRARY_EXTENSION}"), ("All Files", "*.*")]
+        )
+        
+        if not file_path:
+            return  # User cancelled
+        
+        allocator = ImportNameAllocator(self.templates)
+        known = self.templates.names_by_hash()
+        skipped = []
+        duplicates = 0
+        
+        def prepared():
+            nonlocal duplicates
+            for name, structure in read_library(file_path):
+                if not isinstance(name, str) or not isinstance(structure, list):
+                    skipped.append(f"• {name}: not a list of folder paths")
+                    continue
+                try:
+                    structure = normalize_template_paths(structure)
+                except TemplateError as ex:
+                    skipped.append(f"• {name}: {ex}")
+                    continue
+                
+                digest = content_hash(structure)
+                if digest in known:
+                    duplicates += 1  # Identical to a template we already have (or just imported)
+                    continue
+                name = allocator.allocate(name)
+                known[digest] = name
+                yield name, structure
+        
+        error = None
+        try:
+            self.templates.import_stream(prepared())
+        except (TemplateError, OSError) as ex:
+            error = ex
+        imported = [name for name in allocator.used if name in self.templates]
+        
+        for name in imported:
+            self.template_resolver.invalidate(name)
+        
+        # One refresh for the whole batch
+        self.refresh_template_list()
+        self.refresh_generator_menu()
+        
+        summary = f"Imported {len(imported)} templates."
+        if duplicates:
+            summary += f"\n{duplicates} identical to existing templates were not imported again."
+        if skipped:
+            summary += f"\n\nSkipped {len(skipped)}:\n" + "\n".join(skipped[:10])
+            if len(skipped) > 10:
+                summary += f"\n... and {len(skipped) - 10} more"
+        if error:
+            messagebox.showerror("Import Stopped", f"{summary}\n\nThe rest of the file could not be read:\n{error}")
+        else:
+            messagebox.showinfo("Imported! 📥", summary)
+
+    def editor_paths(self):
+        """The editor's template as normalized paths (includes not expanded)."""
+        content = self.editor_structure_textbox.get("1.0", "end").strip()
+        return normalize_template_paths(parse_indented_lines(content))
+    
+    def show_compare(self):
+        """Compare the editor's template with another one, or merge that one's changes in."""
+        if self.editor_loading:
+            messagebox.showwarning("Still Loading", "Please wait until the template has finished loading.")
+            return
+        
+        window = ctk.CTkToplevel(self)
+        window.title("Compare Templates")
+        window.geometry("680x560")
+        window.configure(fg_color=COLOR_BG)
+        window.transient(self)
+        window.grid_columnconfigure(1, weight=1)
+        window.grid_rowconfigure(2, weight=1)
+        
+        ctk.CTkLabel(
+            window,
+            text="⇄ Compare with",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLOR_TEXT
+        ).grid(row=0, column=0, padx=(20, 12), pady=(20, 12), sticky="w")
+        
+        def other_names(query=""):
+            names = [n for n in self.matching_templates(query) if n != self.editing_template]
+            return names[:SEARCH_RESULT_LIMIT]
+        
+        choice = ctk.StringVar(value=next(iter(other_names()), ""))
+        menu = ctk.CTkOptionMenu(
+            window,
+            variable=choice,
+            values=other_names() or [""],
+            fg_color=COLOR_SURFACE,
+            button_color=COLOR_SURFACE_LIGHT,
+            button_hover_color=COLOR_BORDER,
+            text_color=COLOR_TEXT,
+            corner_radius=8,
+            command=lambda value: compare()
+        )
+        menu.grid(row=0, column=1, padx=(0, 8), pady=(20, 12), sticky="ew")
+        
+        filter_entry = ctk.CTkEntry(
+            window,
+            width=140,
+            placeholder_text="🔍 Filter...",
+            fg_color=COLOR_SURFACE,
+            border_color=COLOR_BORDER,
+            text_color=COLOR_TEXT,
+            corner_radius=8
+        )
+        filter_entry.grid(row=0, column=2, padx=(0, 20), pady=(20, 12))
+        
+        summary_label = ctk.CTkLabel(window, text="", font=ctk.CTkFont(size=12), text_color=COLOR_TEXT_MUTED)
+        summary_label.grid(row=1, column=0, columnspan=3, padx=20, sticky="w")
+        
+        changes = VirtualTextPreview(
+            window,
+            font=ctk.CTkFont(family="Consolas", size=12),
+            fg_color=COLOR_SURFACE,
+            text_color=COLOR_TEXT,
+            corner_radius=10
+        )
+        changes.grid(row=2, column=0, columnspan=3, sticky="nsew", padx=20, pady=(8, 0))
+        
+        def filter_names(event=None):
+            names = other_names(filter_entry.get())
+            menu.configure(values=names or [""])
+            if names and choice.get() not in names:
+                choice.set(names[0])
+                compare()
+        
+        filter_entry.bind("<KeyRelease>", filter_names)
+        
+        def compare():
+            other = choice.get()
+            if other not in self.templates:
+                summary_label.configure(text="Choose a template to compare with.")
+                changes.set_rows([])
+                return
+            name = self.editor_name_entry.get().strip()
+            try:
+                mine = self.template_resolver.resolve_paths(self.editor_paths(), owner=name)
+                theirs = self.template_resolver.resolve(other)
+            except TemplateError as ex:
+                summary_label.configure(text=f"⚠️ {ex}")
+                changes.set_rows([])
+                return
+            diff = diff_templates(theirs, mine)
+            if diff:
+                summary_label.configure(text=f"From '{other}' to this template: {diff.summary()}")
+                changes.set_rows(["  " + line for line in diff.lines()])
+            else:
+                summary_label.configure(text=f"Creates exactly the same folders as '{other}'.")
+                changes.set_rows([])
+        
+        def merge():
+            other = choice.get()
+            if other not in self.templates:
+                return
+            if self.editing_template not in self.templates:
+                messagebox.showwarning(
+                    "Nothing to Merge Into",
+                    "Open a saved template first. Its saved version is the common base, "
+                    "and the changes made in the editor and in the other template are combined.",
+                    parent=window
+                )
+                return
+            try:
+                result = merge_templates(self.templates[self.editing_template], self.editor_paths(), self.templates[other])
+            except TemplateError as ex:
+                messagebox.showerror("Template Error", str(ex), parent=window)
+                return
+            
+            window.destroy()
+            self.load_editor_structure(format_paths_to_indented(result.paths))
+            if result.conflicts:
+                messagebox.showwarning("Merged with Conflicts", f"{result.summary()}\n\nReview the result, then save.")
+            else:
+                messagebox.showinfo("Merged ⇄", f"{result.summary()}\n\nReview the result, then save.")
+        
+        ctk.CTkButton(
+            window,
+            text="Merge into Editor",
+            width=160,
+            height=34,
+            fg_color=COLOR_PRIMARY,
+            hover_color=COLOR_PRIMARY_HOVER,
+            text_color=COLOR_TEXT,
+            corner_radius=8,
+            command=merge
+        ).grid(row=3, column=0, columnspan=3, padx=20, pady=16, sticky="e")
+        
+        compare()
+    
+    def show_diagnostics(self):
+        """Hidden panel (Ctrl+Shift+D) with handler timings and event-loop stalls."""
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.lift()
+            return
+        
+        window = ctk.CTkToplevel(self)
+        window.title("Diagnostics")
+        window.geometry("720x480")
+        window.configure(fg_color=COLOR_BG)
+        window.transient(self)
+        window.grid_columnconfigure(0, weight=1)
+        window.grid_rowconfigure(1, weight=1)
+        self.diagnostics_window = window
+        
+        ctk.CTkLabel(
+            window,
+            text="⏱️ UI Responsiveness",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLOR_TEXT
+        ).grid(row=0, column=0, padx=20, pady=(20, 12), sticky="w")
+        
+        textbox = ctk.CTkTextbox(
+            window,
+            font=ctk.CTkFont(family="Consolas", size=12),
+            fg_color=COLOR_SURFACE,
+            text_color=COLOR_TEXT,
+            corner_radius=10,
+            wrap="none"
+        )
+        textbox.grid(row=1, column=0, sticky="nsew", padx=20)
+        
+        def refresh():
+            if not window.winfo_exists():
+                return
+            textbox.configure(state="normal")
+            textbox.delete("1.0", "end")
+            textbox.insert("1.0", RESPONSIVENESS.format())
+            textbox.configure(state="disabled")
+            window.after(DIAGNOSTICS_REFRESH_MS, refresh)
+        
+        def save_report():
+            try:
+                path = RESPONSIVENESS.dump()
+            except OSError as ex:
+                messagebox.showerror("Save Failed", f"Could not save the report:\n{ex}", parent=window)
+                return
+            messagebox.showinfo("Report Saved", f"Saved to:\n{path}", parent=window)
+        
+        def reset():
+            RESPONSIVENESS.reset()
+            refresh()
+        
+        buttons = ctk.CTkFrame(window, fg_color="transparent")
+        buttons.grid(row=2, column=0, sticky="e", padx=20, pady=16)
+        ctk.CTkButton(
+            buttons,
+            text="Reset",
+            width=90,
+            height=34,
+            fg_color=COLOR_SURFACE_LIGHT,
+            hover_color=COLOR_BORDER,
+            text_color=COLOR_TEXT,
+            corner_radius=8,
+            command=reset
+        ).grid(row=0, column=0, padx=(0, 8))
+        ctk.CTkButton(
+            buttons,
+            text="💾 Save Report",
+            width=130,
+            height=34,
+            fg_color=COLOR_PRIMARY,
+            hover_color=COLOR_PRIMARY_HOVER,
+            text_color=COLOR_TEXT,
+            corner_radius=8,
+            command=save_report
+        ).grid(row=0, column=1)
+        
+        refresh()
+    
+    def show_duplicates(self):
+        """List groups of templates that create exactly the same folders."""
+        try:
+            groups = self.templates.duplicate_groups()
+        except TemplateError as ex:
+            messagebox.showerror("Template Error", str(ex))
+            return
+        
+        if not groups:
+            messagebox.showinfo("No Duplicates", "Every template creates a different set of folders.")
+            return
+        
+        window = ctk.CTkToplevel(self)
+        window.title("Duplicate Templates")
+        window.geometry("460x520")
+        window.configure(fg_color=COLOR_BG)
+        window.transient(self)
+        window.grid_columnconfigure(0, weight=1)
+        window.grid_rowconfigure(1, weight=1)
+        
+        ctk.CTkLabel(
+            window,
+            text=f"🔍 {len(groups)} group(s) of identical templates",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLOR_TEXT
+        ).grid(row=0, column=0, padx=20, pady=(20, 12), sticky="w")
+        
+        body = ctk.CTkScrollableFrame(window, fg_color="transparent")
+        body.grid(row=1, column=0, sticky="nsew", padx=12, pady=(0, 20))
+        body.grid_columnconfigure(0, weight=1)
+        
+        def delete_and_refresh(name):
+            self.delete_template(name)
+            if name not in self.templates:
+                window.destroy()
+                self.show_duplicates()
+        
+        row = 0
+        for names in groups:
+            group_frame = ctk.CTkFrame(body, fg_color=COLOR_SURFACE, corner_radius=10)
+            group_frame.grid(row=row, column=0, sticky="ew", pady=4)
+            group_frame.grid_columnconfigure(0, weight=1)
+            row += 1
+            
+            for i, name in enumerate(names):
+                ctk.CTkButton(
+                    group_frame,
+                    text=f"📁  {name}",
+                    anchor="w",
+                    height=34,
+                    fg_color="transparent",
+                    hover_color=COLOR_SURFACE_LIGHT,
+                    text_color=COLOR_TEXT if i == 0 else COLOR_TEXT_MUTED,
+                    font=ctk.CTkFont(size=13),
+                    corner_radius=8,
+                    command=lambda n=name: self.edit_template(n)
+                ).grid(row=i, column=0, sticky="ew", padx=4, pady=2)
+                
+                if name in self.templates.store:
+                    ctk.CTkButton(
+                        group_frame,
+                        text="✕",
+                        width=32,
+                        height=32,
+                        fg_color="transparent",
+                        hover_color=COLOR_DANGER,
+                        text_color=COLOR_TEXT_DIM,
+                        font=ctk.CTkFont(size=14),
+                        corner_radius=6,
+                        command=lambda n=name: delete_and_refresh(n)
+                    ).grid(row=i, column=1, padx=(0, 8), pady=2)
+
     # ============================================================================
     # SCAN / REVERSE ENGINEERING LOGIC
     # ============================================================================
     def scan_directory_ui(self):
         """Open dialog to scan a directory."""
+        from tkinter import filedialog
         path = filedialog.askdirectory(title="Select Folder to Reverse Engineer")
         if path:
             self.scan_directory_logic(path)
             
     def scan_directory_logic(self, path):
         """Logic to scan dir and populate editor."""
-        structure = self.generate_tree_text(path)
+        structure = scan_folders(path)
         if structure:
             # Create a new template name
             folder_name = os.path.basename(path)
@@ -1373,60 +2889,59 @@ class FolderCrafterApp(ctk.CTk):
             self.editor_name_entry.delete(0, "end")
             self.editor_name_entry.insert(0, new_name)
             
-            self.editor_structure_textbox.delete("1.0", "end")
-            self.editor_structure_textbox.insert("1.0", "\n".join(structure)) # Join lines with newlines
-            
-            self.update_editor_preview()
+            self.load_editor_structure(format_paths_to_indented(structure))
             
             # Optional: Auto-save or verify?
             messagebox.showinfo("Scan Complete", f"Successfully scanned '{folder_name}'!\n\nReview structure and click 'SAVE CHANGES'.")
 
-    def generate_tree_text(self, current_path, level=0):
-        """Recursive function to generate indented structure."""
-        IGNORED_DIRS = {'node_modules', '.git', '__pycache__', 'dist', 'build', 'venv', '.idea', '.vscode', '.venv', 'bin', 'obj'}
-        IGNORED_FILES = {'.DS_Store', 'Thumbs.db', 'desktop.ini'}
-        IGNORED_EXTS = {'.exe', '.dll', '.pyc', '.o', '.so', '.class'}
+    def scan_directories(self, paths):
+        """Scan several folders at once, saving each as a new template."""
+        allocator = ImportNameAllocator(self.templates)
+        scanned = []
+        for path in paths:
+            structure = scan_folders(path)
+            if not structure:
+                continue
+            name = allocator.allocate(f"Scanned: {os.path.basename(path)}")
+            scanned.append((name, normalize_template_paths(structure, strict=False)))
         
-        lines = []
-        indent = "    " * level
+        names = self.templates.import_stream(scanned)
+        for name in names:
+            self.template_resolver.invalidate(name)
         
-        try:
-            items = sorted(os.listdir(current_path))
-        except PermissionError:
-            return [] # Skip unreadable dirs
-
-        for item in items:
-            full_path = os.path.join(current_path, item)
-            
-            if item in IGNORED_DIRS or item in IGNORED_FILES:
-                continue
-                
-            _, ext = os.path.splitext(item)
-            if ext.lower() in IGNORED_EXTS:
-                continue
-
-            if os.path.isdir(full_path):
-                lines.append(f"{indent}{item}/")
-                lines.extend(self.generate_tree_text(full_path, level + 1))
-            else:
-                # Strictly ignore files. FolderCrafter only generates folders.
-                continue
+        self.show_templates()
+        self.refresh_template_list()
+        self.refresh_generator_menu()
+        messagebox.showinfo(
+            "Scan Complete",
+            f"Saved {len(names)} of {len(paths)} scanned folders as templates:\n\n" + "\n".join(names[:10])
+        )
 
-        return lines
 
 # ============================================================================
 # ENTRY POINT
 # ============================================================================
 if __name__ == "__main__":
-    app = FolderCrafterApp()
+    startup_report = None
+    if "--startup-report" in sys.argv or os.environ.get("FOLDERCRAFTER_STARTUP_REPORT"):
+        if "--startup-report" in sys.argv:
+            sys.argv.remove("--startup-report")
+        startup_report = StartupReport()
+        startup_report.mark("imports")
+    
+    enable_from_argv(sys.argv)  # --trace [FILE]; FOLDERCRAFTER_TRACE is read on import
+    
+    exit_code = run_cli(sys.argv)
+    if exit_code is not None:
+        sys.exit(exit_code)
+    
+    set_windows_app_id()
+    app = FolderCrafterApp(startup_report, INSTANCE)
     
-    # Check CLI args for --scan (Context Menu)
-    # Usage: main.py --scan "C:\Path\To\Scan"
-    if len(sys.argv) > 2 and sys.argv[1] == "--scan":
-        target = sys.argv[2].strip('"')
-        if os.path.isdir(target):
-            # We need to wait for the app to initialize, then trigger scan
-            # But since it's Tkinter/WinForms loop, we can usually call it before mainloop and it will queue
-            app.after(100, lambda: app.scan_directory_logic(target))
+    # Check CLI args (Context Menu): main.py "C:\Target" or main.py --scan "C:\Path\To\Scan"
+    # As the single instance they are already in the first batch, together
+    # with any launches that arrived while the window was loading
+    if len(sys.argv) > 1 and INSTANCE is None:
+        app.after(100, app.handle_launch_args, [sys.argv[1:]])
     
     app.mainloop()
@@ -0,0 +1,53 @@
+import unittest
+
+from foldercrafter.patterns import build_folder_tree, iter_expanded_paths
+
+
+def preview_paths(tree):
+    """Full folder paths shown by a preview, read back from its rows."""
+    paths, stack = [], []
+    for row in tree:
+        if row.startswith("📁  "):
+            depth, name = 0, row[len("📁  "):]
+        else:
+            indent, name = row.split("└── ", 1)
+            depth = len(indent) // 4
+        del stack[depth:]
+        stack.append(name)
+        paths.append("/".join(stack))
+    return paths
+
+
+def crafted_paths(paths):
+    """Every folder crafting creates, implied parents included."""
+    folders = set()
+    for p in iter_expanded_paths(paths):
+        parts = p.split('/')
+        folders.update("/".join(parts[:n]) for n in range(1, len(parts) + 1))
+    return folders
+
+
+class PreviewMatchesCraftingTest(unittest.TestCase):
+    CASES = [
+        ["A{1..3}", "A2"],
+        ["A{1..3}/x", "A2/y"],
+        ["S{1..2}/E{1..3}", "S1/E{2..4}/take"],
+        ["{a,b,a}/x"],
+        ["P/{01..05}", "P/{04..08}/z", "P/03"],
+        ["R{1..2}/{a,b}/{x,y}", "R{2..3}/{b,c}/{y,z}"],
+    ]
+
+    def test_overlapping_patterns(self):
+        for paths in self.CASES:
+            with self.subTest(paths=paths):
+                shown = preview_paths(build_folder_tree(paths))
+                self.assertEqual(len(shown), len(set(shown)), "a folder is shown twice")
+                self.assertEqual(set(shown), crafted_paths(paths))
+
+    def test_length_matches_rows(self):
+        tree = build_folder_tree(["A{1..3}/x", "A2/y"])
+        self.assertEqual(len(tree), len(list(tree)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from foldercrafter.search import TemplateSearchIndex
+
+
+NAMES = [
+    "Film / Video", "AI Video Production", "Web Project", "Podcast Season",
+    "Photo Shoot 2024", "Client Deliveries", "Game Assets", "Film Festival Kit",
+    "video-archive", "Web App (Imported)", "Music Album", "Episode Template",
+]
+FOLDERS = {
+    "Film / Video": {"01 footage", "02 audio", "raw", "proxies"},
+    "Game Assets": {"textures", "models", "audio"},
+    "Music Album": {"stems", "masters", "artwork"},
+    "Episode Template": {"footage", "graphics", "subtitles"},
+}
+QUERIES = [
+    "film", "fi", "video", "vid", "web", "project", "2024", "imp", "aud", "foot",
+    "textures", "proj", "vdeo", "filmm", "episod", "x", "a", "deliv", "ma",
+]
+
+
+def every_result(index):
+    return {query: index.search(query) for query in QUERIES}
+
+
+class BulkIndexingTest(unittest.TestCase):
+    def test_add_many_matches_adding_one_at_a_time(self):
+        single = TemplateSearchIndex()
+        for name in NAMES:
+            single.add(name, FOLDERS.get(name))
+        
+        bulk = TemplateSearchIndex()
+        bulk.add_many(NAMES)
+        bulk.add_folders_many(FOLDERS.items())
+        
+        self.assertEqual(every_result(bulk), every_result(single))
+
+    def test_order_and_removal_do_not_matter(self):
+        shuffled = NAMES[:]
+        random.Random(7).shuffle(shuffled)
+        single = TemplateSearchIndex()
+        for name in shuffled + ["Temporary"]:
+            single.add(name)
+        single.remove("Temporary")
+        
+        bulk = TemplateSearchIndex()
+        bulk.add_many(NAMES)
+        
+        self.assertEqual(every_result(bulk), every_result(single))
+        self.assertEqual(bulk._words, sorted(bulk._words))
+
+
+if __name__ == "__main__":
+    unittest.main()